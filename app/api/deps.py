@@ -1,9 +1,33 @@
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Header
 from uuid import UUID
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator
 
 from dnd.entity import Entity
 from dnd.core.base_block import BaseBlock
+from dnd.core.world import World, DEFAULT_WORLD
+
+async def get_world(x_world_id: Optional[UUID] = Header(default=None, description="UUID of the world the request operates on")) -> AsyncIterator[World]:
+    """
+    Dependency activating the world selected by the X-World-Id header for the rest of the request.
+    Requests without the header operate on the default world.
+
+    The dependency is async so that the world is activated in the request task and seen by the endpoint
+    and by the other dependencies, including the ones running in the threadpool.
+
+    Args:
+        x_world_id: The UUID of the world, None for the default world
+
+    Returns:
+        World: The active world
+
+    Raises:
+        HTTPException: If the world is not found
+    """
+    world = DEFAULT_WORLD if x_world_id is None else World.get(x_world_id)
+    if world is None:
+        raise HTTPException(status_code=404, detail=f"World with UUID {x_world_id} not found")
+    with world.activate():
+        yield world
 
 def get_entity(entity_uuid: UUID) -> Entity:
     """
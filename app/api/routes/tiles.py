@@ -30,6 +30,11 @@ async def get_all_tiles():
     """Get a snapshot of the entire tile grid"""
     return GridSnapshot.from_engine()
 
+@router.get("/fov_cache")
+async def get_fov_cache_stats():
+    """Get the hit, miss and eviction counters of the field of view cache"""
+    return Tile.get_fov_cache().stats()
+
 @router.get("/position/{x}/{y}", response_model=TileSnapshot)
 async def get_tile_at_position(x: int, y: int):
     """Get tile at a specific position"""
@@ -112,9 +117,8 @@ async def delete_tile_at_position(x: int, y: int):
             }
         )
     
-    # Remove from registries
-    Tile._tile_registry.pop(tile.uuid, None)
-    Tile._tile_by_position.pop(tile.position, None)
+    # Remove from registries and the grid
+    tile.remove()
     
     return {"message": f"Tile at position ({x}, {y}) deleted successfully"}
 
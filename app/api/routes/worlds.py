@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+from dnd.core.world import World, DEFAULT_WORLD
+from app.models.world import WorldSummary
+from app.encounters import create_test_encounter
+
+router = APIRouter(
+    prefix="/worlds",
+    tags=["worlds"],
+    responses={404: {"description": "World not found"}},
+)
+
+# Model for creating a new world
+class CreateWorldRequest(BaseModel):
+    name: Optional[str] = None
+    seed: Optional[int] = None
+    create_test_encounter: bool = True
+
+@router.get("/", response_model=List[WorldSummary])
+async def list_worlds():
+    """List every world hosted by the server, select one with the X-World-Id header on the other routes"""
+    return [WorldSummary.from_engine(world) for world in World.all()]
+
+@router.post("/", response_model=WorldSummary)
+async def create_world(request: CreateWorldRequest):
+    """Create a new isolated world, optionally populated with the test encounter"""
+    world = World(name=request.name, seed=request.seed)
+    if request.create_test_encounter:
+        with world.activate():
+            create_test_encounter()
+    return WorldSummary.from_engine(world)
+
+@router.get("/{world_uuid}", response_model=WorldSummary)
+async def get_world_by_uuid(world_uuid: UUID):
+    """Get a world by UUID"""
+    world = World.get(world_uuid)
+    if world is None:
+        raise HTTPException(status_code=404, detail=f"World with UUID {world_uuid} not found")
+    return WorldSummary.from_engine(world)
+
+@router.delete("/{world_uuid}")
+async def delete_world(world_uuid: UUID):
+    """Dispose a world and everything it contains"""
+    world = World.get(world_uuid)
+    if world is None:
+        raise HTTPException(status_code=404, detail=f"World with UUID {world_uuid} not found")
+    if world is DEFAULT_WORLD:
+        raise HTTPException(status_code=400, detail="The default world cannot be deleted")
+    world.dispose()
+    return {"message": f"World {world_uuid} deleted"}
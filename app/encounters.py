@@ -0,0 +1,38 @@
+from uuid import uuid4
+
+from dnd.entity import Entity
+from dnd.core.events import EventQueue, EventRetentionPolicy
+from dnd.monsters.circus_fighter import create_warrior
+from dnd.core.base_tiles import floor_factory, wall_factory
+
+
+def create_test_encounter() -> None:
+    """Create the test entities and tiles in the current world"""
+    # Bound the event history of the long running server, completed lineages only keep their final event
+    EventQueue.set_retention_policy(EventRetentionPolicy(max_events=50000, compact_lineages=True))
+    
+    # Create a warrior from circus_fighter.py
+    warrior_uuid = uuid4()
+    warrior = create_warrior(source_id=warrior_uuid, proficiency_bonus=2, name="Spiky Clown", position=(16,8),sprite_name="death_knight.png")
+    
+    # Create a second entity for testing
+    rogue_uuid = uuid4()
+    blinded_rogue = create_warrior(source_id=rogue_uuid, proficiency_bonus=3, name="Blinded Pirate",blinded=True, position=(17,9),sprite_name="deep_elf_fighter_new.png")
+    warrior.senses.add_entity(rogue_uuid,blinded_rogue.senses.position)
+    
+    blinded_rogue.senses.add_entity(warrior_uuid,warrior.senses.position)
+    warrior.set_target_entity(blinded_rogue.uuid)
+    blinded_rogue.set_target_entity(warrior.uuid)
+    print(f"Created test entities with UUIDs:")
+    print(f"- Test Warrior: {warrior_uuid} with target {warrior.target_entity_uuid}")
+    print(f"- Test Rogue: {rogue_uuid} with target {blinded_rogue.target_entity_uuid}")
+    floor_14_8 = floor_factory((14,8))
+    floor_14_9 = floor_factory((14,9))
+    wall_15_8 = wall_factory((15,8))
+    wall_15_9 = wall_factory((15,9))
+    floor_16_8 = floor_factory((16,8))
+    floor_17_9 = floor_factory((17,9))
+    floor_16_9 = floor_factory((16,9))
+    floor_17_8 = floor_factory((17,8))
+    wall_25_25 = wall_factory((32,32))
+    Entity.update_all_entities_senses()
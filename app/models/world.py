@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from dnd.core.world import World, DEFAULT_WORLD
+from dnd.entity import Entity
+from dnd.core.base_tiles import Tile
+from dnd.core.events import EventQueue
+from dnd.core.rng import RNGService
+
+class WorldSummary(BaseModel):
+    """Lightweight summary of a game world"""
+    uuid: UUID
+    name: Optional[str] = None
+    is_default: bool
+    seed: int
+    entities: int
+    tiles: int
+    events: int
+
+    @classmethod
+    def from_engine(cls, world: World):
+        """Create a summary from an engine World object"""
+        with world.activate():
+            return cls(
+                uuid=world.uuid,
+                name=world.name,
+                is_default=world is DEFAULT_WORLD,
+                seed=RNGService.current().seed,
+                entities=len(Entity._entity_registry),
+                tiles=len(Tile._tile_registry),
+                events=len(EventQueue._events_by_uuid)
+            )
@@ -9,6 +9,7 @@ from pydantic import Field
 from typing import Optional, List, TypeVar, Generic, Union, Tuple
 from uuid import UUID
 from dnd.entity import Entity, determine_attack_outcome
+from dnd.core.base_tiles import Tile
 from collections import OrderedDict
 
 
@@ -75,6 +76,7 @@ class Move(BaseAction):
     end_position: Tuple[int,int] = Field(description="The end position of the movement")
     path:Optional[List[Tuple[int,int]]] = Field(default=None,description="The path of the movement")
     use_movement_cost: bool = Field(default=True,description="Whether to use the movement cost")
+    use_pathfinding: bool = Field(default=False,description="Whether to search a path on the tile map with A* when the end position is not in the senses paths")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -91,7 +93,18 @@ class Move(BaseAction):
             source_entity = Entity.get(self.source_entity_uuid)
             if source_entity is None or not isinstance(source_entity, Entity):
                 return None
-            self.path = source_entity.senses.paths[self.end_position]
+            if self.end_position in source_entity.senses.paths or not self.use_pathfinding:
+                self.path = source_entity.senses.paths[self.end_position]
+            else:
+                self.path = Tile.find_path(source_entity.position, self.end_position, max_distance=self._searched_path_limit(source_entity))
+
+    def _searched_path_limit(self, source_entity: Entity) -> Optional[float]:
+        """ the largest path cost the search explores, a path costs its number of positions in movement, i.e. one more than
+        its steps, and the half step of slack covers the diagonal epsilon of the search without allowing another step.
+        Unreachable or unaffordable destinations return an empty path that validate_searched_path cancels. """
+        if not self.use_movement_cost:
+            return None
+        return source_entity.action_economy.movement.self_static.normalized_score - 0.5
 
     @staticmethod
     def validate_path(declaration_event: MovementEvent,source_entity_uuid: UUID) -> MovementEvent:
@@ -118,6 +131,18 @@ class Move(BaseAction):
                     status_message=f"Validated path for {declaration_event.name}"
                 )
             
+    @staticmethod
+    def validate_searched_path(declaration_event: MovementEvent) -> MovementEvent:
+        """Validate a path found on the tile map, it must go from the start to the end position through adjacent walkable positions"""
+        path = declaration_event.path
+        if path is None or len(path) == 0:
+            return declaration_event.cancel(status_message=f"No valid path found for {declaration_event.name}")
+        if path[0] != declaration_event.start_position or path[-1] != declaration_event.end_position or not Tile.is_valid_path(path):
+            return declaration_event.cancel(status_message=f"Invalid path for {declaration_event.name}")
+        return declaration_event.post(
+            status_message=f"Validated path for {declaration_event.name}"
+        )
+
     def _create_declaration_event(self,parent_event: Optional[Event] = None, use_register: bool = True) -> Optional[Event]:
         """Create the declaration event for the movement action"""
         source_entity = Entity.get(self.source_entity_uuid)
@@ -133,12 +158,17 @@ class Move(BaseAction):
             end_position=self.end_position,
             path=self.path,
             costs=[BaseCost.model_validate(cost) for cost in self.costs],
-            use_register=use_register
+            use_register=use_register,
+            versioned=self.versioned_events
         )
     
     def _validate(self, declaration_event: MovementEvent) -> MovementEvent:
         """Validate the movement action"""
-        validated_event = Move.validate_path(declaration_event,self.source_entity_uuid)
+        source_entity = Entity.get(self.source_entity_uuid)
+        if self.use_pathfinding and isinstance(source_entity, Entity) and declaration_event.end_position not in source_entity.senses.paths:
+            validated_event = Move.validate_searched_path(declaration_event)
+        else:
+            validated_event = Move.validate_path(declaration_event,self.source_entity_uuid)
         if not validated_event.canceled:
             return validated_event.phase_to(
                 new_phase=EventPhase.EXECUTION,
@@ -175,7 +205,7 @@ class Move(BaseAction):
             return effect_event
             
         Entity.update_entity_position(source_entity,execution_event.end_position)
-        Entity.update_all_entities_senses() #later we will only update the senses of the entities that are affected by the movement 
+        Entity.update_senses_after_move(source_entity)
         #now we declare the application of the effect
         
 
@@ -247,7 +277,7 @@ class Attack(BaseAction):
             if range.normal < source_entity.senses.get_distance(target_entity.position):
                 return declaration_event.cancel(status_message=f"Target entity not in range for {declaration_event.name}")
         elif range.type == RangeType.REACH:
-            if source_entity.senses.get_feet_distance(target_entity.position) > 5:
+            if source_entity.senses.get_feet_distance(target_entity.position) > range.normal:
                 return declaration_event.cancel(status_message=f"Target entity not in reach for {declaration_event.name}")
         return declaration_event.phase_to(
             new_phase=EventPhase.DECLARATION,
@@ -377,7 +407,8 @@ class Attack(BaseAction):
             target_entity_uuid=self.target_entity_uuid,
             weapon_slot=self.weapon_slot,
             costs=[BaseCost.model_validate(cost) for cost in self.costs],
-            use_register=use_register
+            use_register=use_register,
+            versioned=self.versioned_events
         )
     
     def _validate(self, declaration_event: AttackEvent) -> Optional[AttackEvent]:
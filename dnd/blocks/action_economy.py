@@ -174,6 +174,6 @@ class ActionEconomy(BaseBlock):
             for modifier in config.movement_modifiers:
                 movement.self_static.add_value_modifier(NumericalModifier.create(source_entity_uuid=source_entity_uuid, name=modifier[0], value=modifier[1]))
             
-            return cls(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name,
+            return cls.construct_trusted(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name,
                        target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name,
                        actions=actions, bonus_actions=bonus_actions, reactions=reactions, movement=movement)
@@ -168,7 +168,7 @@ class SavingThrow(BaseBlock):
             bonus = ModifiableValue.create(source_entity_uuid=source_entity_uuid, base_value=config.bonus, value_name=name+" Saving Throw Bonus")
             for modifier in config.bonus_modifiers:
                 bonus.self_static.add_value_modifier(NumericalModifier.create(source_entity_uuid=source_entity_uuid, name=modifier[0], value=modifier[1]))
-            return cls(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
+            return cls.construct_trusted(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
                        target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, 
                        proficiency=config.proficiency, bonus=bonus)
         
@@ -292,7 +292,7 @@ class SavingThrowSet(BaseBlock):
                                                         target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, config=config.wisdom_saving_throw)
             charisma_saving_throw = SavingThrow.create(source_entity_uuid=source_entity_uuid, name="charisma_saving_throw", source_entity_name=source_entity_name, 
                                                         target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, config=config.charisma_saving_throw)  
-            return cls(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
+            return cls.construct_trusted(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
                        target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, 
                        strength_saving_throw=strength_saving_throw, dexterity_saving_throw=dexterity_saving_throw, constitution_saving_throw=constitution_saving_throw, 
                        intelligence_saving_throw=intelligence_saving_throw, wisdom_saving_throw=wisdom_saving_throw, charisma_saving_throw=charisma_saving_throw)
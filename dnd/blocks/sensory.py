@@ -1,6 +1,6 @@
 from typing import Dict, Optional, Any, List, Self, Literal,ClassVar, Union, Callable, Tuple, Set, DefaultDict
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field, model_validator, computed_field,field_validator
+from pydantic import BaseModel, Field, model_validator, computed_field,field_validator, PrivateAttr
 from dnd.core.values import ModifiableValue, StaticValue
 from dnd.core.modifiers import NumericalModifier, DamageType , ResistanceStatus, ContextAwareCondition, saving_throws, ResistanceModifier
 
@@ -12,6 +12,7 @@ import math
 from collections import defaultdict
 
 from dnd.core.base_block import BaseBlock
+from dnd.core.dijkstra import PathMap
 
 class SensesType(str, Enum):
     BLINDSIGHT = "Blindsight"
@@ -24,9 +25,11 @@ class Senses(BaseBlock):
     entities : Dict[UUID,Tuple[int,int]] = Field(default_factory=dict)
     visible: Dict[Tuple[int,int],bool] = Field(default_factory=dict)
     walkable: Dict[Tuple[int,int],bool] = Field(default_factory=dict)
-    paths: DefaultDict[Tuple[int,int],List[Tuple[int,int]]] = Field(default_factory=lambda: defaultdict(list))
+    paths: PathMap = Field(default_factory=PathMap, description="The paths to the reachable positions, unreached positions map to an empty path")
     extra_senses: List[SensesType] = Field(default_factory=list)
     seen: Set[Tuple[int,int]] = Field(default_factory=set, description="A list of positions that the entity has seen")
+    # (size of seen, max_distance, tile grid revision) the visible positions and paths were last computed with
+    _computed_with: Optional[Tuple[int,int,int]] = PrivateAttr(default=None)
 
 
 
@@ -52,18 +55,26 @@ class Senses(BaseBlock):
         else:
             return []
     
+    def fork(self) -> Self:
+        """ fork of the senses with its own seen positions and entities, the visible, walkable and paths maps are
+        shared until update_senses replaces them """
+        forked = super().fork()
+        forked.seen = set(self.seen)
+        forked.entities = dict(self.entities)
+        return forked
+
     def update_seen(self, visible: Dict[Tuple[int,int],bool]):
         """ update the seen list"""
         visible_positions = set([key for key,value in visible.items() if value])
         self.seen.update(visible_positions)
 
     
-    def update_senses(self,  entities: Dict[UUID,Tuple[int,int]], visible: Dict[Tuple[int,int],bool], walkable: Dict[Tuple[int,int],bool],paths: DefaultDict[Tuple[int,int],List[Tuple[int,int]]]):
+    def update_senses(self,  entities: Dict[UUID,Tuple[int,int]], visible: Dict[Tuple[int,int],bool], walkable: Dict[Tuple[int,int],bool],paths: PathMap):
         #sets all to empty dicts
         self.entities = {}
         self.visible = {}
         self.walkable = {}
-        self.paths = defaultdict(list)
+        self.paths = PathMap()
         #sets all to the new values
         self.entities = entities
         self.visible = visible
@@ -71,18 +82,31 @@ class Senses(BaseBlock):
         self.walkable = walkable
         self.paths = paths
 
-    def get_threathened_positions(self) -> List[Tuple[int,int]]:
-        """ given a position we get all neighbors (also diagonals), we use sets to do quickly and check they are in both visible dict and a path exist"""
-        position = self.position
-        neighbors = set([(position[0]+1,position[1]),
-                        (position[0]-1,position[1]),
-                        (position[0],position[1]+1),
-                        (position[0],position[1]-1),
-                        (position[0]+1,position[1]+1),
-                        (position[0]-1,position[1]-1)])
-        visible_set = set(self.visible.keys())
-        path_set = set(self.paths.keys())
-        return list(neighbors & visible_set & path_set)
+    def mark_computed(self, seen_size: int, max_distance: int, grid_revision: int):
+        """ record the size of the seen set, the max distance and the tile grid revision the current visible positions and paths come from """
+        self._computed_with = (seen_size, max_distance, grid_revision)
+
+    def is_outdated(self, max_distance: int, grid_revision: int) -> bool:
+        """ whether a full recompute could give different visible positions or paths, i.e. the senses were never
+        computed, were computed with another max distance, the seen set grew or the tiles changed since """
+        return self._computed_with != (len(self.seen), max_distance, grid_revision)
+
+    def update_entity_position(self, entity_uuid: UUID, position: Tuple[int,int]):
+        """ patch the visible entities after another entity moved to a position """
+        if position in self.visible:
+            self.entities[entity_uuid] = position
+        else:
+            self.entities.pop(entity_uuid, None)
+
+    def get_threathened_positions(self, reach: int = 1) -> List[Tuple[int,int]]:
+        """ the positions around the senses position within reach (as measured by get_distance, so reach 1 is the 8 neighbors)
+        that are visible and that a path exists to, only the (2 * reach + 1) square around the position is looked up """
+        x, y = self.position
+        visible = self.visible
+        paths = self.paths
+        limit = (reach + 1) ** 2
+        return [(x + dx, y + dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)
+                if (dx or dy) and dx * dx + dy * dy < limit and (x + dx, y + dy) in visible and (x + dx, y + dy) in paths]
         
 
     @classmethod
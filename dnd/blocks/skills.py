@@ -206,7 +206,7 @@ class Skill(BaseBlock):
                 for modifier in config.skill_bonus_modifiers:
                     skill_bonus.self_static.add_value_modifier(NumericalModifier.create(source_entity_uuid=source_entity_uuid, name=modifier[0], value=modifier[1]))
 
-            return cls(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
+            return cls.construct_trusted(source_entity_uuid=source_entity_uuid, name=name, source_entity_name=source_entity_name, 
                        target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, 
                        skill_bonus=skill_bonus, expertise=config.expertise, proficiency=config.proficiency)
 
@@ -390,7 +390,7 @@ class SkillSet(BaseBlock):
             survival = Skill.create(source_entity_uuid=source_entity_uuid, name="survival", source_entity_name=source_entity_name, 
                                    target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, config=config.survival)
             
-            return cls(source_entity_uuid=source_entity_uuid, name="skill_set", source_entity_name=source_entity_name, 
+            return cls.construct_trusted(source_entity_uuid=source_entity_uuid, name="skill_set", source_entity_name=source_entity_name, 
                        target_entity_uuid=target_entity_uuid, target_entity_name=target_entity_name, 
                        acrobatics=acrobatics, animal_handling=animal_handling, arcana=arcana, athletics=athletics, deception=deception, history=history, 
                        insight=insight, intimidation=intimidation, investigation=investigation, medicine=medicine, nature=nature, perception=perception, 
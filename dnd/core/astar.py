@@ -0,0 +1,92 @@
+""" A* point to point pathfinding on the 8-connected tile grid.
+
+The costs are the ones of dnd.core.dijkstra: every step costs 1 and diagonal steps an extra epsilon, so the path found
+has the fewest steps and, among those, the fewest diagonal moves. The octile heuristic of this cost model,
+max(dx, dy) + epsilon * min(dx, dy), is a lower bound of the remaining cost and consistent, so the first time the goal
+is popped its path is optimal and only the area between the two positions is explored.
+"""
+
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+# (dx, dy, diagonal) in the order dnd.core.dijkstra.get_neighbors returns the neighbors
+STEPS = [(0, 1, False), (1, 0, False), (0, -1, False), (-1, 0, False), (1, 1, True), (1, -1, True), (-1, 1, True), (-1, -1, True)]
+
+
+def octile_distance(start: Position, goal: Position, epsilon: float = 0.001) -> float:
+    """ cost of the cheapest path between two positions on an empty grid """
+    dx, dy = abs(start[0] - goal[0]), abs(start[1] - goal[1])
+    return max(dx, dy) + epsilon * min(dx, dy)
+
+
+def astar(
+    start: Position,
+    goal: Position,
+    is_walkable: Callable[[int, int], bool],
+    width: int,
+    height: int,
+    max_distance: Optional[float] = None,
+    epsilon: float = 0.001
+) -> List[Position]:
+    """
+    Find the cheapest path from start to goal.
+
+    Args:
+        start: The start position, it does not need to be walkable
+        goal: The goal position
+        is_walkable: Whether a position inside the grid can be walked on
+        width: The width of the grid
+        height: The height of the grid
+        max_distance: Maximum cost of the path including the diagonal epsilon (optional)
+        epsilon: Small cost added for diagonal moves
+
+    Returns:
+        The path from start to goal included, empty if the goal can not be reached
+    """
+    if start == goal:
+        return [start]
+    gx, gy = goal
+    if not (0 <= gx < width and 0 <= gy < height) or not is_walkable(gx, gy):
+        return []
+    limit = max_distance if max_distance is not None else float("inf")
+    if octile_distance(start, goal, epsilon) > limit:
+        return []
+
+    costs: Dict[Position, float] = {start: 0.0}
+    parents: Dict[Position, Optional[Position]] = {start: None}
+    closed = set()
+    heap = [(octile_distance(start, goal, epsilon), 0.0, start)]
+    while heap:
+        _, negative_cost, position = heapq.heappop(heap)
+        if position == goal:
+            path = []
+            step: Optional[Position] = goal
+            while step is not None:
+                path.append(step)
+                step = parents[step]
+            path.reverse()
+            return path
+        if position in closed:
+            continue
+        closed.add(position)
+        cost = -negative_cost
+        x, y = position
+        for dx, dy, diagonal in STEPS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height) or not is_walkable(nx, ny):
+                continue
+            neighbor = (nx, ny)
+            neighbor_cost = cost + 1 + (epsilon if diagonal else 0)
+            if neighbor_cost > limit:
+                continue
+            known_cost = costs.get(neighbor)
+            if known_cost is None or neighbor_cost < known_cost:
+                costs[neighbor] = neighbor_cost
+                parents[neighbor] = position
+                # remaining cost, then distance from start as tie breaker to prefer positions closer to the goal
+                ddx, ddy = abs(nx - gx), abs(ny - gy)
+                estimate = neighbor_cost + max(ddx, ddy) + epsilon * min(ddx, ddy)
+                heapq.heappush(heap, (estimate, -neighbor_cost, neighbor))
+    return []
@@ -25,9 +25,9 @@ class ActionEvent(Event):
         self.costs.append(base_cost)
 
     @classmethod
-    def from_costs(cls,costs: List[Cost], source_entity_uuid: UUID, target_entity_uuid: Optional[UUID] = None, parent_event: Optional[Event] = None, use_register: bool = True):
+    def from_costs(cls,costs: List[Cost], source_entity_uuid: UUID, target_entity_uuid: Optional[UUID] = None, parent_event: Optional[Event] = None, use_register: bool = True, versioned: bool = False):
         base_costs = [BaseCost.model_validate(cost) for cost in costs]
-        return cls(source_entity_uuid=source_entity_uuid, target_entity_uuid=target_entity_uuid, costs=base_costs, parent_event=parent_event.uuid if parent_event else None, use_register=use_register)
+        return cls(source_entity_uuid=source_entity_uuid, target_entity_uuid=target_entity_uuid, costs=base_costs, parent_event=parent_event.uuid if parent_event else None, use_register=use_register, versioned=versioned)
 
 class BaseAction(BaseObject):
     """Base class for all actions in the game. This class provides the basic structure
@@ -36,6 +36,7 @@ class BaseAction(BaseObject):
     description: str  = Field(description="The description of the action, this is going to be displayed in the ui as a tooltip")
     parent_event: Optional[Event] = Field(default=None,description="The parent event of the action, the first event to be created in the action will be a child of this event used to keep track of sub-actions triggered by other events")
     costs: List[Cost] = Field(default_factory=list,description="A list of costs for the action")
+    versioned_events: bool = Field(default=False,description="If true the action events are versioned, each phase updates a single event in place instead of creating a copy")
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     def check_costs(self) -> bool:
@@ -47,7 +48,7 @@ class BaseAction(BaseObject):
     def _create_declaration_event(self,parent_event: Optional[Event] = None, use_register: bool = True) -> Optional[ActionEvent]:
         """Create the declaration event for this action. Override in subclasses if needed."""
         
-        return ActionEvent.from_costs(self.costs,self.source_entity_uuid,self.target_entity_uuid,parent_event,use_register=use_register)
+        return ActionEvent.from_costs(self.costs,self.source_entity_uuid,self.target_entity_uuid,parent_event,use_register=use_register,versioned=self.versioned_events)
 
     
     def _validate(self, declaration_event: ActionEvent) -> Optional[ActionEvent]:
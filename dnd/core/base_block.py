@@ -1,9 +1,11 @@
-from typing import Dict, Optional, Any, List, Self, Literal,ClassVar, Union, Callable, Tuple
+from typing import Dict, Optional, Any, List, Self, Literal,ClassVar, Union, Callable, Tuple, get_args, get_origin
+from types import UnionType
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field, model_validator, computed_field,field_validator
-from dnd.core.values import ModifiableValue, StaticValue
+from pydantic import BaseModel, Field, model_validator, computed_field,field_validator, PrivateAttr
+from dnd.core.values import ModifiableValue, StaticValue, shallow_copy
 from dnd.core.modifiers import NumericalModifier, DamageType , ResistanceStatus, ContextAwareCondition, saving_throws, ResistanceModifier
 from dnd.core.base_conditions import BaseCondition
+from dnd.core.world import world_scoped
 from dnd.core.events import EventHandler, EventQueue, Trigger, Event
 from enum import Enum
 from random import randint
@@ -13,6 +15,59 @@ from collections import defaultdict
 
 ContextualConditionImmunity = Callable[['BaseBlock', Optional['BaseBlock'],Optional[dict]], bool]
 
+# field defaults shared by the constructed blocks as they are, the other defaults are copied like pydantic does
+_IMMUTABLE_DEFAULTS = (str, int, float, bool, type(None), Enum, UUID)
+
+
+def _may_hold_member(annotation: Any) -> bool:
+    """ whether a field with this annotation can hold a ModifiableValue or a BaseBlock, lists and dicts of them
+    are not members, unresolved annotations are kept and checked on the instances """
+    if isinstance(annotation, type):
+        return issubclass(annotation, (ModifiableValue, BaseBlock))
+    origin = get_origin(annotation)
+    if origin is Union or origin is UnionType:
+        return any(_may_hold_member(arg) for arg in get_args(annotation))
+    return origin is None
+
+
+class _BlockFields:
+    """ the field metadata of a block class used by the construction, computed once per class by _block_fields """
+
+    __slots__ = ('members', 'template', 'factories', 'required')
+
+    def __init__(self, cls: type):
+        # the fields that can hold a ModifiableValue or a BaseBlock, i.e. the values and sub-blocks of the block
+        self.members: Tuple[str, ...] = tuple(name for name, field in cls.model_fields.items()
+                                              if name not in ('blocks', 'values') and _may_hold_member(field.annotation))
+        # every field in definition order with its immutable default, the others are set at construction
+        self.template: Dict[str, Any] = {}
+        # (name, default factory, whether the factory takes the data) of the fields without an immutable default
+        self.factories: List[Tuple[str, Callable[..., Any], bool]] = []
+        required = []
+        for name, field in cls.model_fields.items():
+            self.template[name] = None
+            if field.default_factory is not None:
+                # pydantic inspects the signature of the factory at every model_construct call
+                self.factories.append((name, field.default_factory, field.default_factory_takes_validated_data))
+            elif field.is_required():
+                required.append(name)
+            elif isinstance(field.default, _IMMUTABLE_DEFAULTS):
+                self.template[name] = field.default
+            else:
+                self.factories.append((name, field.get_default, False))
+        self.required = frozenset(required)
+
+
+_block_fields_by_class: Dict[type, _BlockFields] = {}
+
+
+def _block_fields(cls: type) -> _BlockFields:
+    """ the field metadata of a block class """
+    fields = _block_fields_by_class.get(cls)
+    if fields is None:
+        fields = _block_fields_by_class[cls] = _BlockFields(cls)
+    return fields
+
 
 class BaseBlock(BaseModel):
     """
@@ -44,6 +99,8 @@ class BaseBlock(BaseModel):
 
     Methods:
         __init__(**data): Initialize the BaseBlock and register it in the class registry.
+        construct_trusted(cls, **data) -> Self:
+            Create a block from internally generated data without validation, linked and registered like a validated one.
         get(cls, uuid: UUID) -> Optional['BaseBlock']:
             Retrieve a BaseBlock instance from the registry by its UUID.
         register(cls, value: 'BaseBlock') -> None:
@@ -64,6 +121,8 @@ class BaseBlock(BaseModel):
             Clear the context for all the values contained in this Block instance.
         clear() -> None:
             Clear the source, target, and context for all the values contained in this Block instance.
+        fork() -> Self:
+            Create an unregistered structural copy of the block sharing the modifiers of its values.
         create(cls, source_entity_uuid: UUID, source_entity_name: Optional[str] = None, 
                target_entity_uuid: Optional[UUID] = None, target_entity_name: Optional[str] = None, 
                name: str = "Base Block") -> 'BaseBlock':
@@ -84,10 +143,9 @@ class BaseBlock(BaseModel):
         blocks_dict_name_uuid (Dict[str, UUID]): A dictionary mapping block names to their UUIDs.
 
     Validators:
-        set_values_and_blocks_source: Ensures that all ModifiableValue and BaseBlock instances within the block
-        have the same source and target UUIDs as the block itself.
-        validate_values_and_blocks_source_and_target: Ensures that all ModifiableValue and BaseBlock instances
-        within the block have matching source and target UUIDs.
+        link_values_and_blocks: Populates the blocks and values dictionaries from the member fields of the class
+        and ensures that all ModifiableValue and BaseBlock instances within the block have the same source as the
+        block itself, and its target and context if any, once per block.
     """
 
     name: str = Field(
@@ -145,7 +203,9 @@ class BaseBlock(BaseModel):
     
     allow_events_conditions: bool = Field(default=False,description="If True, events and conditions will be allowed to be added to the block")
 
-    _registry: ClassVar[Dict[UUID, 'BaseBlock']] = {}
+    _registry: ClassVar[Dict[UUID, 'BaseBlock']] = world_scoped(dict)
+    # set once the values and blocks dictionaries are populated, see link_values_and_blocks
+    _linked: bool = PrivateAttr(default=False)
 
     class Config:
         validate_assignment = False
@@ -154,84 +214,65 @@ class BaseBlock(BaseModel):
         """
         Helper function to set source and target for values and sub-blocks.
 
+        Only the values and sub-blocks with another source are updated, the sub-blocks with the source of the block
+        were already made consistent when they were linked, so the walk only recurses into the mismatched ones.
+
         Args:
             block (BaseBlock): The block to process.
         """
+        source_entity_uuid = block.source_entity_uuid
+        source_entity_name = block.source_entity_name
         # Use the dictionaries directly for better performance
         for value in block.values.values():
-            value.set_source_entity(block.source_entity_uuid, block.source_entity_name)
+            if value.source_entity_uuid != source_entity_uuid or value.source_entity_name != source_entity_name:
+                value.set_source_entity(source_entity_uuid, source_entity_name)
             if block.context is not None:
                 value.set_context(block.context)
             if block.target_entity_uuid is not None:
                 value.set_target_entity(block.target_entity_uuid, block.target_entity_name)
-        
+
         for sub_block in block.blocks.values():
-            sub_block.source_entity_uuid = block.source_entity_uuid
-            sub_block.source_entity_name = block.source_entity_name
+            if sub_block.source_entity_uuid != source_entity_uuid or sub_block.source_entity_name != source_entity_name:
+                sub_block.source_entity_uuid = source_entity_uuid
+                sub_block.source_entity_name = source_entity_name
+                # Recursively apply to sub-blocks
+                self._set_values_and_blocks_source(sub_block)
             if block.context is not None:
                 sub_block.set_context(block.context)
             if block.target_entity_uuid is not None:
                 sub_block.set_target_entity(block.target_entity_uuid, block.target_entity_name)
-            # Recursively apply to sub-blocks
-            self._set_values_and_blocks_source(sub_block)
 
-    @model_validator(mode='after')
-    def set_values_and_blocks_source(self) -> 'Self':
+    def _link_values_and_blocks(self) -> None:
         """
-        Ensure that all ModifiableValue and BaseBlock instances within the block
-        have the same source and target UUIDs as the block itself.
-
-        Returns:
-            Self: The modified instance of the class.
+        Populate the blocks and values dictionaries with the BaseBlock and ModifiableValue attributes of the block,
+        looking only at the member fields of its class, and give them the source, target and context of the block.
         """
+        values = self.values
+        blocks = self.blocks
+        attributes = self.__dict__
+        for name in _block_fields(self.__class__).members:
+            attr_value = attributes[name]
+            if isinstance(attr_value, ModifiableValue):
+                values[attr_value.uuid] = attr_value
+            elif isinstance(attr_value, BaseBlock):
+                blocks[attr_value.uuid] = attr_value
         self._set_values_and_blocks_source(self)
-        return self
+        self.__pydantic_private__['_linked'] = True
 
     @model_validator(mode='after')
-    def validate_values_and_blocks_source_and_target(self) -> Self:
+    def link_values_and_blocks(self) -> Self:
         """
-        Ensure that all ModifiableValue and BaseBlock instances within the block
-        have matching source and target UUIDs.
+        Populate the blocks and values dictionaries and ensure that all ModifiableValue and BaseBlock instances
+        within the block have the same source as the block itself, and its target and context if any.
 
-        Returns:
-            Self: The modified instance of the class.
+        Pydantic runs the after validators of a model again whenever an instance is assigned to a field of another
+        model, so a block is linked only the first time and the later runs, one per nesting level, return at once.
 
-        Raises:
-            ValueError: If there is a mismatch in source or target UUIDs.
+        Returns:
+            Self: The linked instance of the class.
         """
-        # Skip this validation for target entity operations
-        # This validator only makes sense during initialization, not during target propagation
-        
-        # Check all values
-        for uuid, value in self.values.items():
-            if value.source_entity_uuid != self.source_entity_uuid:
-                raise ValueError(f"ModifiableValue '{value.name}' has mismatched source UUID")
-                
-        # Check all blocks
-        for uuid, block in self.blocks.items():
-            if block.source_entity_uuid != self.source_entity_uuid:
-                raise ValueError(f"BaseBlock '{block.name}' has mismatched source UUID")
-                
-        return self
-
-    @model_validator(mode='after')
-    def populate_blocks_and_values(self) -> Self:
-        """
-        Populates the blocks and values dictionaries with all BaseBlock and ModifiableValue
-        instances that are attributes of this class. This is done once during initialization.
-        """
-        for name, field in self.__class__.model_fields.items():
-            attr_value = getattr(self, name)
-            # Skip the dictionaries themselves to avoid recursion
-            if name in ['blocks', 'values']:
-                continue
-                
-            # Use Pydantic field annotations to determine types
-            if isinstance(attr_value, ModifiableValue):
-                self.values[attr_value.uuid] = attr_value
-            elif isinstance(attr_value, BaseBlock):
-                self.blocks[attr_value.uuid] = attr_value
-                
+        if not self.__pydantic_private__['_linked']:
+            self._link_values_and_blocks()
         return self
 
     def __init__(self, **data):
@@ -242,8 +283,45 @@ class BaseBlock(BaseModel):
             **data: Keyword arguments to initialize the BaseBlock attributes.
         """
         super().__init__(**data)
+        self._add_to_registries()
+
+    def _add_to_registries(self) -> None:
+        """ register a newly constructed block, subclasses keeping their own registries extend it """
         self.__class__._registry[self.uuid] = self
 
+    @classmethod
+    def construct_trusted(cls, **data: Any) -> Self:
+        """
+        Create a block from internally generated data, e.g. values and sub-blocks just built by a create method from
+        a validated config, without running the pydantic validation of the fields nor the validators of the nested
+        models. The block is linked and registered as a validated one.
+
+        Args:
+            **data: Keyword arguments to initialize the block attributes, they must already have the field types.
+
+        Returns:
+            Self: The newly created block.
+        """
+        block_fields = _block_fields(cls)
+        if not block_fields.required <= data.keys():
+            raise ValueError(f"{cls.__name__} requires the fields {sorted(block_fields.required - data.keys())}")
+        if not data.keys() <= block_fields.template.keys():
+            raise ValueError(f"{cls.__name__} has no fields {sorted(data.keys() - block_fields.template.keys())}")
+        fields = block_fields.template.copy()
+        fields.update(data)
+        for name, default_factory, takes_data in block_fields.factories:
+            if name not in data:
+                fields[name] = default_factory(fields) if takes_data else default_factory()
+        block = cls.__new__(cls)
+        object.__setattr__(block, '__dict__', fields)
+        object.__setattr__(block, '__pydantic_fields_set__', set(data))
+        object.__setattr__(block, '__pydantic_extra__', None)
+        object.__setattr__(block, '__pydantic_private__', None)
+        block.model_post_init(None)
+        block._link_values_and_blocks()
+        block._add_to_registries()
+        return block
+
     @classmethod
     def get(cls, uuid: UUID) -> Optional['BaseBlock']:
         """
@@ -388,7 +466,29 @@ class BaseBlock(BaseModel):
         """
         self.clear_target_entity()
         self.clear_context()
-        
+
+    def fork(self) -> Self:
+        """
+        Create an unregistered structural copy of the block, to evaluate it against another target or context
+        without changing it.
+
+        Values and sub-blocks are forked recursively, the forked values share their modifier objects with the
+        original ones (see ModifiableValue.fork). The conditions, the immunities and the event handlers are shared
+        with this block, they are read but must not be modified through the fork.
+
+        Returns:
+            Self: The forked block.
+        """
+        values = {uuid: value.fork() for uuid, value in self.values.items()}
+        blocks = {uuid: block.fork() for uuid, block in self.blocks.items()}
+        update: Dict[str, Any] = {"values": values, "blocks": blocks}
+        for name, attr_value in self.__dict__.items():
+            if isinstance(attr_value, ModifiableValue):
+                update[name] = values[attr_value.uuid] if attr_value.uuid in values else attr_value.fork()
+            elif isinstance(attr_value, BaseBlock):
+                update[name] = blocks[attr_value.uuid] if attr_value.uuid in blocks else attr_value.fork()
+        return shallow_copy(self, update)
+
     @classmethod
     def create(cls, source_entity_uuid: UUID, source_entity_name: Optional[str] = None, 
                 target_entity_uuid: Optional[UUID] = None, target_entity_name: Optional[str] = None, 
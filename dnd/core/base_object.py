@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, TypeVar, Generic, Union, Tuple, ClassVar, Dict, Any
 from uuid import UUID, uuid4
+from weakref import WeakValueDictionary
+from dnd.core.world import world_scoped
 
 
 class BaseObject(BaseModel):
@@ -21,7 +23,7 @@ class BaseObject(BaseModel):
         use_register (bool): Whether to register this object in the class registry. Defaults to True.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseObject']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseObject']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['BaseObject']:
@@ -38,7 +40,7 @@ class BaseObject(BaseModel):
             Remove multiple objects from the registry with optional permanent deletion.
     """
 
-    _registry: ClassVar[Dict[UUID, 'BaseObject']] = {}
+    _registry: ClassVar[WeakValueDictionary[UUID, 'BaseObject']] = world_scoped(WeakValueDictionary)
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     name: Optional[str] = Field(
@@ -1,18 +1,24 @@
-from typing import Dict, Optional, Any, List, Self, Literal,ClassVar, Union, Callable, Tuple, DefaultDict
+from typing import Dict, Optional, Any, List, Self, Literal,ClassVar, Union, Callable, Tuple, DefaultDict, Set, FrozenSet, Sequence
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field, model_validator, computed_field,field_validator
+import numpy as np
 from dnd.core.values import ModifiableValue, StaticValue
 from dnd.core.base_object import BaseObject
 from dnd.core.modifiers import NumericalModifier, DamageType , ResistanceStatus, ContextAwareCondition, saving_throws, ResistanceModifier
 from dnd.core.base_conditions import BaseCondition
+from dnd.core.world import world_scoped
 from dnd.core.events import EventHandler, Trigger, Event
 from enum import Enum
 from random import randint
 from functools import cached_property
 from typing import Literal as TypeLiteral
 from collections import defaultdict
-from dnd.core.shadowcast import compute_fov
-from dnd.core.dijkstra import dijkstra
+from dnd.core.shadowcast import compute_fov, compute_fov_batch, compute_fov_sets
+from dnd.core.dijkstra import PathMap
+from dnd.core.astar import astar
+from dnd.core.distance_field import DistanceField, DistanceFieldCache, compute_distance_field
+from dnd.core.grid import TileGrid
+from dnd.core.fov_cache import FOVCache
 
 
 
@@ -22,8 +28,14 @@ class Tile(BaseObject):
     walkable: bool = Field(default=True,description="Whether the tile can be walked on")
     visible: bool = Field(default=True,description="Whether the tile can be seen through")
     sprite_name: Optional[str] = Field(default=None,description="The name of the sprite to use for the tile")
-    _tile_registry: ClassVar[Dict[UUID, 'Tile']] = {}
-    _tile_by_position: ClassVar[Dict[Tuple[int,int], 'Tile']] = {}
+    _tile_registry: ClassVar[Dict[UUID, 'Tile']] = world_scoped(dict)
+    _tile_by_position: ClassVar[Dict[Tuple[int,int], 'Tile']] = world_scoped(dict)
+    # dense walkable / transparent arrays kept in sync with _tile_by_position
+    _grid: ClassVar[TileGrid] = world_scoped(TileGrid)
+    # field of view results keyed on the grid revision
+    _fov_cache: ClassVar[FOVCache] = world_scoped(FOVCache)
+    # distance fields of the positions paths are searched from, keyed on the grid revision
+    _distance_cache: ClassVar[DistanceFieldCache] = world_scoped(DistanceFieldCache)
 
     def __init__(self, **data):
         """
@@ -33,9 +45,32 @@ class Tile(BaseObject):
             **data: Keyword arguments to initialize the BaseBlock attributes.
         """
         super().__init__(**data)
+        self.__class__._grid.place(self.position, self, self.walkable, self.visible)
         self.__class__._tile_registry[self.uuid] = self
         self.__class__._tile_by_position[self.position] = self
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """ keep the grid in sync when the position, walkable or visible fields of a placed tile change """
+        placed = name in ("position", "walkable", "visible") and self.__class__._tile_by_position.get(self.position) is self
+        if placed and name == "position":
+            self.__class__._tile_by_position.pop(self.position)
+            self.__class__._grid.remove(self.position)
+        super().__setattr__(name, value)
+        if placed:
+            self.__class__._grid.place(self.position, self, self.walkable, self.visible)
+            self.__class__._tile_by_position[self.position] = self
+
+    def remove(self) -> None:
+        """ Remove the tile from the registries and the grid """
+        self.__class__._tile_registry.pop(self.uuid, None)
+        if self.__class__._tile_by_position.get(self.position) is self:
+            self.__class__._tile_by_position.pop(self.position)
+            self.__class__._grid.remove(self.position)
+
+    @classmethod
+    def get_grid(cls) -> TileGrid:
+        return cls._grid
+
     @classmethod
     def get_all_tiles(cls) -> List['Tile']:
         return list(cls._tile_registry.values())
@@ -50,10 +85,7 @@ class Tile(BaseObject):
     
     @classmethod
     def grid_size(cls) -> Tuple[int,int]:
-        tiles = cls.get_all_tiles()
-        if len(tiles) == 0:
-            return (0,0)
-        return max(tile.position[0] for tile in tiles) + 1, max(tile.position[1] for tile in tiles) + 1
+        return cls._grid.bounds
     
     @classmethod
     def create(cls, position: Tuple[int,int], sprite_name: Optional[str] = None, can_walk: bool = True, can_see: bool = True,name:str = "Floor") -> 'Tile':
@@ -62,64 +94,144 @@ class Tile(BaseObject):
 
     @classmethod
     def is_visible(cls, position: Tuple[int,int]) -> bool:
-        tile = cls.get_tile_at_position(position)
-        if tile is None:
-            return False
-        return tile.visible
+        return cls._grid.is_transparent(position)
     
     @classmethod
     def is_walkable(cls, position: Tuple[int,int]) -> bool:
-        tile = cls.get_tile_at_position(position)
-        if tile is None:
-            return False
-        return tile.walkable
+        return cls._grid.is_walkable(position)
     
     @classmethod
-    def get_fov(cls, source_pos: Tuple[int, int], max_distance: Optional[float] = None) -> List[Tuple[int, int]]:
+    def get_fov(cls, source_pos: Tuple[int, int], max_distance: Optional[float] = None) -> FrozenSet[Tuple[int, int]]:
         """
         Compute the field of view from a given position using shadowcasting.
+        Results are cached per world on (source_pos, max_distance, grid revision), see get_fov_cache.
         
         Args:
             source_pos: The position to compute FOV from
             max_distance: Maximum view distance (optional)
             
         Returns:
-            List of visible positions
+            Frozen set of visible positions
         """
-        visible_positions: List[Tuple[int, int]] = []
+        return cls._fov_cache.get(source_pos, max_distance, cls._grid.revision, lambda: cls.compute_fov(source_pos, max_distance))
+
+    @classmethod
+    def compute_fov(cls, source_pos: Tuple[int, int], max_distance: Optional[float] = None) -> FrozenSet[Tuple[int, int]]:
+        """ Compute the field of view from a given position using shadowcasting, bypassing the cache """
+        visible_positions: Set[Tuple[int, int]] = set()
+        width, height = cls._grid.bounds
+        transparent_rows = cls._grid.transparent_rows
         
         def is_blocking(x: int, y: int) -> bool:
-            tile = cls.get_tile_at_position((x, y))
-            return tile is None or not tile.visible
+            return not (0 <= x < width and 0 <= y < height and transparent_rows[y][x])
             
         def mark_visible(x: int, y: int) -> None:
-            visible_positions.append((x, y))
+            visible_positions.add((x, y))
             
         compute_fov(source_pos, is_blocking, mark_visible, max_distance)
-        return visible_positions
+        return frozenset(visible_positions)
+
+    @classmethod
+    def get_fov_batch(cls, origins: Sequence[Tuple[int, int]], max_distance: Optional[float] = None) -> np.ndarray:
+        """
+        Compute the field of view from many positions in one vectorized shadowcast over the transparent grid.
+
+        Args:
+            origins: The positions to compute FOV from
+            max_distance: Maximum view distance (optional)
+
+        Returns:
+            Boolean array [len(origins), height, width] over the grid bounds, [i, y, x] is True if origin i sees (x, y)
+        """
+        return compute_fov_batch(cls._grid.transparent, origins, max_distance)
+
+    @classmethod
+    def get_fov_many(cls, origins: Sequence[Tuple[int, int]], max_distance: Optional[float] = None) -> List[FrozenSet[Tuple[int, int]]]:
+        """
+        Get the field of view of many positions through the cache, the missing ones are computed in one vectorized
+        shadowcast and give the same frozen sets as get_fov.
+        """
+        transparent = cls._grid.transparent
+        return cls._fov_cache.get_many(origins, max_distance, cls._grid.revision,
+                                       lambda missing: compute_fov_sets(transparent, missing, max_distance))
+
+    @classmethod
+    def get_fov_cache(cls) -> FOVCache:
+        return cls._fov_cache
 
     @classmethod
-    def get_paths(cls, start_pos: Tuple[int, int], max_distance: Optional[int] = None) -> Tuple[Dict[Tuple[int, int], int], Dict[Tuple[int, int], List[Tuple[int, int]]]]:
+    def get_distance_field(cls, start_pos: Tuple[int, int], max_distance: Optional[int] = None) -> DistanceField:
         """
-        Compute all possible paths from a starting position using Dijkstra's algorithm.
+        Get the distance field of a starting position, cached per world on (start_pos, max_distance, grid revision).
+        Entities do not block movement, so moving entities does not invalidate the cached fields.
         
         Args:
             start_pos: Starting position
             max_distance: Maximum path distance (optional)
             
         Returns:
-            Tuple of (distances_dict, paths_dict) where:
-            - distances_dict maps positions to their distance from start
-            - paths_dict maps positions to the path list to reach them
+            The DistanceField giving the number of steps and the shortest path to every reachable position
+        """
+        return cls._distance_cache.get(start_pos, max_distance, cls._grid.revision, lambda: compute_distance_field(start_pos, cls._grid.walkable_rows, *cls._grid.bounds, max_distance=max_distance))
+
+    @classmethod
+    def get_distance_field_cache(cls) -> DistanceFieldCache:
+        return cls._distance_cache
+
+    @classmethod
+    def get_distance(cls, start_pos: Tuple[int, int], end_pos: Tuple[int, int], max_distance: Optional[int] = None) -> Optional[int]:
+        """ Number of steps of the shortest path between two positions within max_distance, None if there is none """
+        return cls.get_distance_field(start_pos, max_distance).distance(end_pos)
+
+    @classmethod
+    def find_path(cls, start_pos: Tuple[int, int], end_pos: Tuple[int, int], max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Find a single shortest path between two positions with A*, exploring only the area between them.
+        The path has the same number of steps and diagonal moves as the one found by a full search.
+        
+        Args:
+            start_pos: Starting position
+            end_pos: Destination position
+            max_distance: Maximum path distance (optional)
+            
+        Returns:
+            The path from start_pos to end_pos included, empty if end_pos can not be reached
         """
-        width, height = cls.grid_size()
+        width, height = cls._grid.bounds
+        walkable_rows = cls._grid.walkable_rows
         
+        # astar only asks for positions inside the grid bounds
         def is_walkable(x: int, y: int) -> bool:
-            tile = cls.get_tile_at_position((x, y))
-            return tile is not None and tile.walkable
+            return walkable_rows[y][x]
             
-        return dijkstra(start_pos, is_walkable, width, height, diagonal=True, max_distance=max_distance)
+        return astar(start_pos, end_pos, is_walkable, width, height, max_distance=max_distance)
 
+    @classmethod
+    def is_valid_path(cls, path: List[Tuple[int, int]]) -> bool:
+        """ Whether every step of a path moves to an adjacent walkable position, the first position is not checked """
+        for previous, position in zip(path, path[1:]):
+            if max(abs(position[0] - previous[0]), abs(position[1] - previous[1])) != 1 or not cls._grid.is_walkable(position):
+                return False
+        return True
+
+    @classmethod
+    def get_paths(cls, start_pos: Tuple[int, int], max_distance: Optional[int] = None, seen: Optional[Set[Tuple[int, int]]] = None) -> Tuple[Dict[Tuple[int, int], int], PathMap]:
+        """
+        Compute all possible paths from a starting position, read from the cached distance field of the position.
+        The paths are the same as the ones found by dnd.core.dijkstra.
+        
+        Args:
+            start_pos: Starting position
+            max_distance: Maximum path distance (optional)
+            seen: Positions already seen, if given paths.fully_seen holds the positions whose whole path was seen (optional)
+            
+        Returns:
+            Tuple of (distances_dict, paths) where:
+            - distances_dict maps positions to their distance from start
+            - paths lazily maps positions to the path list to reach them
+        """
+        field = cls.get_distance_field(start_pos, max_distance)
+        return field.distances(), field.path_map(seen)
 
 def floor_factory(position: Tuple[int,int]) -> Tile:
     return Tile.create(position, sprite_name="floor.png", can_walk=True, can_see=True)
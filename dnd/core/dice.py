@@ -1,9 +1,13 @@
 from pydantic import BaseModel, Field, computed_field, model_validator
-from typing import List, Optional, Union, Tuple, Self, ClassVar, Dict, Literal
-import random
+from typing import List, Optional, Union, Tuple, Self, ClassVar, Dict, Literal, Sequence
+import numpy as np
 from dnd.core.values import ModifiableValue, AdvantageStatus, CriticalStatus, AutoHitStatus, StaticValue,NumericalModifier, ContextualValue
 from enum import Enum
 from uuid import UUID, uuid4
+from weakref import WeakValueDictionary
+from dnd.core.world import world_scoped
+from dnd.core.dice_batch import BatchRoll, roll_batch, advantage_sign
+from dnd.core.rng import RNGService, RollRecord
 from functools import cached_property
 
 class AttackOutcome(str, Enum):
@@ -38,9 +42,10 @@ class DiceRoll(BaseModel):
         source_entity_uuid (UUID): UUID of the entity that made the roll.
         target_entity_uuid (Optional[UUID]): UUID of the target entity, if applicable.
         attack_outcome (Optional[AttackOutcome]): The outcome of an attack roll, if applicable.
+        rng_record (Optional[RollRecord]): The seed, stream and stream state the roll was drawn from, to replay it.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'DiceRoll']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'DiceRoll']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['DiceRoll']:
@@ -49,7 +54,7 @@ class DiceRoll(BaseModel):
             Remove a DiceRoll instance from the class registry.
     """
 
-    _registry: ClassVar[Dict[UUID, 'DiceRoll']] = {}
+    _registry: ClassVar[WeakValueDictionary[UUID, 'DiceRoll']] = world_scoped(WeakValueDictionary)
 
     roll_uuid: UUID = Field(
         default_factory=uuid4,
@@ -99,6 +104,10 @@ class DiceRoll(BaseModel):
         default=None,
         description="The outcome of an attack roll, if applicable."
     )
+    rng_record: Optional[RollRecord] = Field(
+        default=None,
+        description="The seed, stream and stream state the roll was drawn from, to replay it."
+    )
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -133,7 +142,7 @@ class Dice(BaseModel):
         attack_outcome (Optional[AttackOutcome]): The outcome of an attack, if applicable.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'Dice']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'Dice']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['Dice']:
@@ -146,6 +155,8 @@ class Dice(BaseModel):
             Validate the number of dice based on the roll_type.
         roll(self) -> DiceRoll:
             Perform a roll using these dice and return a DiceRoll object.
+        roll_many(cls, dice: Sequence[Dice]) -> BatchRoll:
+            Roll many dice at once with the batched roller of dnd.core.dice_batch.
 
     Validators:
         check_attack_outcome(self) -> Self:
@@ -154,7 +165,7 @@ class Dice(BaseModel):
             Validate the number of dice based on the roll_type.
     """
 
-    _registry: ClassVar[Dict[UUID, 'Dice']] = {}
+    _registry: ClassVar[WeakValueDictionary[UUID, 'Dice']] = world_scoped(WeakValueDictionary)
 
     uuid: UUID = Field(
         default_factory=uuid4,
@@ -253,50 +264,42 @@ class Dice(BaseModel):
         """
         return self.bonus.target_entity_uuid
 
-    def _roll_with_advantage(self) -> Tuple[int, List[int]]:
+    def _roll(self, crit: bool = False) -> Tuple[List[int], RollRecord]:
         """
-        Perform a roll with advantage.
+        Roll the dice from the stream of the source entity and roll type in the current world.
 
-        This method rolls the dice twice and returns the higher result.
-
-        Returns:
-            Tuple[int, List[int]]: A tuple containing the highest roll result and a list of all roll results.
-        """
-        rolls = [random.randint(1, self.value) for _ in range(self.count)]
-        return max(rolls), rolls
-
-    def _roll_with_disadvantage(self) -> Tuple[int, List[int]]:
-        """
-        Perform a roll with disadvantage.
+        Advantage and disadvantage roll every die twice and keep the higher, respectively lower, result.
 
-        This method rolls the dice twice and returns the lower result.
+        Args:
+            crit (bool): Whether this is a critical hit roll, doubling the number of dice. Defaults to False.
 
         Returns:
-            Tuple[int, List[int]]: A tuple containing the lowest roll result and a list of all roll results.
+            Tuple[List[int], RollRecord]: The kept value of every die and the record replaying the roll.
         """
-        rolls = [random.randint(1, self.value) for _ in range(self.count)]
-        return min(rolls), rolls
+        return RNGService.current().roll(self.count, self.value, advantage_sign(self.bonus.advantage), crit,
+                                         source_entity_uuid=self.source_entity_uuid, roll_type=self.roll_type)
 
-    def _roll(self, crit: bool = False) -> List[Tuple[int, List[int]]]:
+    @classmethod
+    def roll_many(cls, dice: Sequence['Dice'], generator: Optional[np.random.Generator] = None) -> BatchRoll:
         """
-        Perform a roll based on the current dice configuration.
-
-        This method handles normal rolls, advantage, disadvantage, and critical hits.
+        Roll many dice at once without creating DiceRoll objects.
 
         Args:
-            crit (bool): Whether this is a critical hit roll. Defaults to False.
+            dice (Sequence[Dice]): The dice to roll, damage dice of critical hits are doubled.
+            generator (Optional[np.random.Generator]): The generator to draw from, the shared stream of the current world if None.
 
         Returns:
-            List[Tuple[int, List[int]]]: A list of tuples, each containing the roll result and a list of all roll results.
+            BatchRoll: The results in the order of the dice, totals include the bonuses.
         """
-        count = self.count if not crit else self.count * 2
-        advantage_status = self.bonus.advantage
-        if advantage_status == AdvantageStatus.ADVANTAGE:
-            return [self._roll_with_advantage() for _ in range(count)]
-        elif advantage_status == AdvantageStatus.DISADVANTAGE:
-            return [self._roll_with_disadvantage() for _ in range(count)]
-        else:
-            return [(random.randint(1, self.value), []) for _ in range(count)]
+        return roll_batch(
+            [d.count for d in dice],
+            [d.value for d in dice],
+            [d.bonus.normalized_score for d in dice],
+            [advantage_sign(d.bonus.advantage) for d in dice],
+            [d.roll_type == RollType.DAMAGE and d.attack_outcome == AttackOutcome.CRIT for d in dice],
+            generator=generator if generator is not None else RNGService.current().generator()
+        )
+
     @computed_field
     @cached_property
     def roll(self) -> DiceRoll:
@@ -306,25 +309,28 @@ class Dice(BaseModel):
         Returns:
             DiceRoll: The result of the dice roll.
         """
+        bonus = self.bonus.normalized_score
         if self.roll_type == RollType.DAMAGE:
-            results = [roll[0] for roll in self._roll(crit=(self.attack_outcome == AttackOutcome.CRIT))]
-            total = sum(results) + self.bonus.normalized_score
+            results, rng_record = self._roll(crit=(self.attack_outcome == AttackOutcome.CRIT))
+            total = sum(results) + bonus
         else:
-            results = self._roll()[0][0]
-            total = results + self.bonus.normalized_score
+            dice, rng_record = self._roll()
+            results = dice[0]
+            total = results + bonus
 
         return DiceRoll(
             dice_uuid=self.uuid,
             roll_type=self.roll_type,
             results=results,
             total=total,
-            bonus=self.bonus.normalized_score,
+            bonus=bonus,
             advantage_status=self.bonus.advantage,
             critical_status=self.bonus.critical,
             auto_hit_status=self.bonus.auto_hit,
             source_entity_uuid=self.source_entity_uuid,
             target_entity_uuid=self.target_entity_uuid,
-            attack_outcome=self.attack_outcome
+            attack_outcome=self.attack_outcome,
+            rng_record=rng_record
         )
 
     
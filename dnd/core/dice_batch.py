@@ -0,0 +1,157 @@
+""" Batched dice rolling on a numpy random Generator.
+
+A dice expression is a number of dice with the same number of sides, a flat bonus, an advantage status and whether
+the dice are doubled by a critical hit. roll_batch rolls any number of expressions at once with a few array
+operations, which is what Monte-Carlo simulations and bulk resolution of many creatures need. Dice.roll delegates
+to roll_expression, the scalar path of the same algorithm: for the same generator state it gives the dice of a
+batch of one expression without the array overhead.
+
+Advantage and disadvantage roll every die twice and keep the higher, respectively lower, of the two rolls.
+"""
+
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from dnd.core.values import AdvantageStatus
+
+_default_generator: np.random.Generator = np.random.default_rng()
+
+
+def get_default_generator() -> np.random.Generator:
+    """ the generator used when no generator is passed to roll_batch """
+    return _default_generator
+
+
+def set_default_generator(generator: np.random.Generator) -> None:
+    global _default_generator
+    _default_generator = generator
+
+
+def advantage_sign(status: AdvantageStatus) -> int:
+    """ 1 for advantage, -1 for disadvantage and 0 otherwise """
+    if status == AdvantageStatus.ADVANTAGE:
+        return 1
+    if status == AdvantageStatus.DISADVANTAGE:
+        return -1
+    return 0
+
+
+def roll_expression(
+    count: int,
+    value: int,
+    advantage: int = 0,
+    crit: bool = False,
+    generator: Optional[np.random.Generator] = None
+) -> List[int]:
+    """
+    Roll a single dice expression, the kept dice are the ones roll_batch gives for a batch of this expression alone.
+
+    Args:
+        count: The number of dice
+        value: The number of sides of the dice
+        advantage: 1 for advantage, -1 for disadvantage, 0 for a normal roll
+        crit: Whether the number of dice is doubled by a critical hit
+        generator: The numpy random Generator to draw from, the default generator if None
+
+    Returns:
+        The kept value of every die
+    """
+    if generator is None:
+        generator = _default_generator
+    if crit:
+        count *= 2
+    draws = (generator.random(2 * count) * value).astype(np.int64).tolist()
+    first = [draw + 1 for draw in draws[:count]]
+    if advantage == 0:
+        return first
+    second = [draw + 1 for draw in draws[count:]]
+    if advantage > 0:
+        return [max(a, b) for a, b in zip(first, second)]
+    return [min(a, b) for a, b in zip(first, second)]
+
+
+class BatchRoll:
+    """
+    Array backed results of a batch of dice expressions.
+
+    Attributes:
+        dice (np.ndarray): The kept value of every die, shape [n, max dice], 0 past the dice of an expression.
+        draws (np.ndarray): The two rolls of every die, shape [2, n, max dice], the second one is only used with
+            advantage or disadvantage.
+        counts (np.ndarray): The number of dice rolled per expression, critical doubling included.
+        bonuses (np.ndarray): The flat bonus of every expression.
+        totals (np.ndarray): The sum of the kept dice plus the bonus of every expression.
+
+    Methods:
+        results(index) -> List[int]:
+            The kept dice of an expression.
+    """
+
+    __slots__ = ("dice", "draws", "counts", "bonuses", "totals")
+
+    def __init__(self, dice: np.ndarray, draws: np.ndarray, counts: np.ndarray, bonuses: np.ndarray, totals: np.ndarray):
+        self.dice = dice
+        self.draws = draws
+        self.counts = counts
+        self.bonuses = bonuses
+        self.totals = totals
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def results(self, index: int) -> List[int]:
+        return self.dice[index, :self.counts[index]].tolist()
+
+    def __repr__(self) -> str:
+        return f"BatchRoll(n={len(self)}, totals={self.totals!r})"
+
+
+def roll_batch(
+    counts: Union[int, Sequence[int], np.ndarray],
+    values: Union[int, Sequence[int], np.ndarray],
+    bonuses: Union[int, Sequence[int], np.ndarray] = 0,
+    advantage: Union[int, Sequence[int], np.ndarray] = 0,
+    crit: Union[bool, Sequence[bool], np.ndarray] = False,
+    size: Optional[int] = None,
+    generator: Optional[np.random.Generator] = None
+) -> BatchRoll:
+    """
+    Roll a batch of dice expressions.
+
+    Every argument is either one value per expression or a scalar shared by all of them.
+
+    Args:
+        counts: The number of dice of each expression
+        values: The number of sides of the dice of each expression
+        bonuses: The flat bonus added to each total
+        advantage: 1 for advantage, -1 for disadvantage, 0 for a normal roll, see advantage_sign
+        crit: Whether the number of dice is doubled by a critical hit
+        size: The number of expressions when every other argument is a scalar
+        generator: The numpy random Generator to draw from, the default generator if None
+
+    Returns:
+        The BatchRoll of the expressions, in the order given
+    """
+    if generator is None:
+        generator = _default_generator
+    counts = np.asarray(counts, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    bonuses = np.asarray(bonuses, dtype=np.int64)
+    advantage = np.asarray(advantage, dtype=np.int64)
+    crit = np.asarray(crit, dtype=bool)
+    shape = np.broadcast_shapes(counts.shape, values.shape, bonuses.shape, advantage.shape, crit.shape, (size,) if size is not None else ())
+    if len(shape) == 0:
+        shape = (1,)
+    counts = np.broadcast_to(counts, shape) * np.where(np.broadcast_to(crit, shape), 2, 1)
+    values = np.broadcast_to(values, shape)
+    advantage = np.broadcast_to(advantage, shape)
+
+    max_count = int(counts.max()) if counts.size else 0
+    # uniform draws scaled to the number of sides of every expression
+    draws = (generator.random((2,) + shape + (max_count,)) * values[..., None]).astype(np.int64) + 1
+    first, second = draws[0], draws[1]
+    dice = np.where(advantage[..., None] > 0, np.maximum(first, second), np.where(advantage[..., None] < 0, np.minimum(first, second), first))
+    dice[np.arange(max_count) >= counts[..., None]] = 0
+    totals = dice.sum(axis=-1) + bonuses
+    return BatchRoll(dice, draws, counts, np.broadcast_to(bonuses, shape), totals)
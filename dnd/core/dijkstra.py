@@ -1,12 +1,105 @@
 import heapq
-from typing import Dict, Tuple, List, Optional, Callable
+from typing import Any, Dict, Tuple, List, Optional, Callable, Iterable, Iterator, Mapping, Set
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+Position = Tuple[int, int]
+
+
+class PathMap(Mapping[Position, List[Position]]):
+    """
+    Lazy view of the shortest paths found by dijkstra.
+
+    Only the parent pointer of every reached position is stored, the path to a position is rebuilt by walking the
+    parents back to the start the first time it is read and then cached. Like the defaultdict it replaces in
+    Senses.paths, reading a position that was not reached returns an empty path instead of raising.
+
+    Attributes:
+        parents (Dict[Position, Optional[Position]]): The previous step of every reached position, None for the start.
+        fully_seen (Optional[Set[Position]]): The positions whose whole path lies in the seen set given to dijkstra,
+            None if no seen set was given.
+
+    Methods:
+        restrict(positions) -> PathMap:
+            A view sharing the same parents limited to the given positions.
+        from_paths(paths) -> PathMap:
+            Build a PathMap holding explicit paths.
+    """
+
+    def __init__(self, parents: Optional[Dict[Position, Optional[Position]]] = None, keys: Optional[Set[Position]] = None, fully_seen: Optional[Set[Position]] = None):
+        self.parents = parents if parents is not None else {}
+        self.fully_seen = fully_seen
+        self._keys = keys
+        self._cache: Dict[Position, List[Position]] = {}
+
+    def __contains__(self, position: object) -> bool:
+        if self._keys is not None:
+            return position in self._keys
+        return position in self.parents
+
+    def __getitem__(self, position: Position) -> List[Position]:
+        if position not in self:
+            return []
+        path = self._cache.get(position)
+        if path is None:
+            path = []
+            parents = self.parents
+            step: Optional[Position] = position
+            while step is not None:
+                path.append(step)
+                step = parents[step]
+            path.reverse()
+            self._cache[position] = path
+        return path
+
+    def get(self, position: Position, default=None):
+        return self[position] if position in self else default
+
+    def __iter__(self) -> Iterator[Position]:
+        return iter(self._keys if self._keys is not None else self.parents)
+
+    def __len__(self) -> int:
+        return len(self._keys if self._keys is not None else self.parents)
+
+    def __repr__(self) -> str:
+        return f"PathMap({len(self)} paths)"
+
+    @classmethod
+    def from_paths(cls, paths: Mapping[Position, List[Position]]) -> 'PathMap':
+        """ build a PathMap holding explicit paths, e.g. a plain dict of paths """
+        path_map = cls(keys=set(paths))
+        path_map._cache = {position: list(path) for position, path in paths.items()}
+        return path_map
+
+    def restrict(self, positions: Iterable[Position]) -> 'PathMap':
+        """ a view sharing the same parents limited to the given reached positions """
+        keys = {position for position in positions if position in self}
+        restricted = PathMap(self.parents, keys, self.fully_seen)
+        restricted._cache = self._cache
+        return restricted
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        """ validate from a PathMap or a mapping of paths, serialize as a plain dict of paths """
+        dict_schema = handler.generate_schema(Dict[Tuple[int, int], List[Tuple[int, int]]])
+        return core_schema.no_info_after_validator_function(
+            cls._validate,
+            core_schema.union_schema([core_schema.is_instance_schema(cls), dict_schema]),
+            serialization=core_schema.plain_serializer_function_ser_schema(dict, return_schema=dict_schema),
+        )
+
+    @classmethod
+    def _validate(cls, value: Any) -> 'PathMap':
+        return value if isinstance(value, cls) else cls.from_paths(value)
+
 
 def get_neighbors(position: Tuple[int, int], diagonal: bool, width: int, height: int) -> List[Tuple[int, int]]:
     x, y = position
     directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
     if diagonal:
         directions += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-    
+
     neighbors = []
     for dx, dy in directions:
         nx, ny = x + dx, y + dy
@@ -15,45 +108,67 @@ def get_neighbors(position: Tuple[int, int], diagonal: bool, width: int, height:
     return neighbors
 
 def dijkstra(
-    start: Tuple[int, int], 
-    is_walkable: Callable[[int, int], bool], 
-    width: int, 
-    height: int, 
-    diagonal: bool = True, 
+    start: Tuple[int, int],
+    is_walkable: Callable[[int, int], bool],
+    width: int,
+    height: int,
+    diagonal: bool = True,
     max_distance: Optional[int] = None,
-    epsilon: float = 0.001  # Small cost added for diagonal moves
-) -> Tuple[Dict[Tuple[int, int], int], Dict[Tuple[int, int], List[Tuple[int, int]]]]:
+    epsilon: float = 0.001,  # Small cost added for diagonal moves
+    seen: Optional[Set[Tuple[int, int]]] = None
+) -> Tuple[Dict[Tuple[int, int], int], PathMap]:
+    """
+    Shortest paths from start to every reachable position, diagonal moves cost an extra epsilon so straight
+    paths are preferred among those with the same number of steps.
+
+    Parent pointers are kept instead of copying the path of every relaxed position, the returned PathMap rebuilds
+    the paths on access. When a seen set is given, whether every step of the path to a position is in it is
+    propagated along the parents during the search and returned as PathMap.fully_seen.
+
+    Returns:
+        Tuple of (distances, paths) where distances maps positions to their number of steps from start.
+    """
     distances : Dict[Tuple[int, int], float] = {start: 0}
     true_distances = {start: 0}  # Distances without epsilon for final return
-    paths = {start: [start]}
+    parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+    track_seen = seen is not None
+    all_seen: Dict[Tuple[int, int], bool] = {start: start in seen} if track_seen else {}
+    # (dx, dy, additional cost) in the same order as get_neighbors, diagonal moves cost an extra epsilon
+    steps = [(0, 1, 0), (1, 0, 0), (0, -1, 0), (-1, 0, 0)]
+    if diagonal:
+        steps += [(1, 1, epsilon), (1, -1, epsilon), (-1, 1, epsilon), (-1, -1, epsilon)]
+    limit = max_distance if max_distance is not None else float("inf")
     pq = [(float(0), start)]
     visited = set()
 
     while pq:
         current_distance, current_position = heapq.heappop(pq)
-        
+
         if current_position in visited:
             continue
         visited.add(current_position)
-        
-        for neighbor in get_neighbors(current_position, diagonal, width, height):
-            if not is_walkable(*neighbor):
+        x, y = current_position
+        current_steps = true_distances[current_position] + 1
+        current_seen = all_seen.get(current_position, False)
+
+        for dx, dy, additional_cost in steps:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height) or not is_walkable(nx, ny):
                 continue
-            
-            # Calculate cost: add epsilon for diagonal moves
-            is_diagonal = (neighbor[0] != current_position[0]) and (neighbor[1] != current_position[1])
-            additional_cost = epsilon if is_diagonal else 0
+
             distance = current_distance + 1 + additional_cost
-            
-            if max_distance is not None and distance > max_distance:
+            if distance > limit:
                 continue
-            
-            if neighbor not in distances or distance < distances[neighbor]:
-                
+
+            neighbor = (nx, ny)
+            known_distance = distances.get(neighbor)
+            if known_distance is None or distance < known_distance:
                 distances[neighbor] = distance
-                true_distances[neighbor] = int(true_distances[current_position] + 1)  # Keep true distance without epsilon
-                paths[neighbor] = paths[current_position] + [neighbor]
+                true_distances[neighbor] = current_steps  # Keep true distance without epsilon
+                parents[neighbor] = current_position
+                if track_seen:
+                    all_seen[neighbor] = current_seen and neighbor in seen
                 heapq.heappush(pq, (distance, neighbor))
 
-    return true_distances, paths
-
+    fully_seen = {position for position, flag in all_seen.items() if flag} if track_seen else None
+    return true_distances, PathMap(parents, fully_seen=fully_seen)
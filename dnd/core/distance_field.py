@@ -0,0 +1,196 @@
+""" Uniform cost distance fields for 8-connected grid movement.
+
+Every step costs 1, so the shortest paths are found by a breadth first search over flat arrays instead of a heap.
+The search reproduces the diagonal epsilon rule of dnd.core.dijkstra exactly: among the paths with the fewest steps
+the one with the fewest diagonal moves is kept, ties are broken in the same order as the dijkstra heap and positions
+whose cost including the epsilon exceeds max_distance are not reached. The paths are therefore identical to the
+dijkstra ones.
+"""
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from dnd.core.dijkstra import PathMap
+from dnd.core.fov_cache import RevisionCache
+
+Position = Tuple[int, int]
+
+# (dx, dy, diagonal) in the order dnd.core.dijkstra.get_neighbors returns the neighbors
+STEPS = [(0, 1, False), (1, 0, False), (0, -1, False), (-1, 0, False), (1, 1, True), (1, -1, True), (-1, 1, True), (-1, -1, True)]
+
+
+class DistanceField:
+    """
+    Number of steps and shortest path from an origin to every reachable position.
+
+    The field is stored in flat arrays over a window of the grid, the (2 * max_distance + 1) square around the
+    origin, or the whole grid when the distance is unlimited.
+
+    Attributes:
+        origin (Position): The position the field is computed from.
+        max_distance (Optional[float]): The maximum cost of a path, None for unlimited.
+        order (List[int]): The flat indices of the reached positions in search order, parents come first.
+
+    Methods:
+        distance(position) -> Optional[int]:
+            The number of steps to a position in O(1), None if it is not reached.
+        path(position) -> List[Position]:
+            The shortest path to a position, empty if it is not reached.
+        distances() -> Dict[Position, int]:
+            The number of steps to every reached position.
+        path_map(seen) -> PathMap:
+            The paths to every reached position as a PathMap.
+    """
+
+    def __init__(self, origin: Position, max_distance: Optional[float], x0: int, y0: int, width: int, height: int,
+                 steps: List[int], parents: List[int], order: List[int]):
+        self.origin = origin
+        self.max_distance = max_distance
+        self.order = order
+        self._x0 = x0
+        self._y0 = y0
+        self._width = width
+        self._height = height
+        self._steps = steps
+        self._parents = parents
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _index(self, position: Position) -> int:
+        x, y = position[0] - self._x0, position[1] - self._y0
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return y * self._width + x
+        return -1
+
+    def _position(self, index: int) -> Position:
+        return (index % self._width + self._x0, index // self._width + self._y0)
+
+    def distance(self, position: Position) -> Optional[int]:
+        index = self._index(position)
+        if index < 0 or self._steps[index] < 0:
+            return None
+        return self._steps[index]
+
+    def path(self, position: Position) -> List[Position]:
+        index = self._index(position)
+        if index < 0 or self._steps[index] < 0:
+            return []
+        path = []
+        while index >= 0:
+            path.append(self._position(index))
+            index = self._parents[index]
+        path.reverse()
+        return path
+
+    def distances(self) -> Dict[Position, int]:
+        steps = self._steps
+        return {self._position(index): steps[index] for index in self.order}
+
+    def path_map(self, seen: Optional[Set[Position]] = None) -> PathMap:
+        """
+        The paths to every reached position as a PathMap.
+
+        Args:
+            seen: If given, PathMap.fully_seen holds the positions whose whole path lies in it.
+        """
+        positions = [self._position(index) for index in self.order]
+        position_of = dict(zip(self.order, positions))
+        parents_array = self._parents
+        parents: Dict[Position, Optional[Position]] = {}
+        for index, position in zip(self.order, positions):
+            parent = parents_array[index]
+            parents[position] = position_of[parent] if parent >= 0 else None
+        fully_seen = None
+        if seen is not None:
+            # parents are always found before their children, the flag can be propagated in one pass
+            fully_seen = set()
+            for position, parent in parents.items():
+                if position in seen and (parent is None or parent in fully_seen):
+                    fully_seen.add(position)
+        return PathMap(parents, fully_seen=fully_seen)
+
+
+def compute_distance_field(
+    origin: Position,
+    walkable_rows: Sequence[Sequence[bool]],
+    grid_width: int,
+    grid_height: int,
+    max_distance: Optional[float] = None,
+    epsilon: float = 0.001
+) -> DistanceField:
+    """
+    Breadth first search of the 8-connected walkable positions around origin.
+
+    Positions are expanded level by level. Within a level they are expanded by increasing cost including the diagonal
+    epsilon and then by position, which is the order the dijkstra heap pops them in, and a position keeps the first
+    parent giving its lowest cost, so the parents are the same as with dijkstra.
+
+    Args:
+        origin: The start position, it does not need to be walkable
+        walkable_rows: The walkable cells indexed [y][x], only read inside the grid
+        grid_width: The width of the grid
+        grid_height: The height of the grid
+        max_distance: Maximum cost of a path including the diagonal epsilon (optional)
+        epsilon: Small cost added for diagonal moves
+
+    Returns:
+        The DistanceField of the origin
+    """
+    ox, oy = origin
+    if max_distance is None:
+        x0, y0 = min(ox, 0), min(oy, 0)
+        x1, y1 = max(ox + 1, grid_width), max(oy + 1, grid_height)
+        limit = float("inf")
+    else:
+        reach = max(int(max_distance), 0)
+        x0, y0, x1, y1 = ox - reach, oy - reach, ox + reach + 1, oy + reach + 1
+        limit = max_distance
+    # the window clipped to the grid, neighbors outside of it are never reached
+    min_x, min_y = max(x0, 0), max(y0, 0)
+    max_x, max_y = min(x1, grid_width), min(y1, grid_height)
+    width, height = x1 - x0, y1 - y0
+    size = width * height
+
+    steps = [-1] * size
+    costs = [0.0] * size
+    parents = [-1] * size
+    start = (oy - y0) * width + (ox - x0)
+    steps[start] = 0
+    order = [start]
+    offsets = [(dx, dy, dy * width + dx, epsilon if diagonal else 0) for dx, dy, diagonal in STEPS]
+
+    frontier = [start]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for index in frontier:
+            x, y = index % width + x0, index // width + y0
+            cost = costs[index]
+            for dx, dy, offset, additional_cost in offsets:
+                nx, ny = x + dx, y + dy
+                if not (min_x <= nx < max_x and min_y <= ny < max_y) or not walkable_rows[ny][nx]:
+                    continue
+                distance = cost + 1 + additional_cost
+                if distance > limit:
+                    continue
+                neighbor = index + offset
+                neighbor_steps = steps[neighbor]
+                if neighbor_steps < 0:
+                    steps[neighbor] = level
+                    costs[neighbor] = distance
+                    parents[neighbor] = index
+                    next_frontier.append(neighbor)
+                elif neighbor_steps == level and distance < costs[neighbor]:
+                    costs[neighbor] = distance
+                    parents[neighbor] = index
+        # expand the next level in the order the dijkstra heap would pop it: by cost, then by (x, y)
+        next_frontier.sort(key=lambda i: (costs[i], i % width, i // width))
+        order.extend(next_frontier)
+        frontier = next_frontier
+
+    return DistanceField(origin, max_distance, x0, y0, width, height, steps, parents, order)
+
+
+class DistanceFieldCache(RevisionCache[DistanceField]):
+    """ Least recently used cache of the distance fields of an origin within a radius """
@@ -0,0 +1,191 @@
+""" On-disk archive for events evicted from the EventQueue.
+
+Evicted lineages are appended to a JSON lines file, a lineage archived again only appends its new events on another
+line, and an in-memory offset index of the lines of every lineage allows reading a single lineage back lazily without
+loading the whole file. The lineage of an archived event is resolved through a sidecar index file of fixed width
+"event_uuid lineage_uuid" lines that is scanned on a miss of a bounded cache. Only a compact record of each event is kept:
+the base Event fields plus a JSON-friendly summary of the subclass payload (objects with a uuid are stored by name and uuid).
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+_INDEX_LINE_SIZE = 74
+_INDEX_CHUNK_LINES = 4096
+
+
+def _summarize(value: Any) -> Any:
+    """ reduce a payload value to something json serializable, objects with a uuid are stored by reference """
+    if isinstance(value, BaseModel) and isinstance(getattr(value, "uuid", None), UUID):
+        return {"object_class": value.__class__.__name__, "uuid": str(value.uuid), "name": getattr(value, "name", None)}
+    if isinstance(value, (list, tuple)):
+        return [_summarize(item) for item in value]
+    return to_jsonable_python(value, fallback=str)
+
+
+class EventArchive:
+    """
+    Append-only JSON lines archive of evicted event lineages.
+
+    Attributes:
+        path (str): The path of the archive file.
+        index_path (str): The path of the sidecar file mapping archived events to their lineage.
+        cache_size (int): The maximum number of event lineages kept in memory.
+
+    Methods:
+        write_lineage(lineage_uuid, records) -> None:
+            Append the new events of a lineage to the archive.
+        read_lineage(lineage_uuid) -> List[Dict[str, Any]]:
+            Read the records of an archived lineage.
+        find_lineage(event_uuid) -> Optional[UUID]:
+            Find the lineage an archived event belongs to.
+        event_to_record(event, base_fields) -> Dict[str, Any]:
+            Convert an event to an archive record.
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096):
+        self.path = path
+        self.index_path = path + ".index"
+        self.cache_size = cache_size
+        self._lineage_offsets: Dict[UUID, List[int]] = {}
+        self._event_lineages: "OrderedDict[UUID, UUID]" = OrderedDict()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            self._load_index()
+
+    def _load_index(self) -> None:
+        """ rebuild the offset index from an existing archive file, and the sidecar index if it is missing """
+        rebuild_sidecar = not os.path.exists(self.index_path)
+        with open(self.path, "rb") as archive_file:
+            offset = archive_file.tell()
+            line = archive_file.readline()
+            while line:
+                entry = json.loads(line)
+                lineage_uuid = UUID(entry["lineage_uuid"])
+                self._lineage_offsets.setdefault(lineage_uuid, []).append(offset)
+                if rebuild_sidecar:
+                    self._append_sidecar(lineage_uuid, entry["events"])
+                offset = archive_file.tell()
+                line = archive_file.readline()
+
+    def _append_sidecar(self, lineage_uuid: UUID, records: List[Dict[str, Any]]) -> None:
+        """ append the events of a lineage line to the sidecar index """
+        event_uuids = list(dict.fromkeys(record["uuid"] for record in records))
+        lines = "".join(f"{event_uuid} {lineage_uuid}\n" for event_uuid in event_uuids)
+        with open(self.index_path, "ab") as index_file:
+            index_file.write(lines.encode("ascii"))
+
+    def _cache_lineage(self, event_uuid: UUID, lineage_uuid: UUID) -> None:
+        self._event_lineages[event_uuid] = lineage_uuid
+        self._event_lineages.move_to_end(event_uuid)
+        if len(self._event_lineages) > self.cache_size:
+            self._event_lineages.popitem(last=False)
+
+    def _scan_sidecar(self, event_uuid: UUID) -> Optional[UUID]:
+        """ scan the sidecar index for an event, the lines have a fixed width so a chunk never splits a line """
+        if not os.path.exists(self.index_path):
+            return None
+        key = str(event_uuid).encode("ascii")
+        with open(self.index_path, "rb") as index_file:
+            chunk = index_file.read(_INDEX_LINE_SIZE * _INDEX_CHUNK_LINES)
+            while chunk:
+                position = chunk.find(key)
+                while position != -1 and position % _INDEX_LINE_SIZE != 0:
+                    position = chunk.find(key, position + 1)
+                if position != -1:
+                    start = position + len(key) + 1
+                    return UUID(chunk[start:start + 36].decode("ascii"))
+                chunk = index_file.read(_INDEX_LINE_SIZE * _INDEX_CHUNK_LINES)
+        return None
+
+    @staticmethod
+    def event_to_record(event: BaseModel, base_fields: List[str]) -> Dict[str, Any]:
+        """
+        Convert an event to an archive record.
+
+        Args:
+            event (BaseModel): The event to convert.
+            base_fields (List[str]): The fields stored as they are, every other field is summarized in the payload.
+
+        Returns:
+            Dict[str, Any]: A json serializable record of the event.
+        """
+        record = {name: to_jsonable_python(getattr(event, name), fallback=str) for name in base_fields}
+        record["event_class"] = event.__class__.__name__
+        record["payload"] = {
+            name: _summarize(getattr(event, name))
+            for name in event.__class__.model_fields
+            if name not in base_fields
+        }
+        return record
+
+    def __contains__(self, lineage_uuid: UUID) -> bool:
+        return lineage_uuid in self._lineage_offsets
+
+    def __len__(self) -> int:
+        return len(self._lineage_offsets)
+
+    def write_lineage(self, lineage_uuid: UUID, records: List[Dict[str, Any]]) -> None:
+        """
+        Append the new events of a lineage to the archive, a lineage archived again gets another line with only
+        the new records and the lines are merged on read.
+
+        Args:
+            lineage_uuid (UUID): The lineage uuid.
+            records (List[Dict[str, Any]]): The new event records of the lineage in chronological order.
+        """
+        if not records:
+            return
+        entry = {"lineage_uuid": str(lineage_uuid), "events": records}
+        with open(self.path, "ab") as archive_file:
+            offset = archive_file.tell()
+            archive_file.write(json.dumps(entry).encode("utf-8") + b"\n")
+        self._lineage_offsets.setdefault(lineage_uuid, []).append(offset)
+        self._append_sidecar(lineage_uuid, records)
+        for record in records:
+            self._cache_lineage(UUID(record["uuid"]), lineage_uuid)
+
+    def read_lineage(self, lineage_uuid: UUID) -> List[Dict[str, Any]]:
+        """
+        Read the records of an archived lineage, merging the lines it was archived in.
+
+        Args:
+            lineage_uuid (UUID): The lineage uuid.
+
+        Returns:
+            List[Dict[str, Any]]: The event records in archive order, empty if the lineage is not archived.
+        """
+        offsets = self._lineage_offsets.get(lineage_uuid)
+        if not offsets:
+            return []
+        records = []
+        with open(self.path, "rb") as archive_file:
+            for offset in offsets:
+                archive_file.seek(offset)
+                records.extend(json.loads(archive_file.readline())["events"])
+        return records
+
+    def find_lineage(self, event_uuid: UUID) -> Optional[UUID]:
+        """
+        Find the lineage an archived event belongs to.
+
+        Args:
+            event_uuid (UUID): The uuid of the event.
+
+        Returns:
+            Optional[UUID]: The lineage uuid or None if the event is not archived.
+        """
+        lineage_uuid = self._event_lineages.get(event_uuid)
+        if lineage_uuid is None:
+            lineage_uuid = self._scan_sidecar(event_uuid)
+            if lineage_uuid is None:
+                return None
+        self._cache_lineage(event_uuid, lineage_uuid)
+        return lineage_uuid
@@ -5,16 +5,20 @@ it introduces and Event qeueue which is the source of ground truth information f
 
 from enum import Enum
 from logging import handlers
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from typing import Literal as TypeLiteral, Union,List, Optional, Dict, Any, Self, Literal, TypeVar, Protocol, runtime_checkable
 from dnd.core.values import ModifiableValue
 from uuid import UUID, uuid4
 from dnd.core.dice import Dice, DiceRoll, AttackOutcome, RollType
-from datetime import datetime
+from datetime import datetime, timedelta
 from dnd.core.modifiers import NumericalModifier, DamageType , ResistanceStatus, ContextAwareCondition, saving_throws, ResistanceModifier
 from collections import defaultdict
-from typing import Callable, Tuple
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Callable, Collection, Tuple, Set
 from dnd.core.base_object import BaseObject
+from dnd.core.event_archive import EventArchive
+from dnd.core.world import world_scoped, WorldScopedMeta
 # Type definition for event listeners
 T = TypeVar('T', bound='Event')
 E = TypeVar('E', bound='Event')
@@ -111,6 +115,11 @@ class EventPhase(str, Enum):
 
 ordered_event_phases = [EventPhase.DECLARATION, EventPhase.EXECUTION, EventPhase.EFFECT, EventPhase.COMPLETION]
 
+# One bit per phase, used by the EventQueue to skip dispatch for phases without handlers
+event_phase_bits = {phase: 1 << index for index, phase in enumerate(EventPhase)}
+
+DispatchKey = Tuple[EventType, EventPhase, Optional[UUID], Optional[UUID]]
+
 
 class Event(BaseObject):
     """Base class for all game events"""
@@ -128,11 +137,21 @@ class Event(BaseObject):
     # Flag to indicate if event should be canceled
     canceled: bool = Field(default=False,description="Flag to indicate if event should be canceled")
     parent_event: Optional[UUID] = Field(default=None,description="The parent event of the current event")
+    sequence_number: Optional[int] = Field(default=None,description="The position of the event in the event log, assigned by the EventQueue when the event is stored")
     status_message: Optional[str] = Field(default=None,description="A status message for the event")
     
     # Track children events differently
     lineage_children_events: List[UUID] = Field(default_factory=list,description="All children events that happened throughout this event's lifetime")
     children_events: List[UUID] = Field(default_factory=list,description="Children events that happened during the current phase")
+    versioned: bool = Field(default=False,description="If true post and phase_to update the event in place and keep a delta log of the previous versions instead of creating a copy with a new uuid")
+    
+    # Versioned events only: for each post, the previous values of the fields it changed
+    _version_undo: List[Dict[str, Any]] = PrivateAttr(default_factory=list)
+    _indexed_version: int = PrivateAttr(default=0)
+    # the timestamp the event is indexed under, a versioned event moves to its new timestamp when a version is stored
+    _indexed_timestamp: Optional[datetime] = PrivateAttr(default=None)
+    # the lineage, type, phase, source and target the event is indexed under, see EventQueue._keyed_indexes
+    _indexed_keys: Optional[Tuple[Any, ...]] = PrivateAttr(default=None)
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
@@ -234,6 +253,24 @@ class Event(BaseObject):
             return EventQueue.get_event_by_uuid(self.parent_event)
         return None
     
+    @property
+    def version(self) -> int:
+        """ the number of times a versioned event has been posted, always 0 for non versioned events """
+        return len(self._version_undo)
+
+    def get_versions(self) -> List['Event']:
+        """ rebuild all the versions of a versioned event from its delta log, oldest first, the last element is the event itself.
+        The earlier versions are unregistered copies built on demand """
+        versions = [self]
+        rollback: Dict[str, Any] = {}
+        for index in range(len(self._version_undo) - 1, -1, -1):
+            rollback.update(self._version_undo[index])
+            version = self.model_copy(update=rollback)
+            version._version_undo = self._version_undo[:index]
+            versions.append(version)
+        versions.reverse()
+        return versions
+
     def get_history(self) -> List['Event']:
         """ get all previous version of the event by getting the full list by uuid and getting the current event as last element
         """
@@ -265,6 +302,9 @@ class Event(BaseObject):
         updates['modified'] = True
         updates['timestamp'] = datetime.now()
         
+        if self.versioned:
+            return self._post_in_place(updates)
+        
         # Generate a new UUID but preserve the lineage
         updates['uuid'] = uuid4()
         if 'lineage_uuid' not in updates:
@@ -285,6 +325,31 @@ class Event(BaseObject):
             
         return result  
     
+    def _post_in_place(self, updates: Dict[str, Any]) -> Self:
+        """ apply the updates of a versioned event in place, storing only the previous values of the changed fields, and rebroadcast it """
+        fields = self.__class__.model_fields
+        undo = {}
+        for name, value in updates.items():
+            if name in fields:
+                current = getattr(self, name)
+                if current is value or (not isinstance(current, BaseModel) and type(current) is type(value) and current == value):
+                    continue
+                undo[name] = current
+                self.__pydantic_fields_set__.add(name)
+            # unknown keys end up in the instance dict exactly like with model_copy(update=...)
+            self.__dict__[name] = value
+        self._version_undo.append(undo)
+        
+        if self.use_register:
+            result = EventQueue.register(self)
+        else:
+            result = self
+        
+        if not isinstance(result, self.__class__):
+            raise TypeError(f"Expected {self.__class__.__name__} but got {result.__class__.__name__}")
+            
+        return result
+    
 class Trigger(BaseModel):
     name: str = Field(default="Trigger",description="The name of the trigger")
     event_type: EventType = Field(description="The type of event to trigger the event handler")
@@ -324,6 +389,10 @@ class Trigger(BaseModel):
         """ check if the trigger is simple, i.e. it is only based on the event type and phase """
         return self.event_source_entity_uuid is None and self.event_target_entity_uuid is None
     
+    def get_dispatch_key(self) -> DispatchKey:
+        """ get the plain tuple used by the EventQueue dispatch table for this trigger """
+        return (self.event_type, self.event_phase, self.event_source_entity_uuid, self.event_target_entity_uuid)
+    
     def get_simple_trigger(self) -> 'Trigger':
         """ get a simple trigger that is only based on the event type and phase """
         return Trigger(event_type=self.event_type, event_phase=self.event_phase)
@@ -333,6 +402,7 @@ class EventHandler(BaseObject):
     name: str = Field(default="EventHandler",description="The name of the event handler")
     trigger_conditions: List[Trigger] = Field(default_factory=list,description="The conditions that trigger the event handler")
     event_processor: EventProcessor = Field(description="The event processor to handle the event")
+    selector_group: Optional[str] = Field(default=None,description="The EventQueue handler selector deciding, once per event, which handlers of this group are called")
     
     def __call__(self, event: Event, source_entity_uuid: Optional[UUID] = None) -> Optional[Event]:
         if source_entity_uuid is None:
@@ -360,31 +430,69 @@ class EventHandler(BaseObject):
 
         return True
 
-class EventQueue:
-    """Static registry for events with additional querying and reaction capabilities"""
-    # Static registry dictionaries
-    _events_by_lineage : Dict[UUID, List[Event]] = defaultdict(list)
-    _events_by_uuid : Dict[UUID, Event] = {}
-    _events_by_type : Dict[EventType, List[Event]] = defaultdict(list)
-    _events_by_timestamp : Dict[datetime, List[Event]] = defaultdict(list)
-    _events_by_phase : Dict[EventPhase, List[Event]] = defaultdict(list)
-    _events_by_source : Dict[UUID, List[Event]] = defaultdict(list)
-    _events_by_target : Dict[UUID, List[Event]] = defaultdict(list)
-    _all_events : List[Event] = []
-    _event_handlers : Dict[UUID, EventHandler] = {}
-    _event_handlers_by_trigger : Dict[Trigger, List[EventHandler]] = defaultdict(list)
-    _event_handlers_by_simple_trigger : Dict[Trigger, List[EventHandler]] = defaultdict(list)
-    _event_handlers_by_source_entity_uuid : Dict[UUID, List[EventHandler]] = defaultdict(list)
+class EventRetentionPolicy(BaseModel):
+    """
+    Retention policy for the history kept by the EventQueue.
+
+    Events are evicted by whole lineages so that every index stays consistent, the oldest lineages go first.
+    Eviction runs in batches: once max_events is exceeded the history is trimmed down to low_watermark * max_events.
+
+    Attributes:
+        max_events (Optional[int]): Maximum number of events kept in memory, None for no limit.
+        max_age (Optional[timedelta]): Lineages that started longer ago than this are evicted, None for no limit.
+        compact_lineages (bool): Whether completed or canceled lineages keep only their final event.
+        compaction_interval (int): Number of stored events between two compaction passes.
+        low_watermark (float): Fraction of max_events kept after an eviction pass.
+        archive_path (Optional[str]): Path of a JSON lines archive that receives evicted events, None to drop them.
+    """
+    max_events: Optional[int] = Field(default=None, gt=0, description="Maximum number of events kept in memory")
+    max_age: Optional[timedelta] = Field(default=None, description="Maximum age of a lineage kept in memory")
+    compact_lineages: bool = Field(default=False, description="Whether completed lineages keep only their final event")
+    compaction_interval: int = Field(default=1000, gt=0, description="Number of stored events between two compaction passes")
+    low_watermark: float = Field(default=0.9, gt=0, le=1, description="Fraction of max_events kept after an eviction pass")
+    archive_path: Optional[str] = Field(default=None, description="Path of the archive for evicted events")
+
+
+class EventQueue(metaclass=WorldScopedMeta):
+    """Registry for the events of the current world with additional querying and reaction capabilities"""
+    # Registry dictionaries, every world owns its own instances
+    _events_by_lineage : Dict[UUID, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _events_by_uuid : Dict[UUID, Event] = world_scoped(dict)
+    _events_by_type : Dict[EventType, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _events_by_timestamp : Dict[datetime, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _events_by_phase : Dict[EventPhase, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _events_by_source : Dict[UUID, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _events_by_target : Dict[UUID, List[Event]] = world_scoped(lambda: defaultdict(list))
+    _all_events : List[Event] = world_scoped(list)
+    _all_timestamps : List[datetime] = world_scoped(list)
+    _sequence_counter = world_scoped(count)
+    _retention_policy : Optional[EventRetentionPolicy] = world_scoped(lambda: None)
+    _archive : Optional[EventArchive] = world_scoped(lambda: None)
+    _compactable_lineages : Set[UUID] = world_scoped(set)
+    _stores_since_compaction : int = world_scoped(int)
+    # the protected lineage of the last age eviction pass and the timestamp the age limit can evict from next, see _check_retention
+    _age_eviction_blocked : Optional[Tuple[UUID, Optional[datetime]]] = world_scoped(lambda: None)
+    _event_handlers : Dict[UUID, EventHandler] = world_scoped(dict)
+    # Handlers keyed by (event_type, phase, source, target) of their triggers, source and target are None when not constrained
+    _dispatch_table : Dict[DispatchKey, List[EventHandler]] = world_scoped(lambda: defaultdict(list))
+    # Bitmask of the phases with at least one handler per event type and the handler count behind each bit
+    _handled_phases : Dict[EventType, int] = world_scoped(lambda: defaultdict(int))
+    _handler_counts : Dict[Tuple[EventType, EventPhase], int] = world_scoped(lambda: defaultdict(int))
+    _event_handlers_by_source_entity_uuid : Dict[UUID, List[EventHandler]] = world_scoped(lambda: defaultdict(list))
+    # Functions returning the source entity uuids of the handlers of a selector group that should be called for an event,
+    # they hold no state and are shared by every world
+    _handler_selectors : Dict[str, Callable[[Event], Collection[UUID]]] = {}
     @classmethod
     def register(cls, event: Event) -> Event:
         """Register an event and notify listeners"""
         # Store in all appropriate indices
         cls._store_event(event)
         
-        # Check for listeners
+        # If event is already in completion phase or there are no listeners, return as is
+        if event.phase == EventPhase.COMPLETION:
+            return event
         handlers = cls._get_handlers_for_event(event)
-        # If no listeners or event is already in completion phase, return as is
-        if not handlers or event.phase == EventPhase.COMPLETION:
+        if not handlers:
             return event
             
         # Process through listeners
@@ -418,7 +526,21 @@ class EventQueue:
     
     @classmethod
     def _store_event(cls, event: Event) -> None:
-        """Store an event in all indices"""
+        """Store an event in all indices
+
+        Storing is O(1) amortized: the event gets the next sequence number and is appended to the
+        chronological log, falling back to a bisect insertion only when its timestamp is older than
+        the latest stored event. Storing the same event object twice is a no-op.
+        """
+        if cls._events_by_uuid.get(event.uuid) is event:
+            if event.versioned and event._indexed_version < event.version:
+                cls._store_event_version(event)
+            return
+        event.sequence_number = next(cls._sequence_counter)
+        event._indexed_version = event.version
+        event._indexed_timestamp = event.timestamp
+        event._indexed_keys = cls._index_keys(event)
+
         # By lineage UUID (for tracking event history)
         cls._events_by_lineage[event.lineage_uuid].append(event)
         
@@ -448,26 +570,284 @@ class EventQueue:
         if event.target_entity_uuid:
             cls._events_by_target[event.target_entity_uuid].append(event)
         
-        # Add to chronological list and sort
-        cls._all_events.append(event)
-        cls._all_events.sort(key=lambda e: e.timestamp)
+        cls._insert_chronological(event)
+
+        if cls._retention_policy is not None:
+            cls._check_retention(event)
+
+    @classmethod
+    def _insert_chronological(cls, event: Event) -> None:
+        """Add an event to the chronological log, events almost always arrive in timestamp order"""
+        if not cls._all_timestamps or event.timestamp >= cls._all_timestamps[-1]:
+            cls._all_events.append(event)
+            cls._all_timestamps.append(event.timestamp)
+        else:
+            index = bisect_right(cls._all_timestamps, event.timestamp)
+            cls._all_events.insert(index, event)
+            cls._all_timestamps.insert(index, event.timestamp)
+
+    @classmethod
+    def _keyed_indexes(cls) -> Tuple[Dict[Any, List[Event]], ...]:
+        """The indexes keyed by an event field, in the order of the keys returned by _index_keys"""
+        return (cls._events_by_lineage, cls._events_by_type, cls._events_by_phase, cls._events_by_source, cls._events_by_target)
+
+    @staticmethod
+    def _index_keys(event: Event) -> Tuple[Any, ...]:
+        """The keys of an event in the keyed indexes, an event without target is not indexed by target"""
+        return (event.lineage_uuid, event.event_type, event.phase, event.source_entity_uuid, event.target_entity_uuid or None)
+
+    @staticmethod
+    def _move_in_index(index: Dict[Any, List[Event]], previous: Any, current: Any, event: Event) -> None:
+        """Move an event from the bucket of its previous key to the end of the bucket of its current key, None keys are not indexed"""
+        bucket = index.get(previous) if previous is not None else None
+        if bucket is not None:
+            # the event was usually indexed recently, near the end of its bucket
+            for position in range(len(bucket) - 1, -1, -1):
+                if bucket[position] is event:
+                    del bucket[position]
+                    break
+            if not bucket:
+                del index[previous]
+        if current is not None:
+            index[current].append(event)
+
+    @classmethod
+    def _store_event_version(cls, event: Event) -> None:
+        """Index a new version of a versioned event that is already stored, the event moves to the phase, type, source,
+        target and lineage of the new version in the keyed indexes and to its timestamp in the timestamp index and the
+        chronological log"""
+        event._indexed_version = event.version
+        if event.timestamp != event._indexed_timestamp:
+            cls._reindex_timestamp(event)
+        keys = cls._index_keys(event)
+        if keys != event._indexed_keys:
+            for index, previous, current in zip(cls._keyed_indexes(), event._indexed_keys, keys):
+                if previous != current:
+                    cls._move_in_index(index, previous, current, event)
+            event._indexed_keys = keys
+        if cls._retention_policy is not None:
+            cls._check_retention(event)
+
+    @classmethod
+    def _reindex_timestamp(cls, event: Event) -> None:
+        """Move a stored event from the timestamp it is indexed under to its current timestamp, keeping the chronological log sorted"""
+        previous = event._indexed_timestamp
+        cls._move_in_index(cls._events_by_timestamp, previous, event.timestamp, event)
+        # the previous version is among the events stored with the same timestamp, usually near the end of the log
+        for index in range(bisect_left(cls._all_timestamps, previous), bisect_right(cls._all_timestamps, previous)):
+            if cls._all_events[index] is event:
+                del cls._all_events[index]
+                del cls._all_timestamps[index]
+                break
+        cls._insert_chronological(event)
+        event._indexed_timestamp = event.timestamp
+
+    @classmethod
+    def set_retention_policy(cls, policy: Optional[EventRetentionPolicy]) -> None:
+        """Set the retention policy of the event history, None keeps every event forever"""
+        cls._retention_policy = policy
+        cls._archive = EventArchive(policy.archive_path) if policy is not None and policy.archive_path else None
+        cls._compactable_lineages = set()
+        cls._stores_since_compaction = 0
+        cls._age_eviction_blocked = None
+        if policy is not None:
+            cls._compactable_lineages = {lineage_uuid for lineage_uuid, events in cls._events_by_lineage.items()
+                                         if events[-1].phase in (EventPhase.COMPLETION, EventPhase.CANCEL)}
+            cls.enforce_retention()
+
+    @classmethod
+    def _check_retention(cls, event: Event) -> None:
+        """Run a retention pass if the policy limits are exceeded after storing the event"""
+        policy = cls._retention_policy
+        if policy.compact_lineages:
+            cls._stores_since_compaction += 1
+            if event.phase in (EventPhase.COMPLETION, EventPhase.CANCEL):
+                cls._compactable_lineages.add(event.lineage_uuid)
+        if policy.max_events is not None and len(cls._all_events) > policy.max_events:
+            cls.enforce_retention(protected_lineage=event.lineage_uuid)
+        elif policy.max_age is not None and cls._all_timestamps[0] < datetime.now() - policy.max_age and not cls._age_eviction_waits(event):
+            cls.enforce_retention(protected_lineage=event.lineage_uuid)
+        elif policy.compact_lineages and cls._stores_since_compaction >= policy.compaction_interval:
+            cls.enforce_retention(protected_lineage=event.lineage_uuid)
+
+    @classmethod
+    def _age_eviction_waits(cls, event: Event) -> bool:
+        """Whether the last age eviction pass protected the lineage of the event and left no other event older than max_age,
+        a pass would only scan the protected events again"""
+        blocked = cls._age_eviction_blocked
+        if blocked is None or blocked[0] != event.lineage_uuid:
+            return False
+        next_eviction = blocked[1]
+        return next_eviction is None or next_eviction >= datetime.now() - cls._retention_policy.max_age
+
+    @classmethod
+    def enforce_retention(cls, protected_lineage: Optional[UUID] = None) -> int:
+        """
+        Compact and evict events according to the retention policy.
+
+        Args:
+            protected_lineage (Optional[UUID]): A lineage that must not be evicted, typically the one being processed.
+
+        Returns:
+            int: The number of events removed from memory.
+        """
+        policy = cls._retention_policy
+        if policy is None:
+            return 0
+        dropped: Dict[UUID, List[Event]] = defaultdict(list)
+
+        if policy.compact_lineages:
+            for lineage_uuid in cls._compactable_lineages:
+                events = cls._events_by_lineage.get(lineage_uuid, [])
+                if len(events) > 1 and events[-1].phase in (EventPhase.COMPLETION, EventPhase.CANCEL):
+                    dropped[lineage_uuid].extend(events[:-1])
+            cls._compactable_lineages = set()
+            cls._stores_since_compaction = 0
+
+        remaining = len(cls._all_events) - sum(len(events) for events in dropped.values())
+        target = int(policy.max_events * policy.low_watermark) if policy.max_events is not None else None
+        cutoff = datetime.now() - policy.max_age if policy.max_age is not None else None
+        visited: Set[UUID] = set()
+        # every event kept before this timestamp belongs to the protected lineage
+        next_eviction: Optional[datetime] = None
+        for event in cls._all_events:
+            too_many = target is not None and remaining > target
+            too_old = cutoff is not None and event.timestamp < cutoff
+            if not too_many and not too_old:
+                next_eviction = event.timestamp
+                break
+            lineage_uuid = event.lineage_uuid
+            if lineage_uuid in visited or lineage_uuid == protected_lineage:
+                continue
+            visited.add(lineage_uuid)
+            lineage_events = cls._events_by_lineage[lineage_uuid]
+            already_dropped = dropped.get(lineage_uuid, [])
+            remaining -= len(lineage_events) - len(already_dropped)
+            dropped[lineage_uuid] = list(lineage_events)
+        cls._age_eviction_blocked = (protected_lineage, next_eviction) if cutoff is not None and protected_lineage is not None else None
+
+        if not dropped:
+            return 0
+        cls._remove_events(dropped)
+        return sum(len(events) for events in dropped.values())
+
+    @classmethod
+    def _remove_events(cls, dropped: Dict[UUID, List[Event]]) -> None:
+        """Remove events from every index and archive them if an archive is configured"""
+        dropped_ids = {id(event) for events in dropped.values() for event in events}
+        for index in (cls._events_by_lineage, cls._events_by_timestamp, cls._events_by_type,
+                      cls._events_by_phase, cls._events_by_source, cls._events_by_target):
+            for key in list(index.keys()):
+                kept = [event for event in index[key] if id(event) not in dropped_ids]
+                if kept:
+                    index[key] = kept
+                else:
+                    del index[key]
+        kept_events = [event for event in cls._all_events if id(event) not in dropped_ids]
+        cls._all_events[:] = kept_events
+        cls._all_timestamps[:] = [event.timestamp for event in kept_events]
+
+        base_fields = list(Event.model_fields.keys())
+        for lineage_uuid, events in dropped.items():
+            for event in events:
+                if cls._events_by_uuid.get(event.uuid) is event:
+                    del cls._events_by_uuid[event.uuid]
+                if BaseObject._registry.get(event.uuid) is event:
+                    BaseObject.unregister(event.uuid)
+            if cls._archive is not None:
+                versions = [version for event in events for version in (event.get_versions() if event.versioned else [event])]
+                cls._archive.write_lineage(lineage_uuid, [EventArchive.event_to_record(version, base_fields) for version in versions])
+
+    @classmethod
+    def _get_archived_history(cls, event_uuid: UUID) -> List[Event]:
+        """Get the archived history of an event that is no longer in memory"""
+        if cls._archive is None:
+            return []
+        lineage_uuid = cls._archive.find_lineage(event_uuid)
+        if lineage_uuid is None:
+            return []
+        return sorted(cls._get_archived_lineage(lineage_uuid), key=lambda e: e.timestamp)
+
+    @classmethod
+    def _get_archived_lineage(cls, lineage_uuid: UUID) -> List[Event]:
+        """Rebuild the archived part of a lineage as base events, the subclass payload is kept in the context"""
+        history = []
+        for record in cls._archive.read_lineage(lineage_uuid):
+            data = {key: value for key, value in record.items() if key not in ("event_class", "payload", "context", "use_register")}
+            data["use_register"] = False
+            data["context"] = {"archived": True, "event_class": record["event_class"], "payload": record["payload"]}
+            history.append(Event.model_validate(data))
+        return history
     
     @classmethod
     def _get_handlers_for_event(cls, event: Event) -> List[EventHandler]:
-        """Get all listeners for a specific event"""
-
-        trigger_condition = event.get_trigger()
-        if not trigger_condition.is_simple():
-            simple_trigger = trigger_condition.get_simple_trigger()
-            simple_handlers = cls._event_handlers_by_simple_trigger.get(simple_trigger, [])
-            complex_handlers = cls._event_handlers_by_trigger.get(trigger_condition, [])
-   
-            all_handlers = simple_handlers + complex_handlers
-        else:
-             all_handlers = cls._event_handlers_by_trigger.get(trigger_condition, [])
+        """Get all listeners for a specific event
         
+        Handlers are looked up in the dispatch table with plain tuples: the simple (type, phase) handlers first,
+        then the ones constrained on the event source, on the event target and on both.
+        """
+        event_type = event.event_type
+        phase = event.phase
+        if not cls._handled_phases.get(event_type, 0) & event_phase_bits[phase]:
+            return []
+        
+        source = event.source_entity_uuid
+        target = event.target_entity_uuid
+        dispatch_table = cls._dispatch_table
+        buckets = [dispatch_table.get((event_type, phase, None, None))]
+        if source is not None:
+            buckets.append(dispatch_table.get((event_type, phase, source, None)))
+        if target is not None:
+            buckets.append(dispatch_table.get((event_type, phase, None, target)))
+            if source is not None:
+                buckets.append(dispatch_table.get((event_type, phase, source, target)))
+        buckets = [bucket for bucket in buckets if bucket]
         
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            all_handlers = list(buckets[0])
+        else:
+            # a handler with several matching triggers is only called once
+            seen = set()
+            all_handlers = []
+            for bucket in buckets:
+                for handler in bucket:
+                    if id(handler) not in seen:
+                        seen.add(id(handler))
+                        all_handlers.append(handler)
+        if cls._handler_selectors:
+            return cls._select_handlers(event, all_handlers)
         return all_handlers
+
+    @classmethod
+    def _select_handlers(cls, event: Event, handlers: List[EventHandler]) -> List[EventHandler]:
+        """Drop the handlers of a selector group whose source entity was not selected for the event, each selector runs at most once"""
+        selected: Dict[str, Collection[UUID]] = {}
+        kept = []
+        for handler in handlers:
+            group = handler.selector_group
+            selector = cls._handler_selectors.get(group) if group is not None else None
+            if selector is None:
+                kept.append(handler)
+                continue
+            if group not in selected:
+                selected[group] = selector(event)
+            if handler.source_entity_uuid in selected[group]:
+                kept.append(handler)
+        return kept
+
+    @classmethod
+    def register_handler_selector(cls, group: str, selector: Callable[[Event], Collection[UUID]]) -> None:
+        """
+        Register the selector of a group of handlers
+        
+        Args:
+            group: The selector_group of the handlers
+            selector: Returns the source entity uuids of the handlers of the group that can react to an event,
+                the others are skipped without being called
+        """
+        cls._handler_selectors[group] = selector
     
     @classmethod
     def add_event_handler(cls, event_handler: EventHandler) -> None:
@@ -475,15 +855,12 @@ class EventQueue:
         Add a handler for events of a specific type and phase
         
         Args:
-            event_type: Type of event to listen for (or None for all types)
-            event_phase: Phase of event to listen for (or None for all phases)
-            source_entity_uuid: UUID of the entity that owns this listener
-            listener: The listener function to call when an event matches
+            event_handler: The handler to register, it is indexed under the dispatch key of each of its triggers
         """
         for trigger in event_handler.trigger_conditions:
-            if trigger.is_simple():
-                cls._event_handlers_by_simple_trigger[trigger.get_simple_trigger()].append(event_handler)
-            cls._event_handlers_by_trigger[trigger].append(event_handler)
+            cls._dispatch_table[trigger.get_dispatch_key()].append(event_handler)
+            cls._handler_counts[(trigger.event_type, trigger.event_phase)] += 1
+            cls._handled_phases[trigger.event_type] |= event_phase_bits[trigger.event_phase]
         cls._event_handlers[event_handler.uuid] = event_handler
         cls._event_handlers_by_source_entity_uuid[event_handler.source_entity_uuid].append(event_handler)
     
@@ -491,10 +868,17 @@ class EventQueue:
     def remove_event_handler(cls, event_handler: EventHandler) -> None:
         """Remove a handler"""
         for trigger in event_handler.trigger_conditions:
-            if trigger.is_simple():
-                cls._event_handlers_by_simple_trigger[trigger.get_simple_trigger()].remove(event_handler)
-            cls._event_handlers_by_trigger[trigger].remove(event_handler)
-            cls._event_handlers.pop(event_handler.uuid)
+            dispatch_key = trigger.get_dispatch_key()
+            handlers = cls._dispatch_table[dispatch_key]
+            handlers.remove(event_handler)
+            if not handlers:
+                del cls._dispatch_table[dispatch_key]
+            count_key = (trigger.event_type, trigger.event_phase)
+            cls._handler_counts[count_key] -= 1
+            if cls._handler_counts[count_key] == 0:
+                del cls._handler_counts[count_key]
+                cls._handled_phases[trigger.event_type] &= ~event_phase_bits[trigger.event_phase]
+        cls._event_handlers.pop(event_handler.uuid, None)
         cls._event_handlers_by_source_entity_uuid[event_handler.source_entity_uuid].remove(event_handler)
 
     @classmethod
@@ -508,19 +892,13 @@ class EventQueue:
     @classmethod
     def get_events_chronological(cls, start_time: Optional[datetime] = None, 
                                end_time: Optional[datetime] = None) -> List[Event]:
-        """Get events in chronological order, optionally within a time range"""
+        """Get events in chronological order, optionally within a time range (both bounds inclusive)"""
         if start_time is None and end_time is None:
             return cls._all_events
-            
-        filtered_events = cls._all_events
         
-        if start_time:
-            filtered_events = [e for e in filtered_events if e.timestamp >= start_time]
-            
-        if end_time:
-            filtered_events = [e for e in filtered_events if e.timestamp <= end_time]
-            
-        return filtered_events
+        start_index = bisect_left(cls._all_timestamps, start_time) if start_time else 0
+        end_index = bisect_right(cls._all_timestamps, end_time) if end_time else len(cls._all_timestamps)
+        return cls._all_events[start_index:end_index]
     
     @classmethod
     def get_latest_events(cls, count: int) -> List[Event]:
@@ -529,14 +907,18 @@ class EventQueue:
     
     @classmethod
     def get_event_history(cls, event_uuid: UUID) -> List[Event]:
-        """Get the complete history of an event by its lineage UUID"""
+        """Get the complete history of an event by its lineage UUID, versioned events are expanded into their versions"""
         event = cls._events_by_uuid.get(event_uuid)
         if not event:
-            return []
+            return cls._get_archived_history(event_uuid)
         
         # Return all events with the same lineage UUID
         lineage_uuid = event.lineage_uuid
-        return sorted(cls._events_by_lineage.get(lineage_uuid, []), key=lambda e: e.timestamp)
+        history = [version for event in cls._events_by_lineage.get(lineage_uuid, [])
+                   for version in (event.get_versions() if event.versioned else [event])]
+        if cls._archive is not None and lineage_uuid in cls._archive:
+            history = cls._get_archived_lineage(lineage_uuid) + history
+        return sorted(history, key=lambda e: e.timestamp)
     
     @classmethod
     def get_events_by_type(cls, event_type: EventType) -> List[Event]:
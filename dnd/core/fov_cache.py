@@ -0,0 +1,146 @@
+""" LRU caches of results computed on the tile map.
+
+Shadowcasting or searching paths from the same origin again is common: every observer recomputes its senses after
+each move and the API builds senses copies along whole paths. The caches key a result on (origin, radius, map
+revision), where the map revision is the TileGrid revision bumped by every tile placement or removal, so a stale
+result is never returned after the map changes.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+Position = Tuple[int, int]
+CacheKey = Tuple[Position, Optional[float], int]
+T = TypeVar("T")
+
+
+class RevisionCache(Generic[T]):
+    """
+    Least recently used cache of results keyed on (origin, radius, map revision).
+
+    Results computed for an older map revision can never be hit again, so they are dropped as soon as a key with a
+    newer revision is requested instead of waiting to be evicted.
+
+    Attributes:
+        maxsize (int): The maximum number of cached results.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to compute the result.
+        evictions (int): Number of results dropped because the cache was full.
+        invalidations (int): Number of results dropped because the map changed.
+
+    Methods:
+        get(origin, radius, revision, compute) -> T:
+            Get the cached result or compute and store it.
+        get_many(origins, radius, revision, compute_many) -> List[T]:
+            Get the cached results of many origins, computing every missing one in a single call.
+        stats() -> Dict[str, int]:
+            The counters and the current size of the cache.
+        clear() -> None:
+            Drop every cached result and reset the counters.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, T]" = OrderedDict()
+        self._revision: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_revision(self, revision: int) -> None:
+        if revision != self._revision:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._revision = revision
+
+    def _store(self, key: CacheKey, result: T) -> None:
+        entries = self._entries
+        entries[key] = result
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, origin: Position, radius: Optional[float], revision: int, compute: Callable[[], T]) -> T:
+        """
+        Get the result from the cache or compute and store it.
+
+        Args:
+            origin (Position): The position the result is computed from.
+            radius (Optional[float]): The maximum distance, None for unlimited.
+            revision (int): The revision of the map the result is computed on.
+            compute (Callable[[], T]): Computes the result on a miss.
+
+        Returns:
+            T: The cached or computed result.
+        """
+        self._check_revision(revision)
+        key = (origin, radius, revision)
+        entries = self._entries
+        result = entries.get(key)
+        if result is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        self._store(key, result)
+        return result
+
+    def get_many(self, origins: Sequence[Position], radius: Optional[float], revision: int,
+                 compute_many: Callable[[List[Position]], List[T]]) -> List[T]:
+        """
+        Get the results of many origins from the cache, computing every missing one in a single call.
+
+        Args:
+            origins (Sequence[Position]): The positions the results are computed from.
+            radius (Optional[float]): The maximum distance, None for unlimited.
+            revision (int): The revision of the map the results are computed on.
+            compute_many (Callable[[List[Position]], List[T]]): Computes the results of the missing origins, in order.
+
+        Returns:
+            List[T]: The cached or computed result of every origin.
+        """
+        self._check_revision(revision)
+        entries = self._entries
+        results: Dict[Position, T] = {}
+        missing: List[Position] = []
+        for origin in dict.fromkeys(origins):
+            key = (origin, radius, revision)
+            result = entries.get(key)
+            if result is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                results[origin] = result
+            else:
+                missing.append(origin)
+        if missing:
+            self.misses += len(missing)
+            for origin, result in zip(missing, compute_many(missing)):
+                self._store((origin, radius, revision), result)
+                results[origin] = result
+        return [results[origin] for origin in origins]
+
+    def stats(self) -> Dict[str, int]:
+        """ the counters and the current size of the cache """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def clear(self) -> None:
+        """ drop every cached result and reset the counters """
+        self._entries.clear()
+        self._revision = None
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+class FOVCache(RevisionCache[FrozenSet[Position]]):
+    """ Least recently used cache of the frozen sets of positions visible from an origin within a radius """
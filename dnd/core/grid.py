@@ -0,0 +1,204 @@
+""" Dense array layer mirroring the tiles of a world.
+
+The TileGrid keeps boolean walkable and transparent arrays and an array of tile ids, all indexed as [y, x], in sync
+with the Tile registry. Pathfinding and field of view read these arrays (or cached python row lists for scalar
+lookups in the inner loops) instead of going through a pydantic Tile per cell.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+class TileGrid:
+    """
+    Dense numpy mirror of the tiles of a world.
+
+    Cells without a tile are neither walkable nor transparent and have tile id -1. The arrays grow automatically
+    when a tile is placed outside of the allocated area, only non-negative positions are supported.
+
+    Attributes:
+        revision (int): Counter incremented on every change, caches built from the grid are keyed on it.
+
+    Computed Attributes:
+        bounds (Tuple[int, int]): The (width, height) of the smallest grid containing every tile.
+        walkable (np.ndarray): Boolean array [height, width] of the walkable cells.
+        transparent (np.ndarray): Boolean array [height, width] of the cells that can be seen through.
+        tile_ids (np.ndarray): Integer array [height, width] with the id of the tile of each cell, -1 if empty.
+        walkable_rows (List[List[bool]]): The walkable array as python lists, for fast scalar lookups.
+        transparent_rows (List[List[bool]]): The transparent array as python lists, for fast scalar lookups.
+
+    Methods:
+        place(position, tile, walkable, transparent) -> None:
+            Place a tile on the grid, replacing the one already at the position.
+        remove(position) -> Optional[Any]:
+            Remove the tile at a position.
+        is_walkable(position) -> bool:
+            Check whether a position is walkable.
+        is_transparent(position) -> bool:
+            Check whether a position can be seen through.
+        get_tile(tile_id) -> Optional[Any]:
+            Get the tile with the given id.
+    """
+
+    def __init__(self, width: int = 0, height: int = 0):
+        self._walkable = np.zeros((height, width), dtype=bool)
+        self._transparent = np.zeros((height, width), dtype=bool)
+        self._tile_ids = np.full((height, width), -1, dtype=np.int32)
+        self._tiles: List[Optional[Any]] = []
+        self._free_ids: List[int] = []
+        self._count = 0
+        self._bounds: Optional[Tuple[int, int]] = (0, 0)
+        self._rows_revision = -1
+        self._walkable_rows: List[List[bool]] = []
+        self._transparent_rows: List[List[bool]] = []
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _ensure_capacity(self, x: int, y: int) -> None:
+        """ grow the arrays geometrically so that (x, y) is inside them """
+        height, width = self._tile_ids.shape
+        if x < width and y < height:
+            return
+        new_width = max(width, x + 1, 2 * width if x >= width else width)
+        new_height = max(height, y + 1, 2 * height if y >= height else height)
+        walkable = np.zeros((new_height, new_width), dtype=bool)
+        transparent = np.zeros((new_height, new_width), dtype=bool)
+        tile_ids = np.full((new_height, new_width), -1, dtype=np.int32)
+        walkable[:height, :width] = self._walkable
+        transparent[:height, :width] = self._transparent
+        tile_ids[:height, :width] = self._tile_ids
+        self._walkable, self._transparent, self._tile_ids = walkable, transparent, tile_ids
+
+    def place(self, position: Tuple[int, int], tile: Any, walkable: bool, transparent: bool) -> None:
+        """
+        Place a tile on the grid, replacing the one already at the position.
+
+        Args:
+            position (Tuple[int, int]): The (x, y) position of the tile.
+            tile (Any): The tile object, returned by get_tile.
+            walkable (bool): Whether the tile can be walked on.
+            transparent (bool): Whether the tile can be seen through.
+
+        Raises:
+            ValueError: If the position has a negative coordinate.
+        """
+        x, y = position
+        if x < 0 or y < 0:
+            raise ValueError(f"Tile positions must be non-negative, got {position}")
+        self._ensure_capacity(x, y)
+        old_id = int(self._tile_ids[y, x])
+        if old_id >= 0:
+            self._release(old_id)
+        if self._free_ids:
+            tile_id = self._free_ids.pop()
+            self._tiles[tile_id] = tile
+        else:
+            tile_id = len(self._tiles)
+            self._tiles.append(tile)
+        self._count += 1
+        self._tile_ids[y, x] = tile_id
+        self._walkable[y, x] = walkable
+        self._transparent[y, x] = transparent
+        if self._bounds is not None:
+            width, height = self._bounds
+            self._bounds = (max(width, x + 1), max(height, y + 1))
+        self.revision += 1
+
+    def remove(self, position: Tuple[int, int]) -> Optional[Any]:
+        """
+        Remove the tile at a position.
+
+        Args:
+            position (Tuple[int, int]): The (x, y) position of the tile.
+
+        Returns:
+            Optional[Any]: The removed tile, None if the position was empty.
+        """
+        x, y = position
+        height, width = self._tile_ids.shape
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        tile_id = int(self._tile_ids[y, x])
+        if tile_id < 0:
+            return None
+        tile = self._tiles[tile_id]
+        self._release(tile_id)
+        self._tile_ids[y, x] = -1
+        self._walkable[y, x] = False
+        self._transparent[y, x] = False
+        bounds = self._bounds
+        if bounds is not None and (x == bounds[0] - 1 or y == bounds[1] - 1):
+            # the removed tile may have been on the border, recompute the bounds on the next read
+            self._bounds = None
+        self.revision += 1
+        return tile
+
+    def _release(self, tile_id: int) -> None:
+        self._tiles[tile_id] = None
+        self._free_ids.append(tile_id)
+        self._count -= 1
+
+    def get_tile(self, tile_id: int) -> Optional[Any]:
+        if tile_id < 0 or tile_id >= len(self._tiles):
+            return None
+        return self._tiles[tile_id]
+
+    @property
+    def bounds(self) -> Tuple[int, int]:
+        """ (width, height) of the smallest grid containing every tile, cached between changes """
+        if self._bounds is None:
+            occupied = self._tile_ids >= 0
+            columns = np.flatnonzero(occupied.any(axis=0))
+            rows = np.flatnonzero(occupied.any(axis=1))
+            self._bounds = (int(columns[-1]) + 1 if len(columns) else 0, int(rows[-1]) + 1 if len(rows) else 0)
+        return self._bounds
+
+    @property
+    def walkable(self) -> np.ndarray:
+        width, height = self.bounds
+        return self._walkable[:height, :width]
+
+    @property
+    def transparent(self) -> np.ndarray:
+        width, height = self.bounds
+        return self._transparent[:height, :width]
+
+    @property
+    def tile_ids(self) -> np.ndarray:
+        width, height = self.bounds
+        return self._tile_ids[:height, :width]
+
+    def _refresh_rows(self) -> None:
+        """ rebuild the python row lists after a change, they are much faster than numpy for scalar lookups """
+        if self._rows_revision != self.revision:
+            self._walkable_rows = self.walkable.tolist()
+            self._transparent_rows = self.transparent.tolist()
+            self._rows_revision = self.revision
+
+    @property
+    def walkable_rows(self) -> List[List[bool]]:
+        self._refresh_rows()
+        return self._walkable_rows
+
+    @property
+    def transparent_rows(self) -> List[List[bool]]:
+        self._refresh_rows()
+        return self._transparent_rows
+
+    def is_walkable(self, position: Tuple[int, int]) -> bool:
+        if self._rows_revision != self.revision:
+            self._refresh_rows()
+        x, y = position
+        rows = self._walkable_rows
+        # the row lists span the grid bounds
+        return 0 <= y < len(rows) and 0 <= x < len(rows[y]) and rows[y][x]
+
+    def is_transparent(self, position: Tuple[int, int]) -> bool:
+        if self._rows_revision != self.revision:
+            self._refresh_rows()
+        x, y = position
+        rows = self._transparent_rows
+        return 0 <= y < len(rows) and 0 <= x < len(rows[y]) and rows[y][x]
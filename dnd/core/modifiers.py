@@ -73,7 +73,7 @@ class NumericalModifier(BaseObject):
         score_normalizer (Optional[Callable[[int], int]]): Optional function to normalize this modifier's value.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Computed Attributes:
         normalized_value (int): The normalized value of this modifier.
@@ -163,7 +163,7 @@ class AdvantageModifier(BaseObject):
         value (AdvantageStatus): The advantage status applied by this modifier. Required.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Computed Attributes:
         numerical_value (int): Numerical representation of the advantage status (1 for ADVANTAGE, -1 for DISADVANTAGE, 0 for NONE).
@@ -237,7 +237,7 @@ class CriticalModifier(BaseObject):
         value (CriticalStatus): The critical status applied by this modifier. Required.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['CriticalModifier']:
@@ -292,7 +292,7 @@ class AutoHitModifier(BaseObject):
         value (AutoHitStatus): The auto-hit status applied by this modifier. Required.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['AutoHitModifier']:
@@ -361,7 +361,7 @@ class ContextualModifier(BaseObject):
             The arguments to be passed to the callable function.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['ContextualModifier']:
@@ -469,7 +469,7 @@ class ContextualAdvantageModifier(ContextualModifier):
             The arguments to be passed to the callable function.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['ContextualAdvantageModifier']:
@@ -530,7 +530,7 @@ class ContextualCriticalModifier(ContextualModifier):
             The arguments to be passed to the callable function.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['ContextualCriticalModifier']:
@@ -591,7 +591,7 @@ class ContextualAutoHitModifier(ContextualModifier):
             The arguments to be passed to the callable function.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['ContextualAutoHitModifier']:
@@ -652,7 +652,7 @@ class ContextualNumericalModifier(ContextualModifier):
             The arguments to be passed to the callable function.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseModifier']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseModifier']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         get(cls, uuid: UUID) -> Optional['ContextualNumericalModifier']:
@@ -0,0 +1,236 @@
+""" Exact outcome distributions of attacks, saving throws, checks and damage.
+
+The distributions follow the rules the engine applies when rolling: determine_attack_outcome for the d20 outcome,
+Dice.roll for the dice (advantage rolls every die twice, a critical hit doubles the number of dice) and
+Health.take_damage for the damage taken (the multiplier of the damage type, truncated, minus the damage reduction,
+at least 0, for every damage separately). Instead of sampling, the probability mass functions are built by
+convolving the distributions of the single dice, which takes microseconds.
+
+Damage probability mass functions are numpy arrays indexed by the damage value, pmf[k] being the probability of k.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from dnd.core.dice import AttackOutcome
+from dnd.core.dice_batch import advantage_sign
+from dnd.core.events import Damage, WeaponSlot
+from dnd.core.values import AdvantageStatus, AutoHitStatus, CriticalStatus, ModifiableValue
+
+FAILED_OUTCOMES = (AttackOutcome.MISS, AttackOutcome.CRIT_MISS)
+
+
+def die_pmf(value: int, advantage: int = 0) -> np.ndarray:
+    """
+    Distribution of a single die, indexed by the face.
+
+    Args:
+        value: The number of sides of the die
+        advantage: 1 to keep the higher of two rolls, -1 the lower, 0 for a single roll
+    """
+    faces = np.arange(1, value + 1)
+    pmf = np.zeros(value + 1)
+    if advantage > 0:
+        pmf[1:] = (2 * faces - 1) / value ** 2
+    elif advantage < 0:
+        pmf[1:] = (2 * (value - faces) + 1) / value ** 2
+    else:
+        pmf[1:] = 1 / value
+    return pmf
+
+
+@lru_cache(maxsize=1024)
+def dice_pmf(count: int, value: int, advantage: int = 0) -> np.ndarray:
+    """ distribution of the sum of count dice, indexed by the sum, the cached arrays are read only """
+    single = die_pmf(value, advantage)
+    pmf = np.ones(1)
+    # square and multiply to convolve count copies of the die
+    power = single
+    while count:
+        if count & 1:
+            pmf = np.convolve(pmf, power)
+        count >>= 1
+        if count:
+            power = np.convolve(power, power)
+    pmf.setflags(write=False)
+    return pmf
+
+
+def _score(value: Union[int, ModifiableValue]) -> int:
+    return value.normalized_score if isinstance(value, ModifiableValue) else value
+
+
+def d20_outcome_probabilities(
+    bonus: int,
+    target: int,
+    advantage: AdvantageStatus = AdvantageStatus.NONE,
+    critical: CriticalStatus = CriticalStatus.NONE,
+    auto_hit: AutoHitStatus = AutoHitStatus.NONE
+) -> Dict[AttackOutcome, float]:
+    """
+    Probability of every outcome of determine_attack_outcome for a d20 roll against an armor class or a DC.
+
+    Args:
+        bonus: The bonus added to the d20
+        target: The armor class or DC the total must meet
+        advantage: The advantage status of the roll
+        critical: The critical status of the roll
+        auto_hit: The auto hit status of the roll
+
+    Returns:
+        The probability of HIT, CRIT, MISS and CRIT_MISS
+    """
+    return dict(_d20_outcome_table(bonus, target, advantage, critical, auto_hit))
+
+
+@lru_cache(maxsize=4096)
+def _d20_outcome_table(
+    bonus: int,
+    target: int,
+    advantage: AdvantageStatus,
+    critical: CriticalStatus,
+    auto_hit: AutoHitStatus
+) -> Tuple[Tuple[AttackOutcome, float], ...]:
+    probabilities = {outcome: 0.0 for outcome in AttackOutcome}
+    natural = die_pmf(20, advantage_sign(advantage))
+    for face in range(1, 21):
+        p = float(natural[face])
+        if auto_hit == AutoHitStatus.AUTOMISS:
+            outcome = AttackOutcome.MISS
+        elif auto_hit == AutoHitStatus.AUTOHIT or (face != 1 and face + bonus >= target):
+            outcome = AttackOutcome.CRIT if critical == CriticalStatus.AUTOCRIT or face == 20 else AttackOutcome.HIT
+        elif face == 1:
+            outcome = AttackOutcome.CRIT_MISS
+        else:
+            outcome = AttackOutcome.MISS
+        probabilities[outcome] += p
+    return tuple(probabilities.items())
+
+
+def outcome_probabilities(roll_bonus: ModifiableValue, target: Union[int, ModifiableValue]) -> Dict[AttackOutcome, float]:
+    """ d20_outcome_probabilities with the score and statuses of a resolved bonus, e.g. an attack bonus against an armor class """
+    return d20_outcome_probabilities(roll_bonus.normalized_score, _score(target), roll_bonus.advantage,
+                                     roll_bonus.critical, roll_bonus.auto_hit)
+
+
+def success_probability(roll_bonus: ModifiableValue, dc: Union[int, ModifiableValue]) -> float:
+    """ probability that a saving throw or a check with a resolved bonus succeeds against a DC """
+    probabilities = outcome_probabilities(roll_bonus, dc)
+    return 1.0 - sum(probabilities[outcome] for outcome in FAILED_OUTCOMES)
+
+
+def _apply_damage_rules(pmf: np.ndarray, offset: int, multiplier: float, damage_reduction: int) -> np.ndarray:
+    """ map a distribution of rolled totals, pmf[i] being the probability of i + offset, to the damage taken """
+    totals = np.arange(len(pmf)) + offset
+    taken = np.maximum(0, np.trunc(totals * multiplier).astype(np.int64) - damage_reduction)
+    return np.bincount(taken, weights=pmf, minlength=1)
+
+
+def damage_pmf(damages: Sequence[Damage], crit: bool = False, health: Optional[Any] = None) -> np.ndarray:
+    """
+    Distribution of the damage taken from a list of damages.
+
+    Args:
+        damages: The damages of the attack, e.g. from Entity.get_damages
+        crit: Whether the dice are doubled by a critical hit
+        health: The Health block of the target, its damage multipliers and damage reduction are applied to every
+            damage separately, like Health.take_damage does; None for the rolled totals without the target rules
+    """
+    total = np.ones(1)
+    for damage in damages:
+        bonus = damage.damage_bonus
+        advantage = advantage_sign(bonus.advantage) if bonus is not None else 0
+        count = damage.dice_numbers * 2 if crit else damage.dice_numbers
+        pmf = dice_pmf(count, damage.damage_dice, advantage)
+        offset = bonus.normalized_score if bonus is not None else 0
+        if health is not None:
+            pmf = _apply_damage_rules(pmf, offset, health.damage_multiplier(damage.damage_type), health.damage_reduction.score)
+        else:
+            pmf = _apply_damage_rules(pmf, offset, 1, 0)
+        total = np.convolve(total, pmf)
+    return total
+
+
+def expected_value(pmf: np.ndarray) -> float:
+    return float(np.dot(np.arange(len(pmf)), pmf))
+
+
+class AttackForecast(BaseModel):
+    """
+    Exact distribution of the result of an attack.
+
+    Attributes:
+        outcomes (Dict[AttackOutcome, float]): The probability of every attack outcome.
+        hit_damage (List[float]): The distribution of the damage taken on a hit.
+        crit_damage (List[float]): The distribution of the damage taken on a critical hit.
+        damage (List[float]): The distribution of the damage taken by the attack, misses count as 0.
+        expected_damage (float): The mean of the damage distribution.
+    """
+    outcomes: Dict[AttackOutcome, float] = Field(description="The probability of every attack outcome")
+    hit_damage: List[float] = Field(description="The distribution of the damage taken on a hit")
+    crit_damage: List[float] = Field(description="The distribution of the damage taken on a critical hit")
+    damage: List[float] = Field(description="The distribution of the damage taken by the attack, misses count as 0")
+    expected_damage: float = Field(description="The mean of the damage distribution")
+
+    @property
+    def hit_probability(self) -> float:
+        """ probability of a hit or a critical hit """
+        return self.outcomes[AttackOutcome.HIT] + self.outcomes[AttackOutcome.CRIT]
+
+
+def forecast_from_outcomes(outcomes: Dict[AttackOutcome, float], damages: Sequence[Damage], health: Optional[Any] = None) -> AttackForecast:
+    """ combine the outcome probabilities of an attack with the damage distributions of a hit and of a critical hit """
+    hit = damage_pmf(damages, crit=False, health=health)
+    crit = damage_pmf(damages, crit=True, health=health)
+    total = np.zeros(max(len(hit), len(crit)))
+    total[:len(hit)] += outcomes[AttackOutcome.HIT] * hit
+    total[:len(crit)] += outcomes[AttackOutcome.CRIT] * crit
+    total[0] += outcomes[AttackOutcome.MISS] + outcomes[AttackOutcome.CRIT_MISS]
+    return AttackForecast(outcomes=outcomes, hit_damage=hit.tolist(), crit_damage=crit.tolist(), damage=total.tolist(),
+                          expected_damage=expected_value(total))
+
+
+def attack_forecast(
+    attack_bonus: ModifiableValue,
+    ac: Union[int, ModifiableValue],
+    damages: Sequence[Damage],
+    health: Optional[Any] = None
+) -> AttackForecast:
+    """
+    Forecast an attack from resolved values.
+
+    Args:
+        attack_bonus: The attack bonus after set_from_target with the armor class
+        ac: The armor class of the target
+        damages: The damages of the attack
+        health: The Health block of the target, see damage_pmf
+    """
+    return forecast_from_outcomes(outcome_probabilities(attack_bonus, ac), damages, health)
+
+
+def forecast_entity_attack(source_entity: Any, target_entity: Any, weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND) -> AttackForecast:
+    """
+    Forecast an attack between two entities without rolling, resolving the values the way Attack does.
+
+    The entities are not retargeted: the bonuses are resolved on forks of the values they read, which target the
+    other entity (see Entity.attack_bonus), so the entities and their values are left unchanged.
+
+    Args:
+        source_entity: The attacking Entity
+        target_entity: The attacked Entity
+        weapon_slot: The weapon slot of the attack
+    """
+    attack_bonus = source_entity.attack_bonus(weapon_slot=weapon_slot, target_entity_uuid=target_entity.uuid)
+    ac = target_entity.ac_bonus(source_entity.uuid)
+    try:
+        ac.set_from_target(attack_bonus)
+        attack_bonus.set_from_target(ac)
+        outcomes = outcome_probabilities(attack_bonus, ac)
+    finally:
+        ac.reset_from_target()
+        attack_bonus.reset_from_target()
+    damages = source_entity.get_damages(weapon_slot, target_entity.uuid)
+    return forecast_from_outcomes(outcomes, damages, target_entity.health)
@@ -0,0 +1,143 @@
+""" Seeded random streams of a world.
+
+Every world owns an RNGService created from the seed of the world. The dice draw from an independent stream per
+(entity, roll type), derived from the seed with numpy SeedSequence spawn keys, so a stream only depends on the seed
+and on its key: creating entities or rolling in another order does not change the other streams, and two worlds
+with the same seed roll the same dice. A RollRecord stored in every DiceRoll holds the seed, the stream key and the
+state of the stream before the roll, which is enough to replay the roll bit-exactly.
+"""
+
+import secrets
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from dnd.core.dice_batch import roll_expression
+from dnd.core.world import World, WorldScopedMeta, world_scoped
+
+StreamKey = Tuple[int, ...]
+
+# stream key words of the roll types, 0 is used for rolls without a type
+ROLL_TYPE_WORDS = {"Damage": 1, "Attack": 2, "Save": 3, "Check": 4}
+
+
+def stream_key(source_entity_uuid: Optional[UUID] = None, roll_type: Optional[str] = None) -> StreamKey:
+    """ the SeedSequence spawn key of the stream of an entity and a roll type, four 32 bit words of the uuid then the roll type """
+    uuid_int = source_entity_uuid.int if source_entity_uuid is not None else 0
+    words = tuple((uuid_int >> shift) & 0xFFFFFFFF for shift in (96, 64, 32, 0))
+    return words + (ROLL_TYPE_WORDS.get(getattr(roll_type, "value", roll_type), 0),)
+
+
+def stream_generator(seed: int, key: StreamKey) -> np.random.Generator:
+    """ a fresh generator at the start of the stream of a key """
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(entropy=seed, spawn_key=key)))
+
+
+class RollRecord(BaseModel):
+    """
+    Everything needed to replay a roll.
+
+    Attributes:
+        seed (int): The seed of the world the roll was made in.
+        stream (List[int]): The spawn key of the stream the roll was drawn from.
+        state (int): The PCG64 state of the stream before the roll.
+        count (int): The number of dice, before critical doubling.
+        value (int): The number of sides of the dice.
+        advantage (int): 1 for advantage, -1 for disadvantage, 0 for a normal roll.
+        crit (bool): Whether the number of dice was doubled by a critical hit.
+    """
+    seed: int = Field(description="The seed of the world the roll was made in")
+    stream: List[int] = Field(description="The spawn key of the stream the roll was drawn from")
+    state: int = Field(description="The PCG64 state of the stream before the roll")
+    count: int = Field(description="The number of dice, before critical doubling")
+    value: int = Field(description="The number of sides of the dice")
+    advantage: int = Field(default=0, description="1 for advantage, -1 for disadvantage, 0 for a normal roll")
+    crit: bool = Field(default=False, description="Whether the number of dice was doubled by a critical hit")
+
+    def replay(self) -> List[int]:
+        """ roll the same dice again from the recorded state, giving the same kept values """
+        generator = stream_generator(self.seed, tuple(self.stream))
+        bit_state = generator.bit_generator.state
+        bit_state["state"]["state"] = self.state
+        bit_state["has_uint32"] = 0
+        bit_state["uinteger"] = 0
+        generator.bit_generator.state = bit_state
+        return roll_expression(self.count, self.value, self.advantage, self.crit, generator)
+
+
+class RNGService(metaclass=WorldScopedMeta):
+    """
+    Random streams of a world derived from a single seed.
+
+    Attributes:
+        seed (int): The seed of the streams, drawn from the OS entropy when the world has no seed.
+
+    Class Attributes:
+        _current (RNGService): The service of the current world, created from World.seed the first time it is read.
+
+    Methods:
+        current(cls) -> RNGService:
+            The service of the current world.
+        install(cls, service) -> None:
+            Replace the service of the current world, e.g. with a service with another seed.
+        generator(source_entity_uuid, roll_type) -> np.random.Generator:
+            The stream of an entity and a roll type.
+        roll(count, value, advantage, crit, source_entity_uuid, roll_type) -> Tuple[List[int], RollRecord]:
+            Roll a dice expression from a stream and record how to replay it.
+    """
+
+    _current: 'RNGService' = world_scoped(lambda: RNGService(World.current().seed))
+
+    def __init__(self, seed: Optional[int] = None):
+        # random seeds fit in 53 bits so JSON clients reading numbers as doubles keep them exact
+        self.seed = seed if seed is not None else secrets.randbits(53)
+        self._streams: Dict[StreamKey, np.random.Generator] = {}
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def __repr__(self) -> str:
+        return f"RNGService(seed={self.seed}, streams={len(self._streams)})"
+
+    @classmethod
+    def current(cls) -> 'RNGService':
+        return cls._current
+
+    @classmethod
+    def install(cls, service: 'RNGService') -> None:
+        cls._current = service
+
+    def stream(self, key: StreamKey) -> np.random.Generator:
+        generator = self._streams.get(key)
+        if generator is None:
+            generator = self._streams[key] = stream_generator(self.seed, key)
+        return generator
+
+    def generator(self, source_entity_uuid: Optional[UUID] = None, roll_type: Optional[Any] = None) -> np.random.Generator:
+        return self.stream(stream_key(source_entity_uuid, roll_type))
+
+    def roll(
+        self,
+        count: int,
+        value: int,
+        advantage: int = 0,
+        crit: bool = False,
+        source_entity_uuid: Optional[UUID] = None,
+        roll_type: Optional[Any] = None
+    ) -> Tuple[List[int], RollRecord]:
+        """
+        Roll a dice expression from the stream of an entity and a roll type.
+
+        Returns:
+            The kept value of every die and the RollRecord replaying it
+        """
+        key = stream_key(source_entity_uuid, roll_type)
+        generator = self.stream(key)
+        record = RollRecord(seed=self.seed, stream=list(key), state=generator.bit_generator.state["state"]["state"],
+                            count=count, value=value, advantage=advantage, crit=crit)
+        return roll_expression(count, value, advantage, crit, generator), record
+
+    def clear(self) -> None:
+        self._streams.clear()
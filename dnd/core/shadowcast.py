@@ -1,6 +1,18 @@
-import math
-from fractions import Fraction
-from typing import Tuple, Callable, Optional, Iterator, Union
+from typing import Tuple, Callable, FrozenSet, Optional, List, Sequence
+
+import numpy as np
+
+# A row being scanned is (depth, start numerator, start denominator, end numerator, end denominator), slopes are
+# exact fractions kept as pairs of ints with a positive denominator.
+ScanRow = Tuple[int, int, int, int, int]
+
+# (row, col) in quadrant coordinates to (x, y) offsets from the origin: x = ox + a * row + b * col, y = oy + c * row + d * col
+QUADRANTS: List[Tuple[int, int, int, int]] = [
+    (0, 1, -1, 0),  # north
+    (1, 0, 0, 1),   # east
+    (0, 1, 1, 0),   # south
+    (-1, 0, 0, 1),  # west
+]
 
 def compute_fov(
     origin: Tuple[int, int],
@@ -8,105 +20,157 @@ def compute_fov(
     mark_visible: Callable[[int, int], None],
     max_distance: Optional[float] = None
 ) -> None:
+    """
+    Symmetric shadowcasting from origin, calling mark_visible for every visible position (possibly more than once).
+
+    Slopes are exact integer fractions instead of fractions.Fraction, a position is within max_distance when its
+    squared euclidean distance from the origin is at most max_distance squared.
+    """
     ox, oy = origin
     mark_visible(ox, oy)
-
-    for i in range(4):
-        quadrant = Quadrant(i, origin)
-
-        def reveal(tile: Tuple[int, int]) -> None:
-            x, y = quadrant.transform(tile)
-            if max_distance is None or math.sqrt((x-ox)**2 + (y-oy)**2) <= max_distance:
-                mark_visible(x, y)
-
-        def is_wall(tile: Optional[Tuple[int, int]]) -> bool:
-            if tile is None:
-                return False
-            x, y = quadrant.transform(tile)
-            return is_blocking(x, y)
-
-        def is_floor(tile: Optional[Tuple[int, int]]) -> bool:
-            if tile is None:
-                return False
-            x, y = quadrant.transform(tile)
-            return not is_blocking(x, y)
-
-        first_row = Row(1, Fraction(-1), Fraction(1))
-        scan_iterative(first_row, reveal, is_wall, is_floor)
-
-class Quadrant:
-    north = 0
-    east = 1
-    south = 2
-    west = 3
-
-    def __init__(self, cardinal: int, origin: Tuple[int, int]):
-        if cardinal not in range(4):
-            raise ValueError("Cardinal must be 0, 1, 2, or 3")
-        self.cardinal: int = cardinal
-        self.ox, self.oy = origin
-
-    def transform(self, tile: Tuple[int, int]) -> Tuple[int, int]:
-        row, col = tile
-        if self.cardinal == self.north:
-            return (self.ox + col, self.oy - row)
-        elif self.cardinal == self.south:
-            return (self.ox + col, self.oy + row)
-        elif self.cardinal == self.east:
-            return (self.ox + row, self.oy + col)
-        else:
-            assert self.cardinal == self.west
-            return (self.ox - row, self.oy + col)
-
-class Row:
-    def __init__(self, depth: int, start_slope: Fraction, end_slope: Fraction):
-        self.depth = depth
-        self.start_slope = start_slope
-        self.end_slope = end_slope
-
-    def tiles(self) -> Iterator[Tuple[int, int]]:
-        min_col = round_ties_up(self.depth * self.start_slope)
-        max_col = round_ties_down(self.depth * self.end_slope)
-        for col in range(min_col, max_col + 1):
-            yield (self.depth, col)
-
-    def next(self) -> 'Row':
-        return Row(self.depth + 1, self.start_slope, self.end_slope)
-
-def slope(tile: Tuple[int, int]) -> Fraction:
-    row_depth, col = tile
-    return Fraction(2 * col - 1, 2 * row_depth)
-
-def is_symmetric(row: Row, tile: Tuple[int, int]) -> bool:
-    row_depth, col = tile
-    return (col >= row.depth * row.start_slope
-            and col <= row.depth * row.end_slope)
-
-def round_ties_up(n: Fraction) -> int:
-    return math.floor(float(n) + 0.5)
-
-def round_ties_down(n: Fraction) -> int:
-    return math.ceil(float(n) - 0.5)
-
-def scan_iterative(
-    row: Row,
-    reveal: Callable[[Tuple[int, int]], None],
-    is_wall: Callable[[Optional[Tuple[int, int]]], bool],
-    is_floor: Callable[[Optional[Tuple[int, int]]], bool]
-) -> None:
-    rows = [row]
-    while rows:
-        row = rows.pop()
-        prev_tile: Optional[Tuple[int, int]] = None
-        for tile in row.tiles():
-            if is_wall(tile) or is_symmetric(row, tile):
-                reveal(tile)
-            if is_wall(prev_tile) and is_floor(tile):
-                row.start_slope = slope(tile)
-            if is_floor(prev_tile) and is_wall(tile):
-                next_row = row.next()
-                next_row.end_slope = slope(tile)
-                rows.append(next_row)
-            prev_tile = tile
-        if is_floor(prev_tile):
-            rows.append(row.next())
+    max_squared = None if max_distance is None else max_distance * max_distance
+
+    for a, b, c, d in QUADRANTS:
+        rows: List[ScanRow] = [(1, -1, 1, 1, 1)]
+        while rows:
+            depth, start_num, start_den, end_num, end_den = rows.pop()
+            # round_ties_up(depth * start_slope) and round_ties_down(depth * end_slope)
+            min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+            max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+            prev_wall: Optional[bool] = None
+            for col in range(min_col, max_col + 1):
+                x = ox + a * depth + b * col
+                y = oy + c * depth + d * col
+                wall = is_blocking(x, y)
+                # walls are always revealed, floors only if they are symmetric: depth * start <= col <= depth * end
+                if wall or (col * start_den >= depth * start_num and col * end_den <= depth * end_num):
+                    if max_squared is None or (x - ox) ** 2 + (y - oy) ** 2 <= max_squared:
+                        mark_visible(x, y)
+                if prev_wall is True and not wall:
+                    start_num, start_den = 2 * col - 1, 2 * depth
+                elif prev_wall is False and wall:
+                    rows.append((depth + 1, start_num, start_den, 2 * col - 1, 2 * depth))
+                prev_wall = wall
+            if prev_wall is False:
+                rows.append((depth + 1, start_num, start_den, end_num, end_den))
+
+
+def scan_fov_batch(
+    transparent: np.ndarray,
+    origins: Sequence[Tuple[int, int]],
+    max_distance: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Symmetric shadowcasting from many origins at once over a boolean transparency array indexed as [y, x].
+
+    Reports the same visible positions as compute_fov with the cells outside the array blocking. The rows of every
+    origin and quadrant at the same depth are scanned together: their cells are laid out in one flat array, the
+    walls are looked up with a single fancy index and the runs of floor cells become the rows of the next depth,
+    so the work is a loop over the depths instead of a loop over every row of every origin.
+
+    Returns:
+        The origin index, x and y of every visible position, possibly more than once and outside of the array
+    """
+    height, width = transparent.shape
+    count = len(origins)
+    if count == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    origin_x, origin_y = (np.asarray(axis, dtype=np.int64) for axis in zip(*origins))
+    found_origins, found_x, found_y = [np.arange(count, dtype=np.int64)], [origin_x], [origin_y]
+    # past this depth every row is outside of the array, where every cell blocks
+    max_depth = int(max(np.abs(origin_x).max(), np.abs(origin_x - width).max(), np.abs(origin_y).max(), np.abs(origin_y - height).max())) + 1
+    max_squared = None
+    if max_distance is not None:
+        max_squared = max_distance * max_distance
+        max_depth = min(max_depth, int(max_distance))
+    quadrants = np.array(QUADRANTS, dtype=np.int64)
+
+    # one row per origin and quadrant, the start and end slopes are integer fractions
+    row_origin = np.repeat(np.arange(count, dtype=np.int64), len(QUADRANTS))
+    row_quadrant = np.tile(np.arange(len(QUADRANTS), dtype=np.int64), count)
+    start_num = np.full(len(row_origin), -1, dtype=np.int64)
+    start_den = np.ones(len(row_origin), dtype=np.int64)
+    end_num = np.ones(len(row_origin), dtype=np.int64)
+    end_den = np.ones(len(row_origin), dtype=np.int64)
+    depth = 1
+    while len(row_origin) and depth <= max_depth:
+        # round_ties_up(depth * start_slope) and round_ties_down(depth * end_slope)
+        min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+        max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+        lengths = np.maximum(max_col - min_col + 1, 0)
+        total = int(lengths.sum())
+        if total == 0:
+            break
+        cell_row = np.repeat(np.arange(len(lengths)), lengths)
+        first_cell = np.cumsum(lengths) - lengths
+        col = min_col[cell_row] + np.arange(total) - first_cell[cell_row]
+        a, b, c, d = quadrants[row_quadrant[cell_row]].T
+        cell_origin = row_origin[cell_row]
+        dx = a * depth + b * col
+        dy = c * depth + d * col
+        x = origin_x[cell_origin] + dx
+        y = origin_y[cell_origin] + dy
+        inside = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+        wall = ~inside
+        wall[inside] = ~transparent[y[inside], x[inside]]
+
+        # walls are always revealed, floors only if they are symmetric: depth * start <= col <= depth * end
+        mark = wall | ((col * start_den[cell_row] >= depth * start_num[cell_row]) & (col * end_den[cell_row] <= depth * end_num[cell_row]))
+        if max_squared is not None:
+            mark &= dx * dx + dy * dy <= max_squared
+        found_origins.append(cell_origin[mark])
+        found_x.append(x[mark])
+        found_y.append(y[mark])
+
+        # every run of floor cells continues as a row of the next depth, bounded by the slopes through the corners
+        # of the walls around the run or by the slopes of its row
+        is_first = np.zeros(total, dtype=bool)
+        is_first[first_cell[lengths > 0]] = True
+        is_last = np.zeros(total, dtype=bool)
+        is_last[(first_cell + lengths - 1)[lengths > 0]] = True
+        floor = ~wall
+        run_starts = np.flatnonzero(floor & (is_first | np.concatenate(([True], wall[:-1]))))
+        run_ends = np.flatnonzero(floor & (is_last | np.concatenate((wall[1:], [True]))))
+        parent = cell_row[run_starts]
+        starts_row = is_first[run_starts]
+        ends_row = is_last[run_ends]
+        start_num = np.where(starts_row, start_num[parent], 2 * col[run_starts] - 1)
+        start_den = np.where(starts_row, start_den[parent], 2 * depth)
+        end_num = np.where(ends_row, end_num[parent], 2 * col[run_ends] + 1)
+        end_den = np.where(ends_row, end_den[parent], 2 * depth)
+        row_origin = row_origin[parent]
+        row_quadrant = row_quadrant[parent]
+        depth += 1
+    return np.concatenate(found_origins), np.concatenate(found_x), np.concatenate(found_y)
+
+
+def compute_fov_batch(
+    transparent: np.ndarray,
+    origins: Sequence[Tuple[int, int]],
+    max_distance: Optional[float] = None
+) -> np.ndarray:
+    """
+    Boolean visibility tensor [len(origins), height, width] of the positions of the array visible from each origin.
+    """
+    height, width = transparent.shape
+    visible = np.zeros((len(origins), height, width), dtype=bool)
+    found_origins, x, y = scan_fov_batch(transparent, origins, max_distance)
+    inside = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+    visible[found_origins[inside], y[inside], x[inside]] = True
+    return visible
+
+
+def compute_fov_sets(
+    transparent: np.ndarray,
+    origins: Sequence[Tuple[int, int]],
+    max_distance: Optional[float] = None
+) -> List[FrozenSet[Tuple[int, int]]]:
+    """
+    The frozen sets of positions visible from each origin, including the walls just outside of the array like compute_fov.
+    """
+    found_origins, x, y = scan_fov_batch(transparent, origins, max_distance)
+    order = np.argsort(found_origins, kind="stable")
+    bounds = np.searchsorted(found_origins[order], np.arange(len(origins) + 1)).tolist()
+    xs, ys = x[order].tolist(), y[order].tolist()
+    return [frozenset(zip(xs[start:end], ys[start:end])) for start, end in zip(bounds[:-1], bounds[1:])]
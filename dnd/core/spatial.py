@@ -0,0 +1,165 @@
+""" Spatial index of the objects placed on the grid.
+
+Objects are hashed into square buckets of the grid, so moving an object is O(1) and rectangle or radius queries only
+look at the buckets overlapping the queried area instead of scanning every object.
+"""
+
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+Position = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Uniform grid of buckets indexing objects by position.
+
+    Attributes:
+        bucket_size (int): The side of the square buckets in grid cells.
+        revision (int): Counter incremented on every change, occupancy based caches are keyed on it.
+
+    Methods:
+        add(key, obj, position) -> None:
+            Index an object at a position, replacing the previous entry with the same key.
+        move(key, position) -> None:
+            Move an indexed object to a new position.
+        remove(key) -> Optional[Any]:
+            Remove an object from the index.
+        get_position(key) -> Optional[Position]:
+            The position of an indexed object.
+        at(position) -> List[Any]:
+            The objects at a position.
+        query_rect(min_corner, max_corner) -> List[Any]:
+            The objects inside a rectangle, corners included.
+        query_radius(center, radius) -> List[Any]:
+            The objects whose euclidean distance from center is at most radius.
+        occupancy(width, height) -> np.ndarray:
+            Boolean array [height, width] of the occupied cells.
+    """
+
+    def __init__(self, bucket_size: int = 8):
+        self.bucket_size = bucket_size
+        self._entries: Dict[Hashable, Tuple[Position, Any]] = {}
+        self._by_position: Dict[Position, Dict[Hashable, Any]] = {}
+        self._buckets: Dict[Tuple[int, int], Dict[Hashable, Any]] = {}
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _bucket(self, position: Position) -> Tuple[int, int]:
+        return (position[0] // self.bucket_size, position[1] // self.bucket_size)
+
+    def _insert(self, key: Hashable, obj: Any, position: Position) -> None:
+        self._entries[key] = (position, obj)
+        self._by_position.setdefault(position, {})[key] = obj
+        self._buckets.setdefault(self._bucket(position), {})[key] = obj
+
+    def _discard(self, key: Hashable, position: Position) -> None:
+        at_position = self._by_position[position]
+        del at_position[key]
+        if not at_position:
+            del self._by_position[position]
+        bucket_key = self._bucket(position)
+        bucket = self._buckets[bucket_key]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[bucket_key]
+
+    def add(self, key: Hashable, obj: Any, position: Position) -> None:
+        if key in self._entries:
+            self._discard(key, self._entries[key][0])
+        self._insert(key, obj, position)
+        self.revision += 1
+
+    def move(self, key: Hashable, position: Position) -> None:
+        """
+        Move an indexed object to a new position.
+
+        Raises:
+            KeyError: If the key is not indexed.
+        """
+        old_position, obj = self._entries[key]
+        if old_position == position:
+            return
+        self._discard(key, old_position)
+        self._insert(key, obj, position)
+        self.revision += 1
+
+    def remove(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._discard(key, entry[0])
+        self.revision += 1
+        return entry[1]
+
+    def get_position(self, key: Hashable) -> Optional[Position]:
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def at(self, position: Position) -> List[Any]:
+        at_position = self._by_position.get(position)
+        return list(at_position.values()) if at_position else []
+
+    def _buckets_between(self, min_corner: Position, max_corner: Position) -> List[Dict[Hashable, Any]]:
+        """ the non empty buckets overlapping a rectangle """
+        min_bx, min_by = self._bucket(min_corner)
+        max_bx, max_by = self._bucket(max_corner)
+        if (max_bx - min_bx + 1) * (max_by - min_by + 1) > len(self._buckets):
+            # the rectangle spans more buckets than there are non empty ones
+            return [bucket for (bx, by), bucket in self._buckets.items() if min_bx <= bx <= max_bx and min_by <= by <= max_by]
+        buckets = self._buckets
+        return [buckets[(bx, by)] for bx in range(min_bx, max_bx + 1) for by in range(min_by, max_by + 1) if (bx, by) in buckets]
+
+    def query_rect(self, min_corner: Position, max_corner: Position) -> List[Any]:
+        """
+        The objects inside a rectangle.
+
+        Args:
+            min_corner (Position): The (x, y) corner with the lowest coordinates, included.
+            max_corner (Position): The (x, y) corner with the highest coordinates, included.
+        """
+        (min_x, min_y), (max_x, max_y) = min_corner, max_corner
+        entries = self._entries
+        found = []
+        for bucket in self._buckets_between(min_corner, max_corner):
+            for key, obj in bucket.items():
+                x, y = entries[key][0]
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    found.append(obj)
+        return found
+
+    def query_radius(self, center: Position, radius: float) -> List[Any]:
+        """ The objects whose euclidean distance from center is at most radius """
+        cx, cy = center
+        reach = math.floor(radius)
+        max_squared = radius * radius
+        entries = self._entries
+        found = []
+        for bucket in self._buckets_between((cx - reach, cy - reach), (cx + reach, cy + reach)):
+            for key, obj in bucket.items():
+                x, y = entries[key][0]
+                if (x - cx) ** 2 + (y - cy) ** 2 <= max_squared:
+                    found.append(obj)
+        return found
+
+    def occupancy(self, width: int, height: int) -> np.ndarray:
+        """ Boolean array [height, width] of the cells holding at least one object """
+        occupied = np.zeros((height, width), dtype=bool)
+        positions = [position for position in self._by_position if 0 <= position[0] < width and 0 <= position[1] < height]
+        if positions:
+            xs, ys = zip(*positions)
+            occupied[list(ys), list(xs)] = True
+        return occupied
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_position.clear()
+        self._buckets.clear()
+        self.revision += 1
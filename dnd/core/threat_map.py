@@ -0,0 +1,99 @@
+""" Map of the positions threatened by each creature.
+
+Every creature that can make opportunity attacks threatens the positions around it within the reach of its weapon.
+The map keeps, for every position, the set of creatures threatening it, so the creatures reacting to a movement are
+found by walking the path once instead of asking every creature for its threatened positions.
+"""
+
+from typing import Dict, FrozenSet, Hashable, Iterable, Optional, Sequence, Set, Tuple
+
+Position = Tuple[int, int]
+
+_EMPTY: FrozenSet = frozenset()
+
+
+class ThreatMap:
+    """
+    Per position index of the threatening creatures.
+
+    Attributes:
+        revision (int): Counter incremented on every change.
+
+    Methods:
+        set_threatened_positions(key, positions) -> None:
+            Replace the positions threatened by a creature.
+        remove(key) -> None:
+            Forget a creature.
+        get_threatened_positions(key) -> FrozenSet[Position]:
+            The positions threatened by a creature.
+        threatening(position) -> FrozenSet[Hashable]:
+            The creatures threatening a position.
+        leaving_threat(start, path) -> Set[Hashable]:
+            The creatures threatening start that the path leaves the threatened area of.
+    """
+
+    def __init__(self):
+        self._by_position: Dict[Position, Set[Hashable]] = {}
+        self._by_key: Dict[Hashable, FrozenSet[Position]] = {}
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._by_key
+
+    def _discard(self, key: Hashable) -> None:
+        for position in self._by_key.pop(key, _EMPTY):
+            threatening = self._by_position[position]
+            threatening.discard(key)
+            if not threatening:
+                del self._by_position[position]
+
+    def set_threatened_positions(self, key: Hashable, positions: Iterable[Position]) -> None:
+        positions = frozenset(positions)
+        if self._by_key.get(key) == positions:
+            return
+        self._discard(key)
+        if positions:
+            self._by_key[key] = positions
+            for position in positions:
+                self._by_position.setdefault(position, set()).add(key)
+        self.revision += 1
+
+    def remove(self, key: Hashable) -> None:
+        if key in self._by_key:
+            self._discard(key)
+            self.revision += 1
+
+    def get_threatened_positions(self, key: Hashable) -> FrozenSet[Position]:
+        return self._by_key.get(key, _EMPTY)
+
+    def threatening(self, position: Position) -> FrozenSet[Hashable]:
+        return frozenset(self._by_position.get(position, _EMPTY))
+
+    def leaving_threat(self, start: Position, path: Optional[Sequence[Position]]) -> Set[Hashable]:
+        """
+        The creatures threatening start for which some position of the path is not threatened.
+
+        The path is walked once and the walk stops as soon as every creature threatening start has been left.
+        """
+        candidates = self._by_position.get(start)
+        if not candidates or not path:
+            return set()
+        remaining = set(candidates)
+        leaving: Set[Hashable] = set()
+        by_position = self._by_position
+        for position in path:
+            left = remaining - by_position.get(position, _EMPTY)
+            if left:
+                leaving |= left
+                remaining -= left
+                if not remaining:
+                    break
+        return leaving
+
+    def clear(self) -> None:
+        self._by_position.clear()
+        self._by_key.clear()
+        self.revision += 1
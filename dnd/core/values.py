@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field, computed_field, field_validator, PrivateA
 from typing import List, Optional, Dict, Any, Callable, Protocol, TypeVar, ClassVar, Union, Tuple, Self
 import uuid
 from uuid import UUID, uuid4
+from weakref import WeakValueDictionary
+from dnd.core.world import world_scoped
 from enum import Enum
 from dnd.core.base_object import BaseObject
 from dnd.core.modifiers import (
@@ -30,11 +32,124 @@ from dnd.core.modifiers import (
 )
 import inspect
 import random  # Add this import at the top of the file
+from functools import wraps
+from itertools import count
 
 
 def identity(x: int) -> int:
     return x
 
+# Every modification of a value gets a new stamp from this counter, so equal stamps always mean equal modifiers
+_value_versions = count(1)
+
+def version_cached(method: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Cache the result of a computed property until the value reports a different cache version.
+
+    The wrapped object provides _cache_version(), returning None when the result cannot be cached.
+    A new cache dictionary is created for each version instead of clearing the old one, so shallow copies
+    sharing the private attributes never see results computed for another version.
+    Lists and dictionaries are returned as copies to keep the cached result safe from callers.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        version = self._cache_version()
+        if version is None:
+            return method(self)
+        # private attributes are read from the pydantic private dict directly, the regular attribute lookup is much slower
+        private = self.__pydantic_private__
+        cache = private['_score_cache']
+        if cache is None or cache[0] != version:
+            cache = (version, {})
+            private['_score_cache'] = cache
+        results = cache[1]
+        if name in results:
+            result = results[name]
+        else:
+            result = method(self)
+            results[name] = result
+        if isinstance(result, (list, dict)):
+            return result.copy()
+        return result
+    return wrapper
+
+# The modifier dictionaries shared by StaticValue and ContextualValue, merged when values are combined
+MODIFIER_FIELDS = (
+    "value_modifiers", "min_constraints", "max_constraints", "advantage_modifiers", "critical_modifiers",
+    "auto_hit_modifiers", "size_modifiers", "damage_type_modifiers", "resistance_modifiers",
+)
+
+def shallow_copy(model: BaseModel, update: Dict[str, Any]) -> Any:
+    """
+    Shallow copy of a pydantic model with some fields replaced, without validation, like model_copy(update=...)
+    at about half the cost. The field values not replaced are shared with the model.
+    """
+    cls = type(model)
+    copied = cls.__new__(cls)
+    fields = model.__dict__.copy()
+    fields.update(update)
+    extra = model.__pydantic_extra__
+    private = model.__pydantic_private__
+    object.__setattr__(copied, '__dict__', fields)
+    object.__setattr__(copied, '__pydantic_extra__', extra.copy() if extra is not None else None)
+    object.__setattr__(copied, '__pydantic_fields_set__', set(model.__pydantic_fields_set__))
+    object.__setattr__(copied, '__pydantic_private__', private.copy() if private is not None else None)
+    return copied
+
+# field defaults shared by every instance instead of being copied at construction
+_IMMUTABLE_DEFAULTS = (str, int, float, bool, type(None), Enum, UUID)
+
+class _ValueFields:
+    """ the field metadata of a value class used by construct_view, computed once per class by _value_fields """
+
+    __slots__ = ('template', 'factories', 'private')
+
+    def __init__(self, cls: type):
+        # every field in definition order with its immutable default, the others are set at construction
+        self.template: Dict[str, Any] = {}
+        # the fields with a default factory or a mutable default, pydantic resolves them at every model_construct call
+        self.factories: List[Tuple[str, Any]] = []
+        for name, field in cls.model_fields.items():
+            self.template[name] = None
+            if field.default_factory is None and not field.is_required() and isinstance(field.default, _IMMUTABLE_DEFAULTS):
+                self.template[name] = field.default
+            elif not field.is_required():
+                self.factories.append((name, field))
+        self.private: Tuple[Tuple[str, Any], ...] = tuple(cls.__private_attributes__.items())
+
+
+_value_fields_by_class: Dict[type, _ValueFields] = {}
+
+
+def construct_view(cls: type, **data: Any) -> Any:
+    """
+    Build an unregistered value like cls.model_construct(**data), from a per class template of the defaults instead
+    of resolving every default at each call. Used for the combined values, which are built very often.
+    """
+    value_fields = _value_fields_by_class.get(cls)
+    if value_fields is None:
+        value_fields = _value_fields_by_class[cls] = _ValueFields(cls)
+    fields = value_fields.template.copy()
+    fields.update(data)
+    for name, field in value_fields.factories:
+        if name not in data:
+            fields[name] = field.get_default(call_default_factory=True, validated_data=fields)
+    value = cls.__new__(cls)
+    object.__setattr__(value, '__dict__', fields)
+    object.__setattr__(value, '__pydantic_fields_set__', set(data))
+    object.__setattr__(value, '__pydantic_extra__', None)
+    object.__setattr__(value, '__pydantic_private__', {name: attr.get_default(call_default_factory=True) for name, attr in value_fields.private})
+    return value
+
+def _merge_modifier_dicts(values: List[Any], field_name: str) -> Dict[UUID, Any]:
+    """ merge one modifier dictionary of several values, the modifiers themselves are shared and not copied """
+    merged = {}
+    for value in values:
+        merged.update(getattr(value, field_name))
+    return merged
+
 class BaseValue(BaseObject): 
     """
     Base class for all value types in the system.
@@ -54,7 +169,7 @@ class BaseValue(BaseObject):
         generated_from (List[UUID]): List of UUIDs of values that this value was generated from.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseValue']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseValue']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         __init__(**data): Initialize the BaseValue and register it in the class registry.
@@ -72,7 +187,10 @@ class BaseValue(BaseObject):
             Validate that the given target_id matches the target_entity_uuid of this value.
     """
 
-    _registry: ClassVar[Dict[UUID, 'BaseValue']] = {}
+    _registry: ClassVar[WeakValueDictionary[UUID, 'BaseValue']] = world_scoped(WeakValueDictionary)
+    _version: int = PrivateAttr(default_factory=lambda: next(_value_versions))
+    _cacheable: bool = PrivateAttr(default=True)
+    _score_cache: Optional[Tuple[Any, Dict[str, Any]]] = PrivateAttr(default=None)
 
     name: str = Field(
         default="A Value",
@@ -142,6 +260,29 @@ class BaseValue(BaseObject):
     def validate_modifier_target(self, modifier: Union[NumericalModifier, AdvantageModifier, CriticalModifier, AutoHitModifier, SizeModifier, DamageTypeModifier, ResistanceModifier, ContextualNumericalModifier, ContextualAdvantageModifier, ContextualCriticalModifier, ContextualAutoHitModifier, ContextualSizeModifier, ContextualDamageTypeModifier, ContextualResistanceModifier]) -> None:
         pass
 
+    def _touch(self) -> None:
+        """
+        Mark the value as modified, invalidating the cached computed attributes.
+        """
+        self.__pydantic_private__['_version'] = next(_value_versions)
+
+    def _cache_version(self) -> Any:
+        """
+        Get the key the cached computed attributes are valid for, None if they must be recomputed on every read.
+        """
+        return None
+
+    def fork(self) -> Self:
+        """
+        Create an unregistered copy of the value sharing the modifier objects with this value.
+
+        The modifier dictionaries are copied, modifiers added to or removed from the fork do not change this value
+        and setting the target or the context of the fork leaves this value untouched. The fork keeps the version
+        and the cached computed attributes of this value, which are valid for the copied dictionaries.
+        """
+        fields = self.__dict__
+        return shallow_copy(self, {name: fields[name].copy() for name in MODIFIER_FIELDS if name in fields})
+
     def get_generation_chain(self) -> List['BaseValue']:
         chain = []
         visited = set()
@@ -189,7 +330,7 @@ class StaticValue(BaseValue):
         largest_size_priority (bool): Flag to indicate whether the largest size (True) or smallest size (False) has precedence.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseValue']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseValue']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Computed Attributes:
         min (Optional[int]): The minimum value based on all min constraints.
@@ -283,6 +424,14 @@ class StaticValue(BaseValue):
            
         return self
 
+    def _cache_version(self) -> Optional[int]:
+        """
+        Static values are cached until a modifier is added or removed, except for shallow copies sharing
+        the modifier dictionaries of another value.
+        """
+        private = self.__pydantic_private__
+        return private['_version'] if private['_cacheable'] else None
+
     @classmethod
     def get(cls, uuid: UUID) -> 'StaticValue':
         value = cls._registry.get(uuid)
@@ -301,6 +450,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.value_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_value_modifier(self, uuid: UUID) -> None:
@@ -310,7 +460,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.value_modifiers.pop(uuid, None)
+        if self.value_modifiers.pop(uuid, None) is not None:
+            self._touch()
 
     def add_min_constraint(self, constraint: NumericalModifier) -> UUID:
         """
@@ -323,6 +474,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added constraint.
         """
         self.min_constraints[constraint.uuid] = constraint
+        self._touch()
         return constraint.uuid
     
     def remove_min_constraint(self, uuid: UUID) -> None:
@@ -332,7 +484,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the constraint to remove.
         """
-        self.min_constraints.pop(uuid, None)
+        if self.min_constraints.pop(uuid, None) is not None:
+            self._touch()
 
     def add_max_constraint(self, constraint: NumericalModifier) -> UUID:
         """
@@ -345,6 +498,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added constraint.
         """
         self.max_constraints[constraint.uuid] = constraint
+        self._touch()
         return constraint.uuid
     
     def remove_max_constraint(self, uuid: UUID) -> None:
@@ -354,7 +508,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the constraint to remove.
         """
-        self.max_constraints.pop(uuid, None)
+        if self.max_constraints.pop(uuid, None) is not None:
+            self._touch()
     
     def add_advantage_modifier(self, modifier: AdvantageModifier) -> UUID:
         """
@@ -367,6 +522,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.advantage_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_advantage_modifier(self, uuid: UUID) -> None:
@@ -376,7 +532,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.advantage_modifiers.pop(uuid, None)
+        if self.advantage_modifiers.pop(uuid, None) is not None:
+            self._touch()
     
     def add_critical_modifier(self, modifier: CriticalModifier) -> UUID:
         """
@@ -389,6 +546,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.critical_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_critical_modifier(self, uuid: UUID) -> None:
@@ -398,7 +556,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.critical_modifiers.pop(uuid, None)
+        if self.critical_modifiers.pop(uuid, None) is not None:
+            self._touch()
     
     def add_auto_hit_modifier(self, modifier: AutoHitModifier) -> UUID:
         """
@@ -411,6 +570,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.auto_hit_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_auto_hit_modifier(self, uuid: UUID) -> None:
@@ -420,7 +580,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.auto_hit_modifiers.pop(uuid, None)
+        if self.auto_hit_modifiers.pop(uuid, None) is not None:
+            self._touch()
 
     def add_size_modifier(self, modifier: SizeModifier) -> UUID:
         """
@@ -433,6 +594,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.size_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_size_modifier(self, uuid: UUID) -> None:
@@ -442,7 +604,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.size_modifiers.pop(uuid, None)
+        if self.size_modifiers.pop(uuid, None) is not None:
+            self._touch()
 
     def add_damage_type_modifier(self, modifier: DamageTypeModifier) -> UUID:
         """
@@ -455,6 +618,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.damage_type_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_damage_type_modifier(self, uuid: UUID) -> None:
@@ -464,7 +628,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.damage_type_modifiers.pop(uuid, None)
+        if self.damage_type_modifiers.pop(uuid, None) is not None:
+            self._touch()
 
     def add_resistance_modifier(self, modifier: ResistanceModifier) -> UUID:
         """
@@ -477,6 +642,7 @@ class StaticValue(BaseValue):
             UUID: The UUID of the added modifier.
         """
         self.resistance_modifiers[modifier.uuid] = modifier
+        self._touch()
         return modifier.uuid
     
     def remove_resistance_modifier(self, uuid: UUID) -> None:
@@ -486,7 +652,8 @@ class StaticValue(BaseValue):
         Args:
             uuid (UUID): The UUID of the modifier to remove.
         """
-        self.resistance_modifiers.pop(uuid, None)
+        if self.resistance_modifiers.pop(uuid, None) is not None:
+            self._touch()
 
     def remove_modifier(self, uuid: UUID) -> None:
         """
@@ -507,6 +674,7 @@ class StaticValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def min(self) -> Optional[int]:
         """
         Calculate the minimum value based on all min constraints.
@@ -520,6 +688,7 @@ class StaticValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def max(self) -> Optional[int]:
         """
         Calculate the maximum value based on all max constraints.
@@ -548,6 +717,7 @@ class StaticValue(BaseValue):
             return modifier_sum
     @computed_field
     @property
+    @version_cached
     def score(self) -> int:
         """
         Calculate the final score of the value, considering all modifiers and constraints.
@@ -561,6 +731,7 @@ class StaticValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def normalized_score(self) -> int:
         """
         Apply the score normalizer function to the calculated score.
@@ -572,6 +743,7 @@ class StaticValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def advantage_sum(self) -> int:
         """
         Calculate the sum of all advantage modifiers.
@@ -583,6 +755,7 @@ class StaticValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def advantage(self) -> AdvantageStatus:
         """
         Determine the final advantage status based on all advantage modifiers.
@@ -599,6 +772,7 @@ class StaticValue(BaseValue):
         
     @computed_field
     @property
+    @version_cached
     def critical(self) -> CriticalStatus:
         """
         Determine the final critical status based on all critical modifiers.
@@ -615,6 +789,7 @@ class StaticValue(BaseValue):
         
     @computed_field
     @property
+    @version_cached
     def auto_hit(self) -> AutoHitStatus:
         """
         Determine the final auto-hit status based on all auto-hit modifiers.
@@ -631,6 +806,7 @@ class StaticValue(BaseValue):
         
     @computed_field
     @property
+    @version_cached
     def size(self) -> Size:
         """
         Determine the final size based on all size modifiers.
@@ -649,6 +825,7 @@ class StaticValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def damage_types(self) -> List[DamageType]:
         """
         Determine the list of damage types based on damage type modifiers.
@@ -686,6 +863,7 @@ class StaticValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def resistance_sum(self) -> Dict[DamageType, int]:
         """
         Calculate the sum of resistance values for each damage type.
@@ -700,6 +878,7 @@ class StaticValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def resistance(self) -> Dict[DamageType, ResistanceStatus]:
         """
         Determine the final resistance status for each damage type based on the resistance sum.
@@ -728,7 +907,8 @@ class StaticValue(BaseValue):
             naming_callable (Optional[Callable[[List[str]], str]]): A function to generate the name of the combined value.
 
         Returns:
-            StaticValue: A new StaticValue instance that combines all the input values.
+            StaticValue: A new unregistered StaticValue that combines the modifiers of all the input values.
+            The modifiers are shared with the input values and the combined value is built without validation.
 
         Raises:
             ValueError: If any of the other values have a different source entity UUID.
@@ -739,23 +919,18 @@ class StaticValue(BaseValue):
         for other in others:
             self.validate_source_id(other.source_entity_uuid)
         
-        return StaticValue(
-            name=naming_callable([self.name] + [other.name for other in others]),
-            value_modifiers={**self.value_modifiers, **{k: v for other in others for k, v in other.value_modifiers.items()}},
-            min_constraints={**self.min_constraints, **{k: v for other in others for k, v in other.min_constraints.items()}},
-            max_constraints={**self.max_constraints, **{k: v for other in others for k, v in other.max_constraints.items()}},
-            advantage_modifiers={**self.advantage_modifiers, **{k: v for other in others for k, v in other.advantage_modifiers.items()}},
-            critical_modifiers={**self.critical_modifiers, **{k: v for other in others for k, v in other.critical_modifiers.items()}},
-            auto_hit_modifiers={**self.auto_hit_modifiers, **{k: v for other in others for k, v in other.auto_hit_modifiers.items()}},
-            size_modifiers={**self.size_modifiers, **{k: v for other in others for k, v in other.size_modifiers.items()}},
-            damage_type_modifiers={**self.damage_type_modifiers, **{k: v for other in others for k, v in other.damage_type_modifiers.items()}},
-            resistance_modifiers={**self.resistance_modifiers, **{k: v for other in others for k, v in other.resistance_modifiers.items()}},
-            generated_from=[self.uuid] + [other.uuid for other in others],
+        values = [self] + others
+        return construct_view(StaticValue,
+            name=naming_callable([value.name for value in values]),
+            uuid=uuid4(),
+            **{field_name: _merge_modifier_dicts(values, field_name) for field_name in MODIFIER_FIELDS},
+            generated_from=[value.uuid for value in values],
             source_entity_uuid=self.source_entity_uuid,
             source_entity_name=self.source_entity_name,
             score_normalizer=self.score_normalizer,
             is_outgoing_modifier=self.is_outgoing_modifier,
-            global_normalizer=False
+            global_normalizer=False,
+            use_register=False
         )
 
     def get_all_modifier_uuids(self) -> List[UUID]:
@@ -779,6 +954,7 @@ class StaticValue(BaseValue):
         """
         Remove all modifiers from this StaticValue.
         """
+        self._touch()
         self.value_modifiers.clear()
         self.min_constraints.clear()
         self.max_constraints.clear()
@@ -796,6 +972,7 @@ class StaticValue(BaseValue):
         Args:
             normalizer (Callable[[int], int]): The normalizer function to apply.
         """
+        self._touch()
         self.score_normalizer = normalizer
         
         # Apply to value modifiers
@@ -848,7 +1025,7 @@ class ContextualValue(BaseValue):
         largest_size_priority (bool): Flag to indicate whether the largest size (True) or smallest size (False) has precedence.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseValue']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseValue']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Computed Attributes:
         min (Optional[int]): The minimum value based on all contextual min constraints.
@@ -1476,7 +1653,8 @@ class ContextualValue(BaseValue):
             naming_callable (Optional[Callable[[List[str]], str]]): A function to generate the name of the combined value.
 
         Returns:
-            ContextualValue: A new ContextualValue instance that combines all the input values.
+            ContextualValue: A new unregistered ContextualValue that combines the modifiers of all the input values.
+            The modifiers are shared with the input values and the combined value is built without validation.
 
         Raises:
             ValueError: If any of the other values have a different source entity UUID.
@@ -1487,21 +1665,12 @@ class ContextualValue(BaseValue):
         for other in others:
             self.validate_source_id(other.source_entity_uuid)
         
-        def merge_dicts(*dicts):
-            return {k: v for d in dicts for k, v in d.items()}
-
-        return ContextualValue(
-            name=naming_callable([self.name] + [other.name for other in others]),
-            value_modifiers=merge_dicts(self.value_modifiers, *(other.value_modifiers for other in others)),
-            min_constraints=merge_dicts(self.min_constraints, *(other.min_constraints for other in others)),
-            max_constraints=merge_dicts(self.max_constraints, *(other.max_constraints for other in others)),
-            advantage_modifiers=merge_dicts(self.advantage_modifiers, *(other.advantage_modifiers for other in others)),
-            critical_modifiers=merge_dicts(self.critical_modifiers, *(other.critical_modifiers for other in others)),
-            auto_hit_modifiers=merge_dicts(self.auto_hit_modifiers, *(other.auto_hit_modifiers for other in others)),
-            size_modifiers=merge_dicts(self.size_modifiers, *(other.size_modifiers for other in others)),
-            damage_type_modifiers=merge_dicts(self.damage_type_modifiers, *(other.damage_type_modifiers for other in others)),
-            resistance_modifiers=merge_dicts(self.resistance_modifiers, *(other.resistance_modifiers for other in others)),
-            generated_from=[self.uuid] + [other.uuid for other in others],
+        values = [self] + others
+        return construct_view(ContextualValue,
+            name=naming_callable([value.name for value in values]),
+            uuid=uuid4(),
+            **{field_name: _merge_modifier_dicts(values, field_name) for field_name in MODIFIER_FIELDS},
+            generated_from=[value.uuid for value in values],
             source_entity_uuid=self.source_entity_uuid,
             source_entity_name=self.source_entity_name,
             target_entity_uuid=self.target_entity_uuid,
@@ -1509,7 +1678,8 @@ class ContextualValue(BaseValue):
             context=self.context,
             score_normalizer=self.score_normalizer,
             is_outgoing_modifier=self.is_outgoing_modifier,
-            global_normalizer=False
+            global_normalizer=False,
+            use_register=False
         )
 
     def get_all_modifier_uuids(self) -> List[UUID]:
@@ -1529,6 +1699,17 @@ class ContextualValue(BaseValue):
                 list(self.damage_type_modifiers.keys()) +
                 list(self.resistance_modifiers.keys()))
 
+    def has_modifiers(self) -> bool:
+        """
+        Check whether this ContextualValue holds any modifier.
+
+        Returns:
+            bool: True if at least one modifier dictionary is not empty.
+        """
+        return bool(self.value_modifiers or self.min_constraints or self.max_constraints or
+                    self.advantage_modifiers or self.critical_modifiers or self.auto_hit_modifiers or
+                    self.size_modifiers or self.damage_type_modifiers or self.resistance_modifiers)
+
     def remove_all_modifiers(self) -> None:
         """
         Remove all modifiers from this ContextualValue.
@@ -1598,7 +1779,7 @@ class ModifiableValue(BaseValue):
         from_target_static (Optional[StaticValue]): Static modifiers applied by a target to this entity.
 
     Class Attributes:
-        _registry (ClassVar[Dict[UUID, 'BaseValue']]): A class-level registry to store all instances.
+        _registry (ClassVar[WeakValueDictionary[UUID, 'BaseValue']]): A class-level registry of weak references to all instances, objects are dropped once nothing else references them.
 
     Methods:
         create(cls, source_entity_uuid: UUID, source_entity_name: Optional[str] = None) -> 'ModifiableValue':
@@ -1701,6 +1882,25 @@ class ModifiableValue(BaseValue):
         return obj
     
 
+    def _cache_version(self) -> Optional[Tuple[Optional[int], ...]]:
+        """
+        Modifiable values are cached on the versions of their static components, only while the contextual components
+        are empty, since contextual modifiers depend on the target and context.
+        """
+        for contextual in (self.self_contextual, self.to_target_contextual, self.from_target_contextual):
+            if contextual is not None and contextual.has_modifiers():
+                return None
+        versions = []
+        for static in (self.self_static, self.to_target_static, self.from_target_static):
+            if static is None:
+                versions.append(None)
+                continue
+            private = static.__pydantic_private__
+            if not private['_cacheable']:
+                return None
+            versions.append(private['_version'])
+        return tuple(versions)
+
     def get_typed_modifiers(self) -> List[Union[StaticValue, ContextualValue]]:
         """
         Get a list of all non-None modifiers associated with this ModifiableValue.
@@ -1735,6 +1935,7 @@ class ModifiableValue(BaseValue):
         
     @computed_field
     @property
+    @version_cached
     def min(self) -> Optional[int]:
         """
         Calculate the minimum value based on all modifiers.
@@ -1750,6 +1951,7 @@ class ModifiableValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def max(self) -> Optional[int]:
         """
         Calculate the maximum value based on all modifiers.
@@ -1782,6 +1984,7 @@ class ModifiableValue(BaseValue):
         
     @computed_field
     @property
+    @version_cached
     def score(self) -> int:
         """
         Calculate the final score of the value, considering all modifiers and constraints.
@@ -1793,6 +1996,7 @@ class ModifiableValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def normalized_score(self) -> int:
         """
         Apply the score normalizer function to the calculated score.
@@ -1803,6 +2007,7 @@ class ModifiableValue(BaseValue):
         return self._score(normalized=True)
     @computed_field
     @property
+    @version_cached
     def advantage_sum(self) -> int:
         """
         Calculate the sum of advantage values from all modifiers.
@@ -1817,6 +2022,7 @@ class ModifiableValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def advantage(self) -> AdvantageStatus:
         """
         Determine the final advantage status based on all advantage modifiers.
@@ -1834,6 +2040,7 @@ class ModifiableValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def critical(self) -> CriticalStatus:
         """
         Determine the final critical status based on all critical modifiers.
@@ -1852,6 +2059,7 @@ class ModifiableValue(BaseValue):
     
     @computed_field
     @property
+    @version_cached
     def auto_hit(self) -> AutoHitStatus:
         """
         Determine the final auto-hit status based on all auto-hit modifiers.
@@ -1870,6 +2078,7 @@ class ModifiableValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def size(self) -> Size:
         """
         Determine the final size based on all size modifiers.
@@ -1899,6 +2108,7 @@ class ModifiableValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def damage_types(self) -> List[DamageType]:
         """
         Determine the list of damage types based on all damage type modifiers.
@@ -1941,6 +2151,7 @@ class ModifiableValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def resistance_sum(self) -> Dict[DamageType, int]:
         """
         Calculate the sum of resistance values for each damage type.
@@ -1962,6 +2173,7 @@ class ModifiableValue(BaseValue):
 
     @computed_field
     @property
+    @version_cached
     def resistance(self) -> Dict[DamageType, ResistanceStatus]:
         """
         Determine the final resistance status for each damage type based on the resistance sum.
@@ -2069,6 +2281,8 @@ class ModifiableValue(BaseValue):
         """
         self.validate_target_id(static.source_entity_uuid)
         self.from_target_static = static.model_copy(update={"target_entity_uuid": self.source_entity_uuid, "target_entity_name": self.source_entity_name})
+        # the copy shares the modifier dictionaries of the target value, its cache would not see their changes
+        self.from_target_static._cacheable = False
 
     def set_from_target(self, target_value: 'ModifiableValue') -> None:
         """
@@ -2080,6 +2294,23 @@ class ModifiableValue(BaseValue):
         self.set_from_target_contextual(target_value.to_target_contextual)
         self.set_from_target_static(target_value.to_target_static)
 
+    def fork(self) -> Self:
+        """
+        Create an unregistered copy of the value whose components are forks of the components of this value,
+        see BaseValue.fork. Evaluating the fork against another target or context does not change this value.
+        """
+        update = {
+            "self_static": self.self_static.fork(),
+            "to_target_static": self.to_target_static.fork(),
+            "self_contextual": self.self_contextual.fork(),
+            "to_target_contextual": self.to_target_contextual.fork(),
+        }
+        if self.from_target_static is not None:
+            update["from_target_static"] = self.from_target_static.fork()
+        if self.from_target_contextual is not None:
+            update["from_target_contextual"] = self.from_target_contextual.fork()
+        return shallow_copy(self, update)
+
     def reset_from_target(self) -> None:
         """
         Reset the from_target components to None.
@@ -2096,7 +2327,9 @@ class ModifiableValue(BaseValue):
             naming_callable (Optional[Callable[[List[str]], str]]): A function to generate the name of the combined value.
 
         Returns:
-            ModifiableValue: A new ModifiableValue instance that combines all the input values.
+            ModifiableValue: A new unregistered ModifiableValue that combines the modifiers of all the input values.
+            Combined values are lightweight views built without validation, the modifiers are shared with the input values
+            while the modifier dictionaries belong to the combined value, so resetting the inputs afterwards does not affect it.
 
         Raises:
             ValueError: If any of the other values have a different source entity UUID.
@@ -2127,15 +2360,17 @@ class ModifiableValue(BaseValue):
         if new_from_target_contextual is not None:
             new_from_target_contextual.set_target_entity(self.source_entity_uuid, self.source_entity_name)
         
-        new_value= ModifiableValue(
-            name=naming_callable([self.name] + [other.name for other in others]),
+        values = [self] + others
+        new_value = construct_view(ModifiableValue,
+            name=naming_callable([value.name for value in values]),
+            uuid=uuid4(),
             self_static=self.self_static.combine_values([other.self_static for other in others]),
             to_target_static=self.to_target_static.combine_values([other.to_target_static for other in others]),
             self_contextual=self.self_contextual.combine_values([other.self_contextual for other in others]),
             to_target_contextual=self.to_target_contextual.combine_values([other.to_target_contextual for other in others]),
             from_target_static=new_from_target_static,
             from_target_contextual=new_from_target_contextual,
-            generated_from=[self.uuid] + [other.uuid for other in others],
+            generated_from=[value.uuid for value in values],
             source_entity_uuid=self.source_entity_uuid,
             source_entity_name=self.source_entity_name,
             target_entity_uuid=self.target_entity_uuid,
@@ -2143,6 +2378,7 @@ class ModifiableValue(BaseValue):
             context=self.context,
             score_normalizer=self.score_normalizer,
             global_normalizer=False,
+            use_register=False,
         )
         if self.target_entity_uuid is not None:
             new_value.set_target_entity(self.target_entity_uuid, self.target_entity_name)
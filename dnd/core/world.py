@@ -0,0 +1,152 @@
+""" Isolated game worlds.
+
+Every piece of engine state that used to be process-global (the object registries, the tile and entity position
+indices and the EventQueue) is declared as a world_scoped class attribute. Reading such an attribute returns the
+instance owned by the world that is current in the running context, so several encounters can live in the same
+process without sharing anything. A default world is always current unless another one is activated.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import UUID, uuid4
+
+
+class world_scoped:
+    """
+    Class attribute descriptor whose value is owned by the current world.
+
+    The value is created lazily with the factory the first time a world reads it. Classes that reassign a
+    world scoped attribute at class level (cls.attribute = value) must use WorldScopedMeta as metaclass,
+    mutable values like registries can be used from any class.
+
+    Attributes:
+        factory (Callable[[], Any]): Creates the initial value of the attribute in a new world.
+        name (str): The qualified name of the attribute, used for debugging.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.name = "world_scoped"
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = f"{owner.__qualname__}.{name}"
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        state = _current_world.get()._state
+        try:
+            return state[self]
+        except KeyError:
+            value = state[self] = self.factory()
+            return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        _current_world.get()._state[self] = value
+
+    def __repr__(self) -> str:
+        return f"world_scoped({self.name})"
+
+
+class WorldScopedMeta(type):
+    """ Metaclass routing class level assignments of world scoped attributes to the current world """
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        for klass in cls.__mro__:
+            attribute = klass.__dict__.get(name)
+            if attribute is not None:
+                if isinstance(attribute, world_scoped):
+                    attribute.__set__(None, value)
+                    return
+                break
+        super().__setattr__(name, value)
+
+
+class World:
+    """
+    An isolated game world holding the registries, the tile grid and the event queue of one encounter.
+
+    Attributes:
+        uuid (UUID): Unique identifier of the world.
+        name (Optional[str]): Name of the world.
+        seed (Optional[int]): Seed of the random streams of the world (see dnd.core.rng), None for a random seed.
+
+    Class Attributes:
+        _worlds (Dict[UUID, World]): Every world that has not been disposed.
+
+    Methods:
+        get(cls, uuid: UUID) -> Optional[World]:
+            Retrieve a world by its UUID.
+        all(cls) -> List[World]:
+            Get every world that has not been disposed.
+        current(cls) -> World:
+            Get the world of the running context.
+        activate(self) -> Iterator[World]:
+            Context manager making this world current.
+        dispose(self) -> None:
+            Drop every object owned by the world.
+    """
+
+    _worlds: Dict[UUID, 'World'] = {}
+
+    def __init__(self, name: Optional[str] = None, uuid: Optional[UUID] = None, seed: Optional[int] = None):
+        self.uuid = uuid if uuid is not None else uuid4()
+        self.name = name
+        self.seed = seed
+        self._state: Dict[world_scoped, Any] = {}
+        self._disposed = False
+        World._worlds[self.uuid] = self
+
+    def __repr__(self) -> str:
+        return f"World(name={self.name!r}, uuid={self.uuid})"
+
+    @classmethod
+    def get(cls, uuid: UUID) -> Optional['World']:
+        return cls._worlds.get(uuid)
+
+    @classmethod
+    def all(cls) -> List['World']:
+        return list(cls._worlds.values())
+
+    @classmethod
+    def current(cls) -> 'World':
+        return _current_world.get()
+
+    @contextmanager
+    def activate(self) -> Iterator['World']:
+        """ make this world the current one for the running context until the block exits """
+        if self._disposed:
+            raise ValueError(f"World {self.uuid} has been disposed")
+        token = _current_world.set(self)
+        try:
+            yield self
+        finally:
+            _current_world.reset(token)
+
+    @property
+    def disposed(self) -> bool:
+        return self._disposed
+
+    def dispose(self) -> None:
+        """
+        Drop every object owned by the world, the registries are emptied so their content can be reclaimed.
+
+        Raises:
+            ValueError: If the world is the default world.
+        """
+        if self is DEFAULT_WORLD:
+            raise ValueError("The default world cannot be disposed")
+        for value in self._state.values():
+            clear = getattr(value, "clear", None)
+            if callable(clear):
+                clear()
+        self._state.clear()
+        self._disposed = True
+        World._worlds.pop(self.uuid, None)
+
+    def stats(self) -> Dict[str, int]:
+        """ size of every world scoped container created in this world """
+        return {attribute.name: len(value) for attribute, value in self._state.items() if hasattr(value, "__len__")}
+
+
+DEFAULT_WORLD = World(name="default")
+_current_world: ContextVar[World] = ContextVar("dnd_current_world", default=DEFAULT_WORLD)
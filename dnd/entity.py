@@ -1,6 +1,6 @@
 from typing import DefaultDict, Dict, Optional, Any, List, Self, Literal, ClassVar, Union, Tuple, Callable, Set
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field, model_validator, computed_field, field_validator
+from pydantic import BaseModel, Field, model_validator, computed_field, field_validator, PrivateAttr
 from enum import Enum
 from collections import defaultdict
 
@@ -15,20 +15,24 @@ from dnd.core.modifiers import (
 from dnd.core.values import  AdvantageStatus, CriticalStatus, AutoHitStatus, StaticValue, ContextualValue
 
 from dnd.core.base_conditions import BaseCondition
+from dnd.core.world import world_scoped
 from dnd.core.dice import Dice, RollType, DiceRoll, AttackOutcome
 from dnd.core.events import EventType, EventPhase, Event, RangeType, SavingThrowEvent, SkillCheckEvent
 
 from dnd.core.base_block import BaseBlock
 from dnd.blocks.abilities import (AbilityConfig,AbilityScoresConfig, AbilityScores)
-from dnd.blocks.saving_throws import (SavingThrowConfig,SavingThrowSetConfig,SavingThrowSet)
+from dnd.blocks.saving_throws import (SavingThrowConfig,SavingThrowSetConfig,SavingThrowSet,SavingThrow)
 from dnd.blocks.health import (HealthConfig,Health)
 from dnd.blocks.equipment import (EquipmentConfig,Equipment,WeaponSlot,WeaponProperty, Range, Shield, Damage)
 from dnd.blocks.action_economy import (ActionEconomyConfig,ActionEconomy)
-from dnd.blocks.skills import (SkillSetConfig,SkillSet)
+from dnd.blocks.skills import (SkillSetConfig,SkillSet,Skill)
 from dnd.blocks.sensory import Senses
 from dnd.core.events import AbilityName, SkillName, EventHandler, EventType, EventPhase, Trigger
 from dnd.core.base_block import ContextualConditionImmunity
 from dnd.core.base_tiles import Tile
+from dnd.core.dijkstra import PathMap
+from dnd.core.spatial import SpatialIndex
+from dnd.core.threat_map import ThreatMap
 
 
 def determine_attack_outcome(roll: DiceRoll, ac: Union[int, ModifiableValue]) -> AttackOutcome:
@@ -93,25 +97,25 @@ class Entity(BaseBlock):
     senses: Senses = Field(default_factory=lambda: Senses.create(source_entity_uuid=uuid4()))
     allow_events_conditions: bool = Field(default=True,description="If True, events and conditions will be allowed to be added to the block")
     sprite_name: Optional[str] = Field(default=None,description="The name of the sprite to use for the entity")
-    _entity_registry: ClassVar[Dict[UUID, 'Entity']] = {}
-    _entity_by_position: ClassVar[DefaultDict[Tuple[int,int], List['Entity']]] = defaultdict(list)
-
-    def __init__(self, **data):
-        """
-        Initialize the BaseBlock and register it in the class registry.
-
-        Args:
-            **data: Keyword arguments to initialize the BaseBlock attributes.
-        """
-        super().__init__(**data)
+    _entity_registry: ClassVar[Dict[UUID, 'Entity']] = world_scoped(dict)
+    # bucketed index of the entity positions, answers position, rectangle and radius queries
+    _spatial_index: ClassVar[SpatialIndex] = world_scoped(SpatialIndex)
+    # positions threatened by every entity, kept in sync with the senses and the main hand weapon reach
+    _threat_map: ClassVar[ThreatMap] = world_scoped(ThreatMap)
+    # copies of the proficiency bonus normalized for a skill or saving throw, see _normalized_proficiency_bonus
+    _normalized_proficiency_bonuses: Dict[Tuple[UUID, bool, bool], Tuple[ModifiableValue, Any, ModifiableValue]] = PrivateAttr(default_factory=dict)
+
+    def _add_to_registries(self) -> None:
+        """ register a newly constructed entity in the block registry, the entity registry and the spatial index """
+        super()._add_to_registries()
         self.__class__._entity_registry[self.uuid] = self
-        self.__class__._entity_by_position[self.position].append(self)
+        self.__class__._spatial_index.add(self.uuid, self, self.position)
 
     @classmethod
     def update_entity_position(cls, entity: 'Entity',new_position: Tuple[int,int]):
-        cls._entity_by_position[entity.position].remove(entity)
-        cls._entity_by_position[new_position].append(entity)
+        cls._spatial_index.move(entity.uuid, new_position)
         entity._set_position(new_position)
+        entity.update_threat()
 
     @classmethod
     def register_entity(cls, entity: 'Entity'):
@@ -123,7 +127,39 @@ class Entity(BaseBlock):
     
     @classmethod
     def get_all_entities_at_position(cls, position: Tuple[int,int]) -> List['Entity']:
-        return cls._entity_by_position[position]
+        return cls._spatial_index.at(position)
+
+    @classmethod
+    def get_entities_within(cls, position: Tuple[int,int], distance: int) -> List['Entity']:
+        """ Get the entities whose distance from the position, as measured by Senses.get_distance, is at most distance """
+        # int(sqrt(squared_distance)) <= distance holds exactly when squared_distance < (distance + 1) ** 2
+        limit = (distance + 1) ** 2
+        return [entity for entity in cls._spatial_index.query_radius(position, distance + 1)
+                if (entity.position[0] - position[0]) ** 2 + (entity.position[1] - position[1]) ** 2 < limit]
+
+    @classmethod
+    def get_entities_in_rect(cls, min_corner: Tuple[int,int], max_corner: Tuple[int,int]) -> List['Entity']:
+        """ Get the entities inside a rectangle, corners included """
+        return cls._spatial_index.query_rect(min_corner, max_corner)
+
+    @classmethod
+    def get_spatial_index(cls) -> SpatialIndex:
+        return cls._spatial_index
+
+    @classmethod
+    def get_threat_map(cls) -> ThreatMap:
+        return cls._threat_map
+
+    def get_threat_reach(self) -> int:
+        """ the number of cells threatened around the entity, the reach of the main hand weapon (at least 1) """
+        weapon_range = self.get_weapon_range(WeaponSlot.MAIN_HAND)
+        if weapon_range.type == RangeType.REACH:
+            return max(weapon_range.normal // 5, 1)
+        return 1
+
+    def update_threat(self):
+        """ refresh the positions threatened by the entity in the threat map """
+        Entity._threat_map.set_threatened_positions(self.uuid, self.senses.get_threathened_positions(self.get_threat_reach()))
     
     @classmethod
     def get(cls, uuid: UUID) -> Optional['Entity']:
@@ -158,7 +194,7 @@ class Entity(BaseBlock):
             proficiency_bonus = ModifiableValue.create(source_entity_uuid=source_entity_uuid,base_value=config.proficiency_bonus)
             for modifier in config.proficiency_bonus_modifiers:
                 proficiency_bonus.self_static.add_value_modifier(NumericalModifier.create(source_entity_uuid=source_entity_uuid,name=modifier[0],value=modifier[1]))
-            return cls(
+            return cls.construct_trusted(
                 uuid=source_entity_uuid,
                 source_entity_uuid=source_entity_uuid,
                 name=name,
@@ -185,14 +221,15 @@ class Entity(BaseBlock):
         
         Entity.update_entity_position(self,new_position)
         if update_senses:
-            Entity.update_all_entities_senses()
+            Entity.update_senses_after_move(self)
         
     def get_target_entity(self,copy: bool = False) -> Optional['Entity']:
+        """ the target entity, with copy a fork of it (see BaseBlock.fork) that can be targeted and evaluated without changing the target """
         if self.target_entity_uuid is None:
             return None
         target_entity = Entity.get(self.target_entity_uuid)
         assert isinstance(target_entity, Entity)
-        return target_entity if not copy else target_entity.model_copy(deep=True)
+        return target_entity if not copy else target_entity.fork()
     
     def check_condition_immunity(self, condition_name: str) -> bool:
         #first check static immunities
@@ -261,36 +298,49 @@ class Entity(BaseBlock):
 
     
     
-    def _get_bonuses_for_skill(self, skill_name: SkillName) -> Tuple[ModifiableValue,ModifiableValue,ModifiableValue,ModifiableValue]:
+    def _normalized_proficiency_bonus(self, owner: Union[Skill, SavingThrow]) -> ModifiableValue:
+        """ fork of a copy of the proficiency bonus normalized by the proficiency converter of a skill or saving throw,
+        the copy is kept until the proficiency bonus, its target or the proficiency of the owner changes """
         proficiency_bonus = self.proficiency_bonus
+        version = proficiency_bonus._cache_version()
+        key = (owner.uuid, owner.proficiency, getattr(owner, "expertise", False))
+        state = (version, proficiency_bonus.target_entity_uuid)
+        cached = self._normalized_proficiency_bonuses.get(key)
+        if version is not None and cached is not None and cached[0] is proficiency_bonus and cached[1] == state:
+            return cached[2].fork()
+        normalized_proficiency_bonus = proficiency_bonus.model_copy(deep=True)
+        normalized_proficiency_bonus.update_normalizers(owner._get_proficiency_converter())
+        if version is None:
+            # contextual modifiers depend on the target and context, the copy is not reused
+            return normalized_proficiency_bonus
+        self._normalized_proficiency_bonuses[key] = (proficiency_bonus, state, normalized_proficiency_bonus)
+        return normalized_proficiency_bonus.fork()
+
+    def _get_bonuses_for_skill(self, skill_name: SkillName) -> Tuple[ModifiableValue,ModifiableValue,ModifiableValue,ModifiableValue]:
         skill = self.skill_set.get_skill(skill_name)
         skill_bonus = skill.skill_bonus
-        proficiency_bonus_multiplier_callable = skill._get_proficiency_converter()
         ability_name = skill.ability
         ability = self.ability_scores.get_ability(ability_name)
         ability_bonus = ability.ability_score
         ability_modifier_bonus = ability.modifier_bonus
-        normalized_proficiency_bonus = proficiency_bonus.model_copy(deep=True)
-        normalized_proficiency_bonus.update_normalizers(proficiency_bonus_multiplier_callable)
+        normalized_proficiency_bonus = self._normalized_proficiency_bonus(skill)
         return normalized_proficiency_bonus, skill_bonus, ability_bonus, ability_modifier_bonus
     
     def _get_bonuses_for_saving_throw(self, ability_name: AbilityName) -> Tuple[ModifiableValue,ModifiableValue,ModifiableValue,ModifiableValue]:
         saving_throw = self.saving_throws.get_saving_throw(ability_name)
         saving_throw_bonus = saving_throw.bonus
-        proficiency_bonus_multiplier_callable = saving_throw._get_proficiency_converter()
-        proficiency_bonus = self.proficiency_bonus
         ability_bonus = self.ability_scores.get_ability(ability_name).ability_score
         ability_modifier_bonus = self.ability_scores.get_ability(ability_name).modifier_bonus
 
-        normalized_proficiency_bonus = proficiency_bonus.model_copy(deep=True)
-        normalized_proficiency_bonus.update_normalizers(proficiency_bonus_multiplier_callable)
+        normalized_proficiency_bonus = self._normalized_proficiency_bonus(saving_throw)
         return normalized_proficiency_bonus, saving_throw_bonus, ability_bonus,ability_modifier_bonus
     
-    def _get_attack_bonuses(self,weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND) -> Tuple[ModifiableValue,ModifiableValue,List[ModifiableValue],List[ModifiableValue],Range ]:
+    def _get_attack_bonuses(self,weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND, target_entity_uuid: Optional[UUID] = None) -> Tuple[ModifiableValue,ModifiableValue,List[ModifiableValue],List[ModifiableValue],Range ]:
         """ We have to get from weapon and then from equipment 
         attack_bonus 
         ability bonuses
-        weapon attack bonus """
+        weapon attack bonus
+        with a target_entity_uuid the bonuses are forks targeting it, see _fork_bonuses """
         if weapon_slot == WeaponSlot.MAIN_HAND:
             weapon = self.equipment.weapon_main_hand
         elif weapon_slot == WeaponSlot.OFF_HAND:
@@ -301,6 +351,10 @@ class Entity(BaseBlock):
         dexterity_modifier_bonus = self.ability_scores.get_ability("dexterity").modifier_bonus
         strength_bonus = self.ability_scores.get_ability("strength").ability_score
         strength_modifier_bonus = self.ability_scores.get_ability("strength").modifier_bonus
+        if target_entity_uuid is not None:
+            # the finesse choice below compares the targeted scores
+            dexterity_bonus, dexterity_modifier_bonus, strength_bonus, strength_modifier_bonus = self._fork_bonuses(
+                (dexterity_bonus, dexterity_modifier_bonus, strength_bonus, strength_modifier_bonus), target_entity_uuid)
         attack_bonuses : List[ModifiableValue] = [self.equipment.attack_bonus]
         if weapon is None or isinstance(weapon, Shield):
             weapon_bonus=self.equipment.unarmed_attack_bonus
@@ -331,115 +385,109 @@ class Entity(BaseBlock):
                 ability_bonuses.append(strength_bonus)
                 ability_bonuses.append(strength_modifier_bonus)
         proficiency_bonus = self.proficiency_bonus
+        if target_entity_uuid is not None:
+            proficiency_bonus, weapon_bonus, *attack_bonuses = self._fork_bonuses((proficiency_bonus, weapon_bonus, *attack_bonuses), target_entity_uuid)
         
         return proficiency_bonus, weapon_bonus, attack_bonuses, ability_bonuses, range
       
     
 
     
-    def saving_throw_bonus(self, target_entity_uuid: Optional[UUID], ability_name: AbilityName) -> ModifiableValue:
-        should_clear_target = False
+    @staticmethod
+    def _fork_bonuses(bonuses: Tuple[ModifiableValue, ...], target_entity_uuid: UUID) -> Tuple[ModifiableValue, ...]:
+        """ forks of bonuses targeting an entity, evaluating them leaves the original values and their entity unchanged """
+        forked_bonuses = tuple(bonus.fork() for bonus in bonuses)
+        for bonus in forked_bonuses:
+            bonus.set_target_entity(target_entity_uuid)
+        return forked_bonuses
+
+    def _retarget(self, target_entity_uuid: Optional[UUID]) -> Optional[UUID]:
+        """ the target to evaluate forks of the bonuses against, None when the values already target it or no target is given """
         if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
-        target_entity = None
-        if self.target_entity_uuid:
-            target_entity = self.get_target_entity(copy=True)
-            assert isinstance(target_entity, Entity)
-            if target_entity.target_entity_uuid != self.uuid:
-                target_entity.set_target_entity(self.uuid)
-            saving_throw_bonuses_target = target_entity._get_bonuses_for_saving_throw(ability_name)
-
-        saving_throw_bonuses_source =self._get_bonuses_for_saving_throw(ability_name)
-        if target_entity is not None:
-            for mod_source,mod_target in zip(saving_throw_bonuses_source,saving_throw_bonuses_target):
-                mod_source.set_from_target(mod_target)    
-        total_bonus_source = saving_throw_bonuses_source[0].combine_values(list(saving_throw_bonuses_source)[1:]).model_copy(deep=True)
-        
-        if should_clear_target:
-            self.clear_target_entity()
+            return target_entity_uuid
+        return None
 
-        return total_bonus_source
+    @classmethod
+    def _fork_check_bonuses(cls, bonuses: Tuple[ModifiableValue, ...], target_entity_uuid: UUID) -> Tuple[ModifiableValue, ...]:
+        """ the bonuses of _get_bonuses_for_skill or _get_bonuses_for_saving_throw targeting an entity, the normalized
+        proficiency bonus is already a private copy and is targeted in place, the other bonuses are forked """
+        normalized_proficiency_bonus, *bonuses = bonuses
+        normalized_proficiency_bonus.set_target_entity(target_entity_uuid)
+        return (normalized_proficiency_bonus, *cls._fork_bonuses(tuple(bonuses), target_entity_uuid))
+
+    def _get_check_target(self, target_entity_uuid: Optional[UUID]) -> Optional['Entity']:
+        """ the entity a check is made against, the current target when none is given """
+        if target_entity_uuid is None:
+            target_entity_uuid = self.target_entity_uuid
+        if target_entity_uuid is None:
+            return None
+        target_entity = Entity.get(target_entity_uuid)
+        assert isinstance(target_entity, Entity)
+        return target_entity
 
-    def skill_bonus(self, target_entity_uuid: Optional[UUID], skill_name: SkillName) -> ModifiableValue:
-        should_clear_target = False
-        if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
-        
-        target_entity = None
-        if self.target_entity_uuid:
-            target_entity = self.get_target_entity(copy=True)
-            assert isinstance(target_entity, Entity)
-            if target_entity.target_entity_uuid != self.uuid:
-                target_entity.set_target_entity(self.uuid)
-            skill_bonuses_target = target_entity._get_bonuses_for_skill(skill_name)
+    def saving_throw_bonus(self, target_entity_uuid: Optional[UUID], ability_name: AbilityName) -> ModifiableValue:
+        """ the saving throw bonus against the target, the current one by default, the bonuses are evaluated on forks
+        and the entities are left unchanged """
+        saving_throw_bonuses_source = self._get_bonuses_for_saving_throw(ability_name)
+        target_entity = self._get_check_target(target_entity_uuid)
+        if target_entity is not None:
+            saving_throw_bonuses_source = self._fork_check_bonuses(saving_throw_bonuses_source, target_entity.uuid)
+            saving_throw_bonuses_target = self._fork_check_bonuses(target_entity._get_bonuses_for_saving_throw(ability_name), self.uuid)
+            for mod_source, mod_target in zip(saving_throw_bonuses_source, saving_throw_bonuses_target):
+                mod_source.set_from_target(mod_target)
+        return saving_throw_bonuses_source[0].combine_values(list(saving_throw_bonuses_source)[1:])
 
+    def skill_bonus(self, target_entity_uuid: Optional[UUID], skill_name: SkillName) -> ModifiableValue:
+        """ the skill bonus against the target, the current one by default, evaluated on forks like saving_throw_bonus """
         skill_bonuses_source = self._get_bonuses_for_skill(skill_name)
+        target_entity = self._get_check_target(target_entity_uuid)
         if target_entity is not None:
+            skill_bonuses_source = self._fork_check_bonuses(skill_bonuses_source, target_entity.uuid)
+            skill_bonuses_target = self._fork_check_bonuses(target_entity._get_bonuses_for_skill(skill_name), self.uuid)
             for mod_source, mod_target in zip(skill_bonuses_source, skill_bonuses_target):
                 mod_source.set_from_target(mod_target)
-        
-        total_bonus_source = skill_bonuses_source[0].combine_values(list(skill_bonuses_source)[1:]).model_copy(deep=True)
-        
-        if should_clear_target:
-            self.clear_target_entity()
-            if target_entity is not None:
-                target_entity.clear_target_entity() 
-            for mod_source, mod_target in zip(skill_bonuses_source, skill_bonuses_target):
-                mod_source.reset_from_target()
-                mod_target.reset_from_target()
-
-        return total_bonus_source
+        return skill_bonuses_source[0].combine_values(list(skill_bonuses_source)[1:])
 
     def skill_bonus_cross(self, target_entity_uuid: UUID, skill_name: SkillName) -> Tuple[ModifiableValue, ModifiableValue]:
-        should_clear_target = False
-        if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
-        
-        target_entity = self.get_target_entity(copy=True)
-        assert isinstance(target_entity, Entity)
-        if target_entity.target_entity_uuid != self.uuid:
-            target_entity.set_target_entity(self.uuid)
+        """ the skill bonuses of the entity and of the target, the current one by default, against each other,
+        evaluated on forks like saving_throw_bonus """
+        target_entity = self._get_check_target(target_entity_uuid)
+        assert target_entity is not None
 
-        skill_bonuses_source = self._get_bonuses_for_skill(skill_name)
-        skill_bonuses_target = target_entity._get_bonuses_for_skill(skill_name)
+        skill_bonuses_source = self._fork_check_bonuses(self._get_bonuses_for_skill(skill_name), target_entity.uuid)
+        skill_bonuses_target = self._fork_check_bonuses(target_entity._get_bonuses_for_skill(skill_name), self.uuid)
 
         for mod_source, mod_target in zip(skill_bonuses_source, skill_bonuses_target):
             mod_target.set_from_target(mod_source)
             mod_source.set_from_target(mod_target)
 
-        total_bonus_source = skill_bonuses_source[0].combine_values(list(skill_bonuses_source)[1:]).model_copy(deep=True)
-        total_bonus_target = skill_bonuses_target[0].combine_values(list(skill_bonuses_target)[1:]).model_copy(deep=True)
-
-        if should_clear_target:
-            self.clear_target_entity()
-            target_entity.clear_target_entity()
-        for mod_source, mod_target in zip(skill_bonuses_source, skill_bonuses_target):
-            mod_source.reset_from_target()
-            mod_target.reset_from_target()
-
+        total_bonus_source = skill_bonuses_source[0].combine_values(list(skill_bonuses_source)[1:])
+        total_bonus_target = skill_bonuses_target[0].combine_values(list(skill_bonuses_target)[1:])
         return total_bonus_source, total_bonus_target
     
     def ac_bonus(self, target_entity_uuid: Optional[UUID]=None) -> ModifiableValue:
-        """ missing effects from target attack bonus"""
-        should_clear_target = False
-        if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
+        """ missing effects from target attack bonus, against another target than the current one the values are evaluated on forks """
+        retarget = self._retarget(target_entity_uuid)
 
         if self.equipment.is_unarmored():
             unarmored_values = self.equipment.get_unarmored_ac_values()
             abilities = self.equipment.get_unarmored_abilities()
             ability_bonuses = [self.ability_scores.get_ability(ability).ability_score for ability in abilities]
             ability_modifier_bonuses = [self.ability_scores.get_ability(ability).modifier_bonus for ability in abilities]
-            ac_bonus = unarmored_values[0].combine_values(unarmored_values[1:]+ability_bonuses+ability_modifier_bonuses)
+            ac_values = unarmored_values + ability_bonuses + ability_modifier_bonuses
+            if retarget is not None:
+                ac_values = list(self._fork_bonuses(tuple(ac_values), retarget))
+            ac_bonus = ac_values[0].combine_values(ac_values[1:])
         else:
             armored_values = self.equipment.get_armored_ac_values()
             max_dexterity_bonus = self.equipment.get_armored_max_dex_bonus()
             dexterity_bonus = self.ability_scores.get_ability("dexterity").ability_score
             dexterity_modifier_bonus = self.ability_scores.get_ability("dexterity").modifier_bonus
+            if retarget is not None:
+                armored_values = list(self._fork_bonuses(tuple(armored_values), retarget))
+                dexterity_bonus, dexterity_modifier_bonus = self._fork_bonuses((dexterity_bonus, dexterity_modifier_bonus), retarget)
+                if max_dexterity_bonus is not None:
+                    max_dexterity_bonus, = self._fork_bonuses((max_dexterity_bonus,), retarget)
             combined_dexterity_bonus = dexterity_bonus.combine_values([dexterity_modifier_bonus])
             
             # Only cap dexterity if there's a max_dexterity_bonus
@@ -448,35 +496,27 @@ class Entity(BaseBlock):
             
             ac_bonus = armored_values[0].combine_values(armored_values[1:]+[combined_dexterity_bonus])
         
-        if should_clear_target:
-            self.clear_target_entity()
         return ac_bonus
     
     
     def attack_bonus(self, weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND, target_entity_uuid: Optional[UUID] = None) -> ModifiableValue:
-        """ missing effects from target armor bonus"""
-        should_clear_target = False
-        if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
-    
-        proficiency_bonus, weapon_bonus, attack_bonuses, ability_bonuses, range = self._get_attack_bonuses(weapon_slot)
+        """ missing effects from target armor bonus, against another target than the current one the values are evaluated on forks """
+        proficiency_bonus, weapon_bonus, attack_bonuses, ability_bonuses, range = self._get_attack_bonuses(weapon_slot, self._retarget(target_entity_uuid))
         bonuses = [weapon_bonus] + attack_bonuses + ability_bonuses
-        source_attack_bonus = proficiency_bonus.combine_values(bonuses)
-        
-        if should_clear_target:
-            self.clear_target_entity()
-        return source_attack_bonus
+        return proficiency_bonus.combine_values(bonuses)
     
 
     def get_damages(self, weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND, target_entity_uuid: Optional[UUID] = None) -> List[Damage]:
-        should_clear_target = False
-        if target_entity_uuid is not None and target_entity_uuid != self.target_entity_uuid:
-            self.set_target_entity(target_entity_uuid)
-            should_clear_target = True
+        """
+        The damages of an attack, against another target than the current one the damage bonuses are retargeted
+        forks, the choice between strength and dexterity of a finesse weapon is then made on the untargeted scores.
+        """
         damages = self.equipment.get_damages(weapon_slot, self.ability_scores)
-        if should_clear_target:
-            self.clear_target_entity()
+        retarget = self._retarget(target_entity_uuid)
+        if retarget is not None:
+            for damage in damages:
+                if damage.damage_bonus is not None:
+                    damage.damage_bonus, = self._fork_bonuses((damage.damage_bonus,), retarget)
         return damages
     
     def take_damage(self, damages: List[Damage], attack_outcome: AttackOutcome) -> List[DiceRoll]:
@@ -607,33 +647,26 @@ class Entity(BaseBlock):
 
 
     @staticmethod
-    def compute_senses_from_position(position: Tuple[int,int],seen: Set[Tuple[int,int]], max_distance: int = 10) -> Tuple[Dict[Tuple[int,int],bool],DefaultDict[Tuple[int,int],List[Tuple[int,int]]],Dict[Tuple[int,int],bool],Dict[UUID,Tuple[int,int]]]:
+    def compute_senses_from_position(position: Tuple[int,int],seen: Set[Tuple[int,int]], max_distance: int = 10) -> Tuple[Dict[Tuple[int,int],bool],PathMap,Dict[Tuple[int,int],bool],Dict[UUID,Tuple[int,int]]]:
          # Get visible cells using shadowcast
         visible_positions = Tile.get_fov(position, max_distance)
         visible_dict = {pos: True for pos in visible_positions}
         
-        # Get walkable paths using dijkstra
-        distances, paths = Tile.get_paths(position, max_distance)
+        # Get walkable paths using dijkstra, tracking which paths only go through seen positions
+        distances, paths = Tile.get_paths(position, max_distance, seen=seen)
         
         # Filter paths to only include those where:
         # 1. The destination is currently visible
         # 2. All positions in the path have been seen before
-        filtered_paths = defaultdict(list)
-        for pos, path in paths.items():
-            # Check if destination is visible and all path positions are in seen
-            if pos in visible_dict and all(step in seen for step in path):
-                filtered_paths[pos] = path
+        filtered_paths = paths.restrict(pos for pos in paths.fully_seen if pos in visible_dict)
         
-        # Get entities at visible positions
-        visible_entities = {}
-        for pos in visible_positions:
-            entities = Entity.get_all_entities_at_position(pos)
-            for entity in entities:
-                    visible_entities[entity.uuid] = pos
+        # Get entities at visible positions, every visible position is within max_distance
+        candidates = Entity._spatial_index.query_radius(position, max_distance) if max_distance is not None else Entity.get_all_entities()
+        visible_entities = {entity.uuid: entity.position for entity in candidates if entity.position in visible_positions}
         return visible_dict, filtered_paths, {pos: Tile.is_walkable(pos) for pos in visible_positions}, visible_entities
     
     def create_senses_copy_at_position(self, position: Tuple[int,int], max_distance: int = 10) -> 'Senses':
-        senses = self.senses.model_copy(deep=True)
+        senses = self.senses.fork()
         senses.position = position
         visible_dict, filtered_paths, walkable, visible_entities = Entity.compute_senses_from_position(position, self.senses.seen, max_distance)
         
@@ -680,6 +713,8 @@ class Entity(BaseBlock):
         #         if entity.uuid != self.uuid:  # Don't include self
         #             visible_entities[entity.uuid] = pos
         
+        # the paths only go through positions seen before this update
+        seen_size = len(self.senses.seen)
         visible_dict, filtered_paths, walkable, visible_entities = Entity.compute_senses_from_position(self.position, self.senses.seen, max_distance)
         # Update the senses block
         self.senses.update_senses(
@@ -688,9 +723,35 @@ class Entity(BaseBlock):
             walkable=walkable,
             paths=filtered_paths
         )
+        self.senses.mark_computed(seen_size, max_distance, Tile.get_grid().revision)
+        self.update_threat()
 
     @classmethod
     def update_all_entities_senses(cls, max_distance: int = 10):
-        """ Update the senses for all entities """
-        for entity in cls.get_all_entities():
+        """ Update the senses for all entities, the fields of view missing from the cache are shadowcast in one batch """
+        entities = cls.get_all_entities()
+        Tile.get_fov_many([entity.position for entity in entities], max_distance)
+        for entity in entities:
             entity.update_entity_senses(max_distance)
+
+    @classmethod
+    def update_senses_after_move(cls, mover: 'Entity', max_distance: int = 10):
+        """
+        Update the senses of all entities after a single entity moved, giving the same result as
+        update_all_entities_senses without recomputing every field of view.
+
+        Entities do not block sight nor movement, so a move only changes the visible positions and paths of the mover.
+        The other entities only patch the position of the mover in their visible entities, unless their senses are
+        outdated (never computed, computed with another max distance, their seen set grew or the tiles changed since),
+        in which case they are fully recomputed.
+
+        Args:
+            mover: The entity that moved, its registry position must already be updated
+            max_distance: Maximum view/movement distance (default 10)
+        """
+        grid_revision = Tile.get_grid().revision
+        for entity in cls.get_all_entities():
+            if entity is mover or entity.senses.is_outdated(max_distance, grid_revision):
+                entity.update_entity_senses(max_distance)
+            else:
+                entity.senses.update_entity_position(mover.uuid, mover.position)
@@ -1,16 +1,18 @@
-from dnd.core.events import EventHandler, Trigger, EventType, EventPhase, WeaponSlot
+from dnd.core.events import Event, EventHandler, EventQueue, Trigger, EventType, EventPhase, WeaponSlot
 from dnd.actions import AttackEvent, MovementEvent, Attack, entity_action_economy_cost_evaluator
 from dnd.core.base_actions import Cost
 from dnd.entity import Entity
 from uuid import UUID
-from typing import Optional
+from typing import Optional, Set
+
+OPPORTUNITY_ATTACK_GROUP = "opportunity_attack"
 
 
 def opportunity_attack_processor(event: MovementEvent, source_entity_uuid: UUID) -> Optional[MovementEvent]:
     """checks if movement event is an opportunity attack, source entity uuid is the entity that 
     added this trigger to the event q, the event.source_entity_uuid is the entity that is moving
     
-    this is a quite greed approach since any movement will trigger this check"""
+    the handlers are only called for the entities selected by opportunity_attack_selector"""
     #first we get the source entity
     reaction_source_entity = Entity.get(source_entity_uuid)
     event_source_entity = Entity.get(event.source_entity_uuid)
@@ -19,7 +21,7 @@ def opportunity_attack_processor(event: MovementEvent, source_entity_uuid: UUID)
     
     if reaction_source_entity.uuid == event_source_entity.uuid:
         return event
-    threathened_positions = reaction_source_entity.senses.get_threathened_positions()
+    threathened_positions = Entity.get_threat_map().get_threatened_positions(source_entity_uuid)
 
 
     if event.path and event.start_position in threathened_positions and any(position not in threathened_positions for position in event.path) and len(event.costs)>0:
@@ -41,13 +43,46 @@ def opportunity_attack_processor(event: MovementEvent, source_entity_uuid: UUID)
     return event
 
 
+def opportunity_attack_selector(event: Event) -> Set[UUID]:
+    """the entities threatening the start of a movement that the path leaves the threat of, found in the threat map
+    in O(path length), the opportunity attack handlers of every other entity are skipped without being called"""
+    if not isinstance(event, MovementEvent):
+        return set()
+    return Entity.get_threat_map().leaving_threat(event.start_position, event.path)
+
+EventQueue.register_handler_selector(OPPORTUNITY_ATTACK_GROUP, opportunity_attack_selector)
+
+
+def threat_update_processor(event: Event, source_entity_uuid: UUID) -> Optional[Event]:
+    """refresh the threatened positions of the entity after its main hand weapon changed, the reach may be different"""
+    entity = Entity.get(source_entity_uuid)
+    if entity is not None:
+        entity.update_threat()
+    return event
+
+
 def create_opputinity_attack_handler(source_entity_uuid: UUID) -> EventHandler:
     return EventHandler(name="Opportunity Attack Handler",
                         trigger_conditions=[Trigger(name="Opportunity Attack Trigger",
                                      event_type=EventType.MOVEMENT,
                                      event_phase=EventPhase.EFFECT)],
                         event_processor=opportunity_attack_processor,
+                        selector_group=OPPORTUNITY_ATTACK_GROUP,
+                        source_entity_uuid=source_entity_uuid)
+
+def create_threat_update_handler(source_entity_uuid: UUID) -> EventHandler:
+    return EventHandler(name="Threat Update Handler",
+                        trigger_conditions=[Trigger(name="Weapon Equip Trigger",
+                                     event_type=EventType.WEAPON_EQUIP,
+                                     event_phase=EventPhase.EFFECT,
+                                     event_source_entity_uuid=source_entity_uuid),
+                                            Trigger(name="Weapon Unequip Trigger",
+                                     event_type=EventType.WEAPON_UNEQUIP,
+                                     event_phase=EventPhase.EFFECT,
+                                     event_source_entity_uuid=source_entity_uuid)],
+                        event_processor=threat_update_processor,
                         source_entity_uuid=source_entity_uuid)
 
 def add_opportunity_attack_handler(entity: Entity):
     entity.add_event_handler(create_opputinity_attack_handler(entity.uuid))
+    entity.add_event_handler(create_threat_update_handler(entity.uuid))
@@ -0,0 +1,228 @@
+""" Monte-Carlo simulation of encounters.
+
+An encounter factory fills the current world with the tiles and the creatures of an encounter and returns the
+creatures grouped by side. Every trial builds the encounter in its own World seeded from the simulation seed, plays
+it until a single side is standing and records the winner, the number of rounds and the damage dealt by each side.
+Trials run in a ProcessPoolExecutor, the trial seeds only depend on the simulation seed and on the trial index, so
+the results do not depend on the number of workers.
+
+The dice streams of a world are keyed by entity uuid (see dnd.core.rng), a factory creating its entities with fixed
+uuids gives reproducible trials.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat, zip_longest
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from pydantic import BaseModel, Field, computed_field
+
+from dnd.actions import Attack, Move
+from dnd.core.base_tiles import Tile, floor_factory
+from dnd.core.events import WeaponSlot
+from dnd.core.world import World
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+
+EncounterFactory = Callable[[], Sequence[Sequence[Entity]]]
+
+
+class TrialResult(BaseModel):
+    """
+    Result of a single trial.
+
+    Attributes:
+        seed (int): The seed of the world of the trial.
+        winner (Optional[int]): The index of the last side standing, None when the trial hit the round limit.
+        rounds (int): The number of rounds played.
+        damage (List[int]): The damage dealt by every side.
+    """
+    seed: int = Field(description="The seed of the world of the trial")
+    winner: Optional[int] = Field(default=None, description="The index of the last side standing, None when the trial hit the round limit")
+    rounds: int = Field(description="The number of rounds played")
+    damage: List[int] = Field(description="The damage dealt by every side")
+
+
+class SimulationResult(BaseModel):
+    """
+    Aggregated results of the trials of a simulation.
+
+    Attributes:
+        seed (int): The seed of the simulation.
+        trials (int): The number of trials.
+        wins (List[int]): The number of trials won by every side.
+        draws (int): The number of trials that hit the round limit.
+        rounds (Dict[int, int]): The number of trials per number of rounds played.
+        damage (List[Dict[int, int]]): For every side, the number of trials per total damage dealt.
+    """
+    seed: int = Field(description="The seed of the simulation")
+    trials: int = Field(description="The number of trials")
+    wins: List[int] = Field(description="The number of trials won by every side")
+    draws: int = Field(description="The number of trials that hit the round limit")
+    rounds: Dict[int, int] = Field(description="The number of trials per number of rounds played")
+    damage: List[Dict[int, int]] = Field(description="For every side, the number of trials per total damage dealt")
+
+    @computed_field
+    @property
+    def win_rates(self) -> List[float]:
+        return [wins / self.trials for wins in self.wins] if self.trials else []
+
+    @computed_field
+    @property
+    def mean_rounds(self) -> float:
+        return sum(rounds * count for rounds, count in self.rounds.items()) / self.trials if self.trials else 0.0
+
+    @computed_field
+    @property
+    def mean_damage(self) -> List[float]:
+        return [sum(damage * count for damage, count in histogram.items()) / self.trials if self.trials else 0.0
+                for histogram in self.damage]
+
+    @classmethod
+    def from_trials(cls, seed: int, trials: Sequence[TrialResult]) -> 'SimulationResult':
+        sides = max((len(trial.damage) for trial in trials), default=0)
+        wins = [0] * sides
+        draws = 0
+        rounds: Dict[int, int] = {}
+        damage: List[Dict[int, int]] = [{} for _ in range(sides)]
+        for trial in trials:
+            if trial.winner is None:
+                draws += 1
+            else:
+                wins[trial.winner] += 1
+            rounds[trial.rounds] = rounds.get(trial.rounds, 0) + 1
+            for side, dealt in enumerate(trial.damage):
+                damage[side][dealt] = damage[side].get(dealt, 0) + 1
+        return cls(seed=seed, trials=len(trials), wins=wins, draws=draws, rounds=dict(sorted(rounds.items())),
+                   damage=[dict(sorted(histogram.items())) for histogram in damage])
+
+
+def is_standing(entity: Entity) -> bool:
+    return entity.get_hp() > 0
+
+
+def _approach(entity: Entity, target: Entity) -> None:
+    """ move the entity to the closest free walkable position next to the target """
+    occupied = {other.position for other in Entity.get_all_entities() if other is not entity}
+    tx, ty = target.position
+    x, y = entity.position
+    candidates = sorted(((tx + dx, ty + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                         if (dx or dy) and (tx + dx, ty + dy) not in occupied and Tile.is_walkable((tx + dx, ty + dy))),
+                        key=lambda position: max(abs(position[0] - x), abs(position[1] - y)))
+    for position in candidates:
+        move = Move(source_entity_uuid=entity.uuid, target_entity_uuid=entity.uuid, end_position=position, use_pathfinding=True)
+        if move.path and move.apply() is not None:
+            return
+
+
+def take_turn(entity: Entity, target: Entity, weapon_slot: WeaponSlot = WeaponSlot.MAIN_HAND) -> None:
+    """ attack the target, moving next to it first when it is not in reach or not in sight """
+    entity.action_economy.reset_all_costs()
+    event = Attack(source_entity_uuid=entity.uuid, target_entity_uuid=target.uuid, weapon_slot=weapon_slot).apply()
+    if event is None or event.canceled:
+        _approach(entity, target)
+        Attack(source_entity_uuid=entity.uuid, target_entity_uuid=target.uuid, weapon_slot=weapon_slot).apply()
+
+
+def play_encounter(sides: Sequence[Sequence[Entity]], max_rounds: int = 20) -> Tuple[Optional[int], int, List[int]]:
+    """
+    Play an encounter in the current world until a single side is standing.
+
+    Every round the creatures act alternating between the sides, each one attacks the closest standing enemy.
+
+    Args:
+        sides: The creatures of every side
+        max_rounds: The number of rounds after which the encounter is a draw
+
+    Returns:
+        The index of the winning side or None for a draw, the number of rounds played and the damage dealt by every side
+    """
+    side_of = {entity.uuid: index for index, side in enumerate(sides) for entity in side}
+    turn_order = [entity for turn in zip_longest(*sides) for entity in turn if entity is not None]
+    damage = [0] * len(sides)
+    for round_number in range(1, max_rounds + 1):
+        for entity in turn_order:
+            if not is_standing(entity):
+                continue
+            enemies = [other for other in turn_order if side_of[other.uuid] != side_of[entity.uuid] and is_standing(other)]
+            if not enemies:
+                break
+            x, y = entity.position
+            target = min(enemies, key=lambda other: (other.position[0] - x) ** 2 + (other.position[1] - y) ** 2)
+            hit_points = target.get_hp()
+            take_turn(entity, target)
+            damage[side_of[entity.uuid]] += hit_points - target.get_hp()
+        standing = {side_of[entity.uuid] for entity in turn_order if is_standing(entity)}
+        if len(standing) <= 1:
+            return (standing.pop() if standing else None), round_number, damage
+    return None, max_rounds, damage
+
+
+def run_trial(factory: EncounterFactory, seed: int, max_rounds: int = 20) -> TrialResult:
+    """ build the encounter in a new world with the given seed, play it and dispose the world """
+    world = World(name=f"trial {seed}", seed=seed)
+    try:
+        with world.activate():
+            winner, rounds, damage = play_encounter(factory(), max_rounds)
+    finally:
+        world.dispose()
+    return TrialResult(seed=seed, winner=winner, rounds=rounds, damage=damage)
+
+
+def _run_trials(factory: EncounterFactory, seeds: Sequence[int], max_rounds: int) -> List[TrialResult]:
+    return [run_trial(factory, seed, max_rounds) for seed in seeds]
+
+
+def trial_seeds(seed: int, trials: int) -> List[int]:
+    """ independent seeds of the trials of a simulation, they fit in 53 bits like the random world seeds """
+    return [int(state >> 11) for state in np.random.SeedSequence(seed).generate_state(trials, dtype=np.uint64)]
+
+
+def run_simulation(
+    factory: EncounterFactory,
+    trials: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    max_rounds: int = 20,
+    chunk_size: Optional[int] = None
+) -> SimulationResult:
+    """
+    Run the trials of an encounter and aggregate their results.
+
+    Args:
+        factory: Fills the current world with the encounter and returns the creatures of every side, it must be
+            picklable (a module level function) to run in worker processes
+        trials: The number of trials
+        seed: The seed of the simulation, the seed of every trial is derived from it
+        workers: The number of worker processes, None for one per CPU and 1 to run in this process
+        max_rounds: The number of rounds after which a trial is a draw
+        chunk_size: The number of trials sent to a worker at once, by default four chunks per worker
+
+    Returns:
+        The SimulationResult of the trials
+    """
+    seeds = trial_seeds(seed, trials)
+    if workers == 1 or trials <= 1 or (workers is None and os.cpu_count() == 1):
+        return SimulationResult.from_trials(seed, _run_trials(factory, seeds, max_rounds))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-trials // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = [seeds[start:start + chunk_size] for start in range(0, trials, chunk_size)]
+        results = [trial for chunk in executor.map(_run_trials, repeat(factory), chunks, repeat(max_rounds)) for trial in chunk]
+    return SimulationResult.from_trials(seed, results)
+
+
+def duel_encounter() -> List[List[Entity]]:
+    """ two circus warriors a few steps apart in an open room, with fixed uuids """
+    for x in range(8):
+        for y in range(8):
+            floor_factory((x, y))
+    first = create_warrior(source_id=UUID(int=1), proficiency_bonus=2, name="Spiky Clown", position=(1, 1))
+    second = create_warrior(source_id=UUID(int=2), proficiency_bonus=3, name="Pirate", position=(4, 4))
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+    return [[first], [second]]
@@ -0,0 +1,244 @@
+""" Entity templates for spawning many copies of a creature.
+
+A template builds its prototype once, calling a factory such as create_warrior in a scratch World so that the
+prototype never shows up in the registries of the game worlds, and pickles it. Spawning unpickles a copy, which
+restores the pydantic objects without running their validators: every object owning a uuid (blocks, values,
+modifiers, conditions, event handlers) gets a fresh one and every reference to these uuids is remapped, through
+persistent ids, while the functions are shared with the prototype. The copies are then registered in the current
+world exactly where the prototype objects were registered in the scratch world, and the event handlers are added to
+its EventQueue.
+
+The events logged while building the prototype, e.g. the application of its conditions, are not replayed.
+"""
+
+import gc
+import io
+import pickle
+from enum import Enum
+from functools import partial
+from types import BuiltinFunctionType, FunctionType, MethodType
+from contextlib import contextmanager
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+
+from dnd.core.base_block import BaseBlock
+from dnd.core.base_object import BaseObject
+from dnd.core.events import EventHandler, EventQueue
+from dnd.core.world import World
+from dnd.entity import Entity
+
+EntityFactory = Callable[..., Entity]
+
+# leaves not traversed when collecting the objects of a prototype
+_LEAF_TYPES = (str, int, float, bool, bytes, type(None), Enum, type, FunctionType, BuiltinFunctionType)
+
+# persistent id kinds of the template pickles
+_OWNED_UUID = 0
+_SHARED_FUNCTION = 1
+
+
+class _TemplatePickler(pickle.Pickler):
+    """ pickles a prototype, its owned uuids and its functions (often lambdas, which cannot be pickled) become persistent ids """
+
+    def __init__(self, file: io.BytesIO, owned_uuids: Dict[UUID, int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.owned_uuids = owned_uuids
+        self.functions: List[Callable[..., Any]] = []
+        self._function_ids: Dict[int, int] = {}
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[int, int]]:
+        if isinstance(obj, UUID):
+            index = self.owned_uuids.get(obj)
+            return (_OWNED_UUID, index) if index is not None else None
+        if isinstance(obj, FunctionType):
+            index = self._function_ids.get(id(obj))
+            if index is None:
+                index = self._function_ids[id(obj)] = len(self.functions)
+                self.functions.append(obj)
+            return (_SHARED_FUNCTION, index)
+        return None
+
+
+class _TemplateUnpickler(pickle.Unpickler):
+    """ loads a copy of a prototype with fresh uuids in place of its owned uuids """
+
+    def __init__(self, data: bytes, uuids: List[UUID], functions: List[Callable[..., Any]]):
+        super().__init__(io.BytesIO(data))
+        self.uuids = uuids
+        self.functions = functions
+
+    def persistent_load(self, pid: Tuple[int, int]) -> Any:
+        kind, index = pid
+        return self.uuids[index] if kind == _OWNED_UUID else self.functions[index]
+
+
+def _owned_objects(root: BaseModel) -> List[BaseModel]:
+    """ every pydantic object reachable from the root, each once """
+    objects: List[BaseModel] = []
+    visited = set()
+    stack: List[Any] = [root]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, _LEAF_TYPES) or isinstance(obj, UUID) or id(obj) in visited:
+            continue
+        visited.add(id(obj))
+        if isinstance(obj, BaseModel):
+            objects.append(obj)
+            stack.extend(reversed(obj.__dict__.values()))
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, partial):
+            stack.extend(obj.args)
+            stack.extend(obj.keywords.values())
+        elif isinstance(obj, MethodType):
+            stack.append(obj.__self__)
+    return objects
+
+
+class EntityTemplate:
+    """
+    A compiled prototype entity stamped out into new entities.
+
+    Attributes:
+        name (str): The name of the template.
+        prototype (Entity): The entity built by the factory, registered in no world.
+
+    Class Attributes:
+        _templates (Dict[str, EntityTemplate]): The registered templates by name.
+
+    Methods:
+        compile(cls, name, factory, **factory_kwargs) -> EntityTemplate:
+            Build the prototype with the factory in a scratch world.
+        register(cls, name, factory, **factory_kwargs) -> EntityTemplate:
+            Compile a template and register it under its name.
+        get(cls, name) -> Optional[EntityTemplate]:
+            Retrieve a registered template.
+        spawn(self, uuid, name, position) -> Entity:
+            Create a new entity of the current world from the prototype.
+        spawn_many(self, positions, name) -> List[Entity]:
+            Create a new entity per position.
+    """
+
+    _templates: ClassVar[Dict[str, 'EntityTemplate']] = {}
+
+    def __init__(self, name: str, prototype: Entity, registered: Dict[type, List[BaseModel]], event_handlers: List[EventHandler]):
+        self.name = name
+        self.prototype = prototype
+        owned_uuids = {}
+        for obj in _owned_objects(prototype):
+            owned_uuid = obj.__dict__.get("uuid")
+            if isinstance(owned_uuid, UUID) and owned_uuid not in owned_uuids:
+                owned_uuids[owned_uuid] = len(owned_uuids)
+        self._uuid_count = len(owned_uuids)
+        self._entity_index = owned_uuids[prototype.uuid]
+        # the registered objects and the event handlers are pickled with the prototype so the loaded lists hold their copies
+        buffer = io.BytesIO()
+        pickler = _TemplatePickler(buffer, owned_uuids)
+        pickler.dump((prototype, registered, event_handlers))
+        self._data = buffer.getvalue()
+        self._functions = pickler.functions
+
+    def __repr__(self) -> str:
+        return f"EntityTemplate(name={self.name!r}, uuids={self._uuid_count}, size={len(self._data)})"
+
+    @classmethod
+    def compile(cls, name: str, factory: EntityFactory, /, **factory_kwargs: Any) -> 'EntityTemplate':
+        """
+        Build the prototype of a template.
+
+        Args:
+            name: The name of the template
+            factory: Creates the entity in the current world, e.g. create_warrior
+            **factory_kwargs: The arguments of the factory, they are the same for every spawned entity
+
+        Returns:
+            The compiled EntityTemplate
+        """
+        scratch = World(name=f"template {name}", seed=0)
+        try:
+            with scratch.activate():
+                prototype = factory(**factory_kwargs)
+                registered: Dict[type, List[BaseModel]] = {}
+                for obj in _owned_objects(prototype):
+                    owner = _registry_owner(obj)
+                    if owner is not None and owner._registry.get(obj.__dict__["uuid"]) is obj:
+                        registered.setdefault(owner, []).append(obj)
+                event_handlers = [handler for handler in EventQueue._event_handlers.values()
+                                  if handler.source_entity_uuid == prototype.uuid]
+        finally:
+            scratch.dispose()
+        return cls(name, prototype, registered, event_handlers)
+
+    @classmethod
+    def register(cls, name: str, factory: EntityFactory, /, **factory_kwargs: Any) -> 'EntityTemplate':
+        template = cls._templates[name] = cls.compile(name, factory, **factory_kwargs)
+        return template
+
+    @classmethod
+    def get(cls, name: str) -> Optional['EntityTemplate']:
+        return cls._templates.get(name)
+
+    def spawn(self, uuid: Optional[UUID] = None, name: Optional[str] = None, position: Tuple[int, int] = (0, 0)) -> Entity:
+        """
+        Create a new entity of the current world from the prototype.
+
+        Args:
+            uuid: The uuid of the new entity, a random one by default
+            name: The name of the new entity, the name of the prototype by default
+            position: The position of the new entity
+
+        Returns:
+            The new Entity, registered in the current world with its blocks, values, modifiers and event handlers
+        """
+        with _gc_paused():
+            uuids = [uuid4() for _ in range(self._uuid_count)]
+            if uuid is not None:
+                uuids[self._entity_index] = uuid
+            entity, registered, event_handlers = _TemplateUnpickler(self._data, uuids, self._functions).load()
+            if name is not None:
+                entity.name = name
+            entity._set_position(position)
+            for owner, objects in registered.items():
+                registry = owner._registry
+                for obj in objects:
+                    registry[obj.uuid] = obj
+            Entity.register_entity(entity)
+            Entity._spatial_index.add(entity.uuid, entity, entity.position)
+            for handler in event_handlers:
+                EventQueue.add_event_handler(handler)
+        return entity
+
+    def spawn_many(self, positions: List[Tuple[int, int]], name: Optional[str] = None) -> List[Entity]:
+        """ create a new entity of the current world per position, named after the prototype and its index by default """
+        with _gc_paused():
+            return [self.spawn(name=name if name is not None else f"{self.prototype.name} {index}", position=position)
+                    for index, position in enumerate(positions)]
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """ pause the cyclic garbage collector, a spawn allocates thousands of long lived containers that would
+    trigger collections scanning the whole, growing heap """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _registry_owner(obj: Any) -> Optional[type]:
+    """ the class declaring the world scoped registry the constructor of the object registers it in, None for unregistered types """
+    if not isinstance(obj, (BaseBlock, BaseObject)):
+        return None
+    for cls in type(obj).__mro__:
+        if "_registry" in cls.__dict__:
+            return cls
+    return None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Property check and benchmark for the A* point to point search.
+
+On random maps, the path returned by astar must have the same number of steps and of diagonal moves as the path to
+the same goal in the full distance field of the start, which holds the optimal paths. Then, on a large map, a single
+A* search to goals at growing distance is timed against flooding the whole map. Finally a Move with pathfinding to a
+walled in destination is timed, the search is bounded by the movement of the creature instead of flooding the map.
+
+Usage:
+    python examples/benchmark_astar.py --cases 300 --size 256 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.actions import Move
+from dnd.core.astar import astar
+from dnd.core.base_tiles import floor_factory, wall_factory
+from dnd.core.distance_field import compute_distance_field
+from dnd.core.world import World
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def random_map(rng: random.Random, width: int, height: int, wall_ratio: float) -> List[List[bool]]:
+    """Random walkable rows, indexed [y][x]"""
+    return [[rng.random() >= wall_ratio for _ in range(width)] for _ in range(height)]
+
+
+def path_cost(path: List[Tuple[int, int]]) -> Tuple[int, int]:
+    """Number of steps and of diagonal moves of a path"""
+    diagonals = sum(1 for a, b in zip(path, path[1:]) if a[0] != b[0] and a[1] != b[1])
+    return len(path) - 1, diagonals
+
+
+def check_optimality(cases: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for case in range(cases):
+        width, height = rng.randint(1, 40), rng.randint(1, 40)
+        rows = random_map(rng, width, height, rng.choice([0.0, 0.2, 0.35]))
+        start = (rng.randrange(width), rng.randrange(height))
+        goal = (rng.randrange(width), rng.randrange(height))
+        max_distance = rng.choice([None, 5, 10, 20.5])
+        field = compute_distance_field(start, rows, width, height, max_distance=max_distance)
+        path = astar(start, goal, lambda x, y: rows[y][x], width, height, max_distance=max_distance)
+        expected = field.path(goal)
+        if bool(path) != bool(expected):
+            raise AssertionError(f"Case {case}: reachability differs for {start} -> {goal}")
+        if path and path_cost(path) != path_cost(expected):
+            raise AssertionError(f"Case {case}: path cost {path_cost(path)} instead of {path_cost(expected)}")
+        if path and any(max(abs(a[0] - b[0]), abs(a[1] - b[1])) != 1 or not rows[b[1]][b[0]] for a, b in zip(path, path[1:])):
+            raise AssertionError(f"Case {case}: invalid step in path")
+    print(f"{cases} random cases: A* paths are optimal")
+
+
+def time_walled_in_move(size: int, repeat: int) -> None:
+    """Time the setup of a Move with pathfinding to a destination enclosed by walls on an open map"""
+    world = World(name="walled in move")
+    with world.activate():
+        goal = (size - 10, size - 10)
+        for x in range(size):
+            for y in range(size):
+                if max(abs(x - goal[0]), abs(y - goal[1])) == 1:
+                    wall_factory((x, y))
+                else:
+                    floor_factory((x, y))
+        mover = create_warrior(source_id=uuid4(), position=(2, 2))
+        for end_position, label in ((goal, "walled in"), ((8, 8), "reachable")):
+            begin = time.perf_counter()
+            for _ in range(repeat):
+                move = Move(source_entity_uuid=mover.uuid, target_entity_uuid=mover.uuid, end_position=end_position, use_pathfinding=True)
+            elapsed = (time.perf_counter() - begin) / repeat
+            print(f"Move to a {label} destination on the {size}x{size} map: {elapsed * 1e3:.2f} ms, path of {len(move.path)} positions")
+        if move.apply().canceled or mover.position != (8, 8):
+            raise AssertionError("the move to the reachable destination did not complete")
+    world.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the A* point to point search")
+    parser.add_argument("--cases", type=int, default=300, help="Random maps checked against the distance field")
+    parser.add_argument("--size", type=int, default=256, help="Side of the benchmark map")
+    parser.add_argument("--repeat", type=int, default=5, help="Searches per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--move-size", type=int, default=150, help="Side of the map of the Move benchmark")
+    args = parser.parse_args()
+
+    check_optimality(args.cases, args.seed)
+
+    rng = random.Random(args.seed)
+    size = args.size
+    rows = random_map(rng, size, size, 0.2)
+    start = (2, 2)
+    rows[2][2] = True
+
+    def is_walkable(x: int, y: int) -> bool:
+        return rows[y][x]
+
+    begin = time.perf_counter()
+    for _ in range(args.repeat):
+        field = compute_distance_field(start, rows, size, size)
+    flood_time = (time.perf_counter() - begin) / args.repeat
+    print(f"flood of the {size}x{size} map: {flood_time * 1e3:.1f} ms, {len(field)} positions reached")
+
+    print(f"{'distance':>8} {'steps':>6} {'A* ms':>8} {'speedup':>8}")
+    for distance in sorted({d for d in (10, 30, 60, 120, size - 5) if 0 < d < size - 2}):
+        # a reachable goal on the row distance + 2, as far right as possible
+        goal = next(((x, distance + 2) for x in range(distance + 2, -1, -1) if field.distance((x, distance + 2)) is not None), None)
+        if goal is None:
+            continue
+        begin = time.perf_counter()
+        for _ in range(args.repeat):
+            path = astar(start, goal, is_walkable, size, size)
+        astar_time = (time.perf_counter() - begin) / args.repeat
+        print(f"{distance:>8} {len(path) - 1:>6} {astar_time * 1e3:>8.2f} {flood_time / astar_time:>7.1f}x")
+
+    time_walled_in_move(args.move_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the construction of blocks and entities.
+
+Builds blocks from the same members through the validated constructor and through BaseBlock.construct_trusted,
+checks that both paths populate the same values and blocks with the source of the block, then times them and the
+creation of whole entities.
+
+Usage:
+    python examples/benchmark_block_construction.py --repeats 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from uuid import UUID, uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.blocks.abilities import Ability, AbilityConfig, AbilityScores, AbilityScoresConfig
+from dnd.core.base_block import BaseBlock
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def timed(label: str, function, repeats: int) -> None:
+    function()
+    begin = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    print(f"{label:<36} {(time.perf_counter() - begin) / repeats * 1e6:10.1f} us")
+
+
+def source_mismatches(block: BaseBlock, source_entity_uuid: UUID) -> int:
+    """ the values, value components and sub-blocks below the block with another source """
+    mismatches = 0
+    for value in block.values.values():
+        components = [value, value.self_static, value.to_target_static, value.self_contextual, value.to_target_contextual]
+        mismatches += sum(component.source_entity_uuid != source_entity_uuid for component in components)
+    for sub_block in block.blocks.values():
+        mismatches += (sub_block.source_entity_uuid != source_entity_uuid) + source_mismatches(sub_block, source_entity_uuid)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validated and trusted block construction")
+    parser.add_argument("--repeats", type=int, default=50, help="Repetitions of every measurement")
+    args = parser.parse_args()
+
+    source = uuid4()
+    config = AbilityScoresConfig(**{name: AbilityConfig(ability_score=12) for name in
+                                    ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")})
+    members = {name: getattr(AbilityScores.create(source_entity_uuid=source, config=config), name) for name in AbilityScoresConfig.model_fields}
+    validated = AbilityScores(source_entity_uuid=source, name="ability_scores", **members)
+    trusted = AbilityScores.construct_trusted(source_entity_uuid=source, name="ability_scores", **members)
+    if set(validated.blocks) != set(trusted.blocks) or set(validated.values) != set(trusted.values):
+        raise AssertionError("the trusted construction populated other blocks or values")
+    if validated.model_dump(exclude={"uuid"}) != trusted.model_dump(exclude={"uuid"}):
+        raise AssertionError("the trusted construction built another block")
+    entity = Entity.create(source_entity_uuid=uuid4())
+    for block in (trusted, entity, create_warrior(source_id=uuid4())):
+        if source_mismatches(block, block.source_entity_uuid):
+            raise AssertionError(f"{block.name} has members with another source")
+    print("validated and trusted blocks match, every member has the source of its block")
+
+    ability = members["strength"]
+    ability_members = {"ability_score": ability.ability_score, "modifier_bonus": ability.modifier_bonus}
+    timed("Ability validated", lambda: Ability(source_entity_uuid=source, **ability_members), args.repeats)
+    timed("Ability trusted", lambda: Ability.construct_trusted(source_entity_uuid=source, **ability_members), args.repeats)
+    timed("AbilityScores validated", lambda: AbilityScores(source_entity_uuid=source, **members), args.repeats)
+    timed("AbilityScores trusted", lambda: AbilityScores.construct_trusted(source_entity_uuid=source, **members), args.repeats)
+    timed("AbilityScores.create with config", lambda: AbilityScores.create(source_entity_uuid=source, config=config), args.repeats)
+    timed("Entity.create without config", lambda: Entity.create(source_entity_uuid=uuid4()), args.repeats)
+    timed("create_warrior", lambda: create_warrior(source_id=uuid4()), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
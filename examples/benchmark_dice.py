@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Check and benchmark of the batched dice roller.
+
+The frequencies of batched d20 rolls with and without advantage and of critical 2d6 damage are compared to the
+exact probabilities, then rolling N attack and damage expressions is timed with roll_batch, with the per die
+random.randint loop the dice used before, and with Dice.roll creating a Dice and a DiceRoll per roll.
+
+Usage:
+    python examples/benchmark_dice.py --rolls 100000 --dice-rolls 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.dice import Dice, RollType
+from dnd.core.dice_batch import roll_batch
+from dnd.core.values import ModifiableValue
+
+
+def check_frequencies(rolls: int, generator: np.random.Generator) -> None:
+    """The largest gap between the observed frequencies and the exact probabilities must be within 5 sigma"""
+    d20 = np.arange(1, 21)
+    expected = {
+        "d20": np.full(20, 1 / 20),
+        "d20 advantage": (2 * d20 - 1) / 400,
+        "d20 disadvantage": (41 - 2 * d20) / 400,
+    }
+    observed = {
+        "d20": roll_batch(1, 20, size=rolls, generator=generator).totals,
+        "d20 advantage": roll_batch(1, 20, advantage=1, size=rolls, generator=generator).totals,
+        "d20 disadvantage": roll_batch(1, 20, advantage=-1, size=rolls, generator=generator).totals,
+    }
+    two_d6 = np.convolve(np.full(6, 1 / 6), np.full(6, 1 / 6))
+    expected["crit 2d6"] = np.convolve(two_d6, two_d6)
+    observed["crit 2d6"] = roll_batch(2, 6, crit=True, size=rolls, generator=generator).totals - 3
+    for name, probabilities in expected.items():
+        frequencies = np.bincount(observed[name] - 1, minlength=len(probabilities)) / rolls
+        sigma = np.sqrt(probabilities * (1 - probabilities) / rolls)
+        if np.any(np.abs(frequencies - probabilities) > 5 * sigma + 1e-12):
+            raise AssertionError(f"{name}: frequencies differ from the exact probabilities")
+    print(f"{rolls} rolls per expression: frequencies match the exact probabilities")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the batched dice roller")
+    parser.add_argument("--rolls", type=int, default=100000, help="Expressions rolled per measurement")
+    parser.add_argument("--dice-rolls", type=int, default=2000, help="Rolls through Dice.roll, which is much slower")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(args.seed)
+    check_frequencies(args.rolls, generator)
+
+    n = args.rolls
+    counts = np.where(np.arange(n) % 2 == 0, 1, 2)
+    values = np.where(np.arange(n) % 2 == 0, 20, 6)
+    advantage = np.arange(n) % 3 - 1
+    crit = np.arange(n) % 20 == 1
+
+    begin = time.perf_counter()
+    roll_batch(counts, values, 3, advantage, crit, generator=generator)
+    batch_time = (time.perf_counter() - begin) / n
+
+    rng = random.Random(args.seed)
+    plain = list(zip(counts.tolist(), values.tolist(), advantage.tolist(), crit.tolist()))
+    begin = time.perf_counter()
+    for count, value, adv, is_crit in plain:
+        count = count * 2 if is_crit else count
+        first = [rng.randint(1, value) for _ in range(count)]
+        if adv:
+            second = [rng.randint(1, value) for _ in range(count)]
+            first = [max(a, b) if adv > 0 else min(a, b) for a, b in zip(first, second)]
+        sum(first) + 3
+    loop_time = (time.perf_counter() - begin) / n
+
+    bonus = ModifiableValue.create(source_entity_uuid=uuid4(), base_value=3, value_name="Attack Bonus")
+    begin = time.perf_counter()
+    for _ in range(args.dice_rolls):
+        Dice(count=1, value=20, bonus=bonus, roll_type=RollType.ATTACK).roll
+    dice_time = (time.perf_counter() - begin) / args.dice_rolls
+
+    print(f"roll_batch:         {batch_time * 1e6:8.3f} us/expression")
+    print(f"random.randint:     {loop_time * 1e6:8.3f} us/expression")
+    print(f"Dice(...).roll:     {dice_time * 1e6:8.3f} us/expression")
+    print(f"speedup over Dice.roll: {dice_time / batch_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
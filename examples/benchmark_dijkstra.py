@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the dijkstra path search behind Entity senses.
+
+Compares the parent pointer search with lazy path reconstruction against the previous implementation, which
+copied the whole path list of every relaxed position, both combined with the "all steps seen" filter used by
+Entity.compute_senses_from_position. The two are checked to return the same filtered paths before timing.
+
+Usage:
+    python examples/benchmark_dijkstra.py --distances 10 30 60 --repeat 20
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.dijkstra import dijkstra, get_neighbors
+
+
+def dijkstra_copying_paths(
+    start: Tuple[int, int],
+    is_walkable: Callable[[int, int], bool],
+    width: int,
+    height: int,
+    diagonal: bool = True,
+    max_distance: Optional[int] = None,
+    epsilon: float = 0.001,
+) -> Tuple[Dict[Tuple[int, int], int], Dict[Tuple[int, int], List[Tuple[int, int]]]]:
+    """The previous implementation, copying the path of the current position for every relaxed neighbor"""
+    distances: Dict[Tuple[int, int], float] = {start: 0}
+    true_distances = {start: 0}
+    paths = {start: [start]}
+    pq = [(float(0), start)]
+    visited = set()
+    while pq:
+        current_distance, current_position = heapq.heappop(pq)
+        if current_position in visited:
+            continue
+        visited.add(current_position)
+        for neighbor in get_neighbors(current_position, diagonal, width, height):
+            if not is_walkable(*neighbor):
+                continue
+            is_diagonal = (neighbor[0] != current_position[0]) and (neighbor[1] != current_position[1])
+            distance = current_distance + 1 + (epsilon if is_diagonal else 0)
+            if max_distance is not None and distance > max_distance:
+                continue
+            if neighbor not in distances or distance < distances[neighbor]:
+                distances[neighbor] = distance
+                true_distances[neighbor] = int(true_distances[current_position] + 1)
+                paths[neighbor] = paths[current_position] + [neighbor]
+                heapq.heappush(pq, (distance, neighbor))
+    return true_distances, paths
+
+
+def build_map(size: int, wall_ratio: float, seed: int) -> List[List[bool]]:
+    """Random walkable rows, indexed [y][x], with the center kept free"""
+    rng = random.Random(seed)
+    rows = [[rng.random() >= wall_ratio for _ in range(size)] for _ in range(size)]
+    rows[size // 2][size // 2] = True
+    return rows
+
+
+def filtered_copying(start, is_walkable, size, max_distance, visible, seen):
+    _, paths = dijkstra_copying_paths(start, is_walkable, size, size, max_distance=max_distance)
+    filtered = defaultdict(list)
+    for pos, path in paths.items():
+        if pos in visible and all(step in seen for step in path):
+            filtered[pos] = path
+    return filtered
+
+
+def filtered_parents(start, is_walkable, size, max_distance, visible, seen):
+    _, paths = dijkstra(start, is_walkable, size, size, max_distance=max_distance, seen=seen)
+    return paths.restrict(pos for pos in paths.fully_seen if pos in visible)
+
+
+def time_call(function, repeat: int, *args) -> float:
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - begin) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dijkstra path search")
+    parser.add_argument("--distances", type=int, nargs="+", default=[10, 30, 60], help="max_distance values to benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Searches per measurement")
+    parser.add_argument("--wall-ratio", type=float, default=0.15, help="Fraction of non walkable cells")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the map")
+    args = parser.parse_args()
+
+    print(f"{'distance':>8} {'reached':>8} {'copy ms':>9} {'parent ms':>10} {'speedup':>8}")
+    for max_distance in args.distances:
+        size = 2 * max_distance + 3
+        rows = build_map(size, args.wall_ratio, args.seed)
+        start = (size // 2, size // 2)
+
+        def is_walkable(x: int, y: int) -> bool:
+            return rows[y][x]
+
+        # every cell in range counts as visible and seen except a scattering of unseen ones
+        rng = random.Random(args.seed + 1)
+        visible = {(x, y): True for y in range(size) for x in range(size)}
+        seen = {position for position in visible if rng.random() >= 0.05} | {start}
+
+        expected = filtered_copying(start, is_walkable, size, max_distance, visible, seen)
+        result = filtered_parents(start, is_walkable, size, max_distance, visible, seen)
+        if set(expected) != set(result) or any(expected[pos] != result[pos] for pos in expected):
+            raise AssertionError(f"Filtered paths differ at max_distance {max_distance}")
+
+        copy_time = time_call(filtered_copying, args.repeat, start, is_walkable, size, max_distance, visible, seen)
+        parent_time = time_call(filtered_parents, args.repeat, start, is_walkable, size, max_distance, visible, seen)
+        print(f"{max_distance:>8} {len(expected):>8} {copy_time * 1e3:>9.2f} {parent_time * 1e3:>10.2f} {copy_time / parent_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
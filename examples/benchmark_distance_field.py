@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Property check and benchmark for the breadth first distance fields.
+
+On a series of random maps, origins and radii, compute_distance_field must give exactly the same distances, paths
+and fully seen positions as the heap based dijkstra. The two searches are then timed at growing max_distance,
+together with a lookup in a cached field, which is what repeated senses updates and path validations pay.
+
+Usage:
+    python examples/benchmark_distance_field.py --cases 300 --distances 10 30 60 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.dijkstra import dijkstra
+from dnd.core.distance_field import compute_distance_field
+from dnd.core.fov_cache import RevisionCache
+
+
+def random_map(rng: random.Random, width: int, height: int, wall_ratio: float) -> List[List[bool]]:
+    """Random walkable rows, indexed [y][x]"""
+    return [[rng.random() >= wall_ratio for _ in range(width)] for _ in range(height)]
+
+
+def check_equality(cases: int, seed: int) -> None:
+    rng = random.Random(seed)
+    radii = [None, 0, 1, 2.5, 5, 10, 12.7, 30]
+    for case in range(cases):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        rows = random_map(rng, width, height, rng.choice([0.0, 0.1, 0.3, 0.5]))
+        origin = (rng.randrange(width), rng.randrange(height))
+        max_distance = rng.choice(radii)
+        seen = {(x, y) for y in range(height) for x in range(width) if rng.random() < 0.9}
+
+        distances, paths = dijkstra(origin, lambda x, y: rows[y][x], width, height, max_distance=max_distance, seen=seen)
+        field = compute_distance_field(origin, rows, width, height, max_distance=max_distance)
+        path_map = field.path_map(seen)
+        if field.distances() != distances:
+            raise AssertionError(f"Case {case}: distances differ")
+        if any(path_map[position] != paths[position] for position in paths) or set(path_map) != set(paths):
+            raise AssertionError(f"Case {case}: paths differ")
+        if path_map.fully_seen != paths.fully_seen:
+            raise AssertionError(f"Case {case}: fully seen positions differ")
+    print(f"{cases} random cases: identical distances, paths and fully seen positions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the breadth first distance fields")
+    parser.add_argument("--cases", type=int, default=300, help="Random maps checked against dijkstra")
+    parser.add_argument("--distances", type=int, nargs="+", default=[10, 30, 60], help="max_distance values to benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Searches per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    check_equality(args.cases, args.seed)
+
+    rng = random.Random(args.seed)
+    print(f"{'distance':>8} {'reached':>8} {'dijkstra ms':>12} {'bfs ms':>8} {'cached us':>10}")
+    for max_distance in args.distances:
+        size = 2 * max_distance + 3
+        rows = random_map(rng, size, size, 0.15)
+        origin = (size // 2, size // 2)
+        rows[origin[1]][origin[0]] = True
+
+        begin = time.perf_counter()
+        for _ in range(args.repeat):
+            distances, _ = dijkstra(origin, lambda x, y: rows[y][x], size, size, max_distance=max_distance)
+        dijkstra_time = (time.perf_counter() - begin) / args.repeat
+
+        begin = time.perf_counter()
+        for _ in range(args.repeat):
+            compute_distance_field(origin, rows, size, size, max_distance=max_distance)
+        bfs_time = (time.perf_counter() - begin) / args.repeat
+
+        cache = RevisionCache()
+        target = (size - 2, size - 2)
+
+        def lookup():
+            return cache.get(origin, max_distance, 0, lambda: compute_distance_field(origin, rows, size, size, max_distance=max_distance)).distance(target)
+
+        lookup()  # the first lookup computes the field
+        begin = time.perf_counter()
+        for _ in range(args.repeat):
+            lookup()
+        cached_time = (time.perf_counter() - begin) / args.repeat
+
+        print(f"{max_distance:>8} {len(distances):>8} {dijkstra_time * 1e3:>12.2f} {bfs_time * 1e3:>8.2f} {cached_time * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the structural forks used to evaluate an entity from the point of view of its target.
+
+Compares a deep pydantic copy of an entity and of its senses with BaseBlock.fork, checks that targeting and
+modifying a fork leaves the original entity unchanged and that the checks against a target leave both entities
+untargeted, then times the checks, which evaluate forks of the bonuses instead of retargeting the entities.
+
+Usage:
+    python examples/benchmark_entity_fork.py --repeats 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from uuid import UUID
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.base_tiles import floor_factory
+from dnd.core.modifiers import NumericalModifier
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def timed(label: str, function, repeats: int) -> None:
+    function()
+    begin = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    print(f"{label:<28} {(time.perf_counter() - begin) / repeats * 1e6:10.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity forks against deep copies")
+    parser.add_argument("--repeats", type=int, default=50, help="Repetitions of every measurement")
+    args = parser.parse_args()
+
+    for x in range(8):
+        for y in range(8):
+            floor_factory((x, y))
+    source = create_warrior(source_id=UUID(int=1), proficiency_bonus=2, name="Source", position=(1, 1))
+    target = create_warrior(source_id=UUID(int=2), proficiency_bonus=2, name="Target", position=(2, 2))
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+
+    fork = target.fork()
+    fork.set_target_entity(source.uuid)
+    score = target.proficiency_bonus.score
+    fork.proficiency_bonus.self_static.add_value_modifier(
+        NumericalModifier(source_entity_uuid=target.uuid, target_entity_uuid=target.uuid, value=5, name="fork only"))
+    if any(value.target_entity_uuid is not None for value in target.get_values(deep=True)):
+        raise AssertionError("targeting the fork changed the target of the original values")
+    if target.proficiency_bonus.score != score or fork.proficiency_bonus.score != score + 5:
+        raise AssertionError("a modifier added to the fork is not private to the fork")
+    print("forks are isolated from the original entity")
+
+    source.saving_throw_bonus(target.uuid, "dexterity")
+    source.skill_bonus(target.uuid, "athletics")
+    source.skill_bonus_cross(target.uuid, "athletics")
+    if any(value.target_entity_uuid is not None or value.from_target_static is not None
+           for entity in (source, target) for value in entity.get_values(deep=True)):
+        raise AssertionError("a check against the target changed the values of the entities")
+    print("checks leave the entities untargeted")
+
+    timed("deep copy of the entity", lambda: target.model_copy(deep=True), args.repeats)
+    timed("fork of the entity", target.fork, args.repeats)
+    timed("deep copy of the senses", lambda: source.senses.model_copy(deep=True), args.repeats)
+    timed("fork of the senses", source.senses.fork, args.repeats)
+    timed("senses copy at a position", lambda: source.create_senses_copy_at_position((4, 4)), args.repeats)
+    timed("saving_throw_bonus", lambda: source.saving_throw_bonus(target.uuid, "dexterity").normalized_score, args.repeats)
+    timed("skill_bonus", lambda: source.skill_bonus(target.uuid, "athletics").normalized_score, args.repeats)
+    timed("skill_bonus_cross", lambda: source.skill_bonus_cross(target.uuid, "athletics"), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark for EventQueue storage.
+
+Stores a large number of events through EventQueue._store_event and reports the per-insert
+latency for consecutive windows of the run, so it is easy to see whether storing an event
+stays constant-cost as the log grows. A versioned event is first checked to stay findable at the
+timestamp of its latest version, before and after a compaction pass, and under the phase, source and target of
+its latest version only. Storing a lineage older than the max_age of the retention policy is timed, it must not
+rescan the protected lineage at every insert, and the archive is checked to append
+only the new events of a lineage archived again and to resolve archived events from its sidecar index.
+
+Usage:
+    python examples/benchmark_event_queue.py --events 1000000 --windows 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.event_archive import EventArchive
+from dnd.core.events import Event, EventQueue, EventRetentionPolicy, EventType, EventPhase
+from dnd.core.world import World
+
+
+def build_events(n: int, start: datetime, offset: int):
+    """Build unregistered events with increasing timestamps without going through validation"""
+    phases = [EventPhase.DECLARATION, EventPhase.EXECUTION, EventPhase.EFFECT, EventPhase.COMPLETION]
+    sources = [uuid4() for _ in range(8)]
+    events = []
+    lineage_uuid = uuid4()
+    for i in range(n):
+        phase = phases[(offset + i) % 4]
+        if phase == EventPhase.DECLARATION:
+            lineage_uuid = uuid4()
+        events.append(Event.model_construct(
+            event_type=EventType.ATTACK,
+            phase=phase,
+            lineage_uuid=lineage_uuid,
+            source_entity_uuid=sources[i % len(sources)],
+            target_entity_uuid=sources[(i + 1) % len(sources)],
+            timestamp=start + timedelta(microseconds=offset + i),
+            use_register=False,
+        ))
+    return events
+
+
+def check_versioned_timestamps():
+    """A versioned event moves to the timestamp of its latest version and the range queries stay sorted after a compaction"""
+    world = World(name="versioned timestamps")
+    with world.activate():
+        source = uuid4()
+        versioned = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=source, versioned=True)
+        EventQueue.register(versioned)
+        completed = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=source)
+        EventQueue.register(completed)
+        completed.post(phase=EventPhase.COMPLETION)
+        first = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=source)
+        EventQueue.register(first)
+        versioned.post(phase=EventPhase.EXECUTION)
+        second = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=source)
+        EventQueue.register(second)
+
+        def check(label: str) -> None:
+            if versioned not in EventQueue.get_events_by_timestamp(versioned.timestamp):
+                raise AssertionError(f"{label}: the versioned event is not indexed under its latest timestamp")
+            if versioned not in EventQueue.get_events_chronological(versioned.timestamp, None):
+                raise AssertionError(f"{label}: the versioned event is missing from the range starting at its timestamp")
+            if EventQueue._all_timestamps != sorted(EventQueue._all_timestamps):
+                raise AssertionError(f"{label}: the chronological log is not sorted")
+            if EventQueue.get_events_chronological(first.timestamp, first.timestamp) != [first]:
+                raise AssertionError(f"{label}: the range query around an event returned other events")
+
+        check("after posting")
+        EventQueue.set_retention_policy(EventRetentionPolicy(compact_lineages=True))
+        if EventQueue.get_event_by_uuid(completed.uuid) is not None:
+            raise AssertionError("the completed lineage was not compacted")
+        check("after compaction")
+    world.dispose()
+    print("versioned events stay indexed under their latest timestamp")
+
+
+def check_versioned_indexes():
+    """A versioned event leaves the phase, source and target buckets of its previous versions"""
+    world = World(name="versioned indexes")
+    with world.activate():
+        source, target, other = uuid4(), uuid4(), uuid4()
+        versioned = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=target, versioned=True)
+        EventQueue.register(versioned)
+        declared = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=target)
+        EventQueue.register(declared)
+        versioned.post(phase=EventPhase.EXECUTION, source_entity_uuid=other, target_entity_uuid=source)
+        versioned.post(phase=EventPhase.COMPLETION)
+        if EventQueue.get_events_by_phase(EventPhase.DECLARATION) != [declared]:
+            raise AssertionError("the versioned event is still listed under the phases it went through")
+        if EventQueue.get_events_by_phase(EventPhase.EXECUTION) or EventQueue.get_events_by_phase(EventPhase.COMPLETION) != [versioned]:
+            raise AssertionError("the versioned event is not listed under its latest phase only")
+        if EventQueue.get_events_by_source(source) != [declared] or EventQueue.get_events_by_source(other) != [versioned]:
+            raise AssertionError("the versioned event is not indexed under its latest source")
+        if EventQueue.get_events_by_target(target) != [declared] or EventQueue.get_events_by_target(source) != [versioned]:
+            raise AssertionError("the versioned event is not indexed under its latest target")
+    world.dispose()
+    print("versioned events stay indexed under the keys of their latest version")
+
+
+def check_protected_age(events: int = 5000):
+    """Storing events of a lineage older than max_age does not rescan it at every insert, another lineage evicts it"""
+    world = World(name="protected age")
+    with world.activate():
+        EventQueue.set_retention_policy(EventRetentionPolicy(max_age=timedelta(minutes=1)))
+        lineage = build_events(events, datetime.now() - timedelta(hours=1), 0)
+        for event in lineage:
+            event.lineage_uuid = lineage[0].lineage_uuid
+        begin = time.perf_counter()
+        for event in lineage:
+            EventQueue._store_event(event)
+        elapsed = time.perf_counter() - begin
+        if len(EventQueue._all_events) != events:
+            raise AssertionError("the lineage being stored was evicted")
+        EventQueue._store_event(build_events(1, datetime.now(), 0)[0])
+        if len(EventQueue._all_events) != 1:
+            raise AssertionError("the expired lineage was not evicted once another lineage was stored")
+    world.dispose()
+    print(f"a protected expired lineage of {events} events stores in {elapsed / events * 1e6:.2f} us/insert")
+
+
+def check_archive():
+    """A lineage archived again appends only its new events and archived events resolve through the sidecar index"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        archive = EventArchive(path, cache_size=1)
+        lineage_uuid, other_lineage_uuid = uuid4(), uuid4()
+        records = [{"uuid": str(uuid4()), "name": str(index)} for index in range(3)]
+        other = {"uuid": str(uuid4()), "name": "other"}
+        archive.write_lineage(lineage_uuid, records[:2])
+        archive.write_lineage(other_lineage_uuid, [other])
+        archive.write_lineage(lineage_uuid, records[2:])
+        with open(path) as archive_file:
+            if json.loads(archive_file.readlines()[-1])["events"] != records[2:]:
+                raise AssertionError("a lineage archived again rewrote its older events")
+        if archive.read_lineage(lineage_uuid) != records or len(archive) != 2:
+            raise AssertionError("the lines of a lineage were not merged on read")
+        if len(archive._event_lineages) != 1:
+            raise AssertionError("the event cache grew past its size")
+        if archive.find_lineage(records[0]["uuid"]) != lineage_uuid or archive.find_lineage(other["uuid"]) != other_lineage_uuid:
+            raise AssertionError("an archived event was not resolved from the sidecar index")
+        if archive.find_lineage(uuid4()) is not None:
+            raise AssertionError("an event that was never archived was resolved")
+        os.remove(archive.index_path)
+        reopened = EventArchive(path)
+        if reopened.read_lineage(lineage_uuid) != records or reopened.find_lineage(records[2]["uuid"]) != lineage_uuid:
+            raise AssertionError("a reopened archive lost its lineages or its sidecar index")
+
+        world = World(name="archive")
+        with world.activate():
+            source = uuid4()
+            EventQueue.set_retention_policy(EventRetentionPolicy(compact_lineages=True, archive_path=os.path.join(directory, "queue.jsonl")))
+            completed = Event(event_type=EventType.ATTACK, source_entity_uuid=source, target_entity_uuid=source)
+            EventQueue.register(completed)
+            completed.post(phase=EventPhase.COMPLETION)
+            EventQueue.set_retention_policy(EventQueue._retention_policy)
+            history = EventQueue.get_event_history(completed.uuid)
+            if EventQueue.get_event_by_uuid(completed.uuid) is not None or completed.uuid not in {event.uuid for event in history}:
+                raise AssertionError("a compacted event was not found in the archive")
+        world.dispose()
+    print("archived lineages append only new events and resolve from the sidecar index")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EventQueue storage")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Total number of events to store")
+    parser.add_argument("--windows", type=int, default=10, help="Number of windows to report latency for")
+    args = parser.parse_args()
+
+    check_versioned_timestamps()
+    check_versioned_indexes()
+    check_protected_age()
+    check_archive()
+    window_size = max(1, args.events // args.windows)
+    start = datetime.now()
+    stored = 0
+    total_time = 0.0
+
+    print(f"Storing {args.events} events in {args.windows} windows of {window_size}")
+    print(f"{'window':>8} {'stored':>10} {'us/insert':>10}")
+    for window in range(args.windows):
+        events = build_events(window_size, start, stored)
+        begin = time.perf_counter()
+        for event in events:
+            EventQueue._store_event(event)
+        elapsed = time.perf_counter() - begin
+        stored += len(events)
+        total_time += elapsed
+        print(f"{window:>8} {stored:>10} {elapsed / len(events) * 1e6:>10.2f}")
+
+    print(f"Average: {total_time / stored * 1e6:.2f} us/insert over {stored} events")
+
+    begin = time.perf_counter()
+    middle = start + timedelta(microseconds=stored // 2)
+    window = EventQueue.get_events_chronological(middle, middle + timedelta(microseconds=1000))
+    print(f"Range query returned {len(window)} events in {(time.perf_counter() - begin) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the batched field of view.
+
+Builds a walled map with creatures, checks that Tile.get_fov_batch and Tile.get_fov_many see exactly what
+Tile.compute_fov sees from every creature, then times one shadowcast per creature against the batch, and the refresh
+of every senses with a cold field of view cache (start of a round after the map changed) through the per entity
+update and through Entity.update_all_entities_senses, which shadowcasts the missing fields of view in one batch.
+
+Usage:
+    python examples/benchmark_fov_batch.py --creatures 100 --size 40 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import UUID
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.entity import Entity
+from dnd.core.base_tiles import Tile, floor_factory, wall_factory
+from dnd.core.world import World
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def build_battle(size: int, creatures: int, seed: int) -> list:
+    """Fill the current world with a walled map and creatures on free cells, return the creatures"""
+    rng = random.Random(seed)
+    free = []
+    for x in range(size):
+        for y in range(size):
+            if rng.random() < 0.1:
+                wall_factory((x, y))
+            else:
+                floor_factory((x, y))
+                free.append((x, y))
+    positions = rng.sample(free, creatures)
+    return [create_warrior(source_id=UUID(int=i + 1), proficiency_bonus=2, name=f"Creature {i}", position=position)
+            for i, position in enumerate(positions)]
+
+
+def timed(function, repeat: int) -> float:
+    """Average time of a call in ms, the field of view and distance field caches are cleared before every call"""
+    total = 0.0
+    for _ in range(repeat):
+        Tile.get_fov_cache().clear()
+        Tile.get_distance_field_cache().clear()
+        begin = time.perf_counter()
+        function()
+        total += time.perf_counter() - begin
+    return total / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batched field of view")
+    parser.add_argument("--creatures", type=int, default=100, help="Number of creatures on the map")
+    parser.add_argument("--size", type=int, default=40, help="Side of the square map")
+    parser.add_argument("--radius", type=int, default=10, help="View distance")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of every measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the map")
+    args = parser.parse_args()
+
+    world = World(name="fov batch")
+    with world.activate():
+        entities = build_battle(args.size, args.creatures, args.seed)
+        origins = [entity.position for entity in entities]
+        width, height = Tile.grid_size()
+        batch = Tile.get_fov_batch(origins, args.radius)
+        Tile.get_fov_cache().clear()
+        many = Tile.get_fov_many(origins, args.radius)
+        for i, origin in enumerate(origins):
+            expected = Tile.compute_fov(origin, args.radius)
+            dense = np.zeros((height, width), dtype=bool)
+            inside = [(x, y) for x, y in expected if 0 <= x < width and 0 <= y < height]
+            dense[[y for _, y in inside], [x for x, _ in inside]] = True
+            if many[i] != expected or not np.array_equal(batch[i], dense):
+                raise AssertionError(f"the batched field of view differs from compute_fov at {origin}")
+        print(f"batched fields of view match compute_fov for {len(origins)} origins")
+
+        def per_entity_senses():
+            for entity in Entity.get_all_entities():
+                entity.update_entity_senses(args.radius)
+
+        print(f"{args.creatures} creatures on a {args.size}x{args.size} map, radius {args.radius}, cold cache")
+        print(f"compute_fov per origin:     {timed(lambda: [Tile.compute_fov(origin, args.radius) for origin in origins], args.repeat):8.2f} ms")
+        print(f"Tile.get_fov_batch:         {timed(lambda: Tile.get_fov_batch(origins, args.radius), args.repeat):8.2f} ms")
+        print(f"Tile.get_fov_many:          {timed(lambda: Tile.get_fov_many(origins, args.radius), args.repeat):8.2f} ms")
+        print(f"update_entity_senses loop:  {timed(per_entity_senses, args.repeat):8.2f} ms")
+        print(f"update_all_entities_senses: {timed(lambda: Entity.update_all_entities_senses(args.radius), args.repeat):8.2f} ms")
+    world.dispose()
+
+
+if __name__ == "__main__":
+    main()
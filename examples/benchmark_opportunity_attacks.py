@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Check and benchmark of the opportunity attack dispatch through the threat map.
+
+Creatures with opportunity attack handlers are placed on a random map, then random movements along the paths in the
+senses of a creature are dispatched. For every movement the handlers kept by the EventQueue must be exactly the ones
+of the creatures whose threatened positions, as computed by Senses.get_threathened_positions, contain the start of
+the movement and not every position of the path. The dispatch time is compared with the previous approach, calling
+the processor of every handler which rebuilt the threatened positions of its creature.
+
+Usage:
+    python examples/benchmark_opportunity_attacks.py --creatures 50 --moves 500 --size 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.actions import MovementEvent
+from dnd.core.base_tiles import floor_factory, wall_factory
+from dnd.core.events import EventPhase, EventQueue, EventType
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+from dnd.reactions import OPPORTUNITY_ATTACK_GROUP
+
+
+def build_battle(size: int, creatures: int, seed: int) -> list:
+    """Fill the current world with a walled map and tightly packed creatures, return the creatures"""
+    rng = random.Random(seed)
+    walls = set()
+    for x in range(size):
+        for y in range(size):
+            if rng.random() < 0.1:
+                walls.add((x, y))
+                wall_factory((x, y))
+            else:
+                floor_factory((x, y))
+    free = [(x, y) for x in range(size // 4, 3 * size // 4) for y in range(size // 4, 3 * size // 4) if (x, y) not in walls]
+    positions = rng.sample(free, min(creatures, len(free)))
+    entities = [create_warrior(source_id=uuid4(), proficiency_bonus=2, name=f"Creature {i}", position=position) for i, position in enumerate(positions)]
+    # the second pass fills the paths, they only go through positions seen before
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+    return entities
+
+
+def expected_reactors(event: MovementEvent, entities: list) -> set:
+    """The reactors found by asking every creature for its threatened positions"""
+    reactors = set()
+    for entity in entities:
+        if entity.uuid == event.source_entity_uuid:
+            continue
+        threathened_positions = set(entity.senses.get_threathened_positions(entity.get_threat_reach()))
+        if event.path and event.start_position in threathened_positions and any(position not in threathened_positions for position in event.path):
+            reactors.add(entity.uuid)
+    return reactors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the opportunity attack dispatch")
+    parser.add_argument("--creatures", type=int, default=50, help="Number of creatures on the map")
+    parser.add_argument("--moves", type=int, default=500, help="Number of movements dispatched")
+    parser.add_argument("--size", type=int, default=40, help="Side of the square map")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the map and the movements")
+    args = parser.parse_args()
+
+    entities = build_battle(args.size, args.creatures, args.seed)
+    rng = random.Random(args.seed + 1)
+    events = []
+    while len(events) < args.moves:
+        mover = rng.choice(entities)
+        destinations = [position for position in mover.senses.paths if position != mover.position]
+        if not destinations:
+            continue
+        end_position = rng.choice(destinations)
+        events.append(MovementEvent(source_entity_uuid=mover.uuid, target_entity_uuid=mover.uuid, phase=EventPhase.EFFECT,
+                                    start_position=mover.position, end_position=end_position,
+                                    path=mover.senses.paths[end_position], use_register=False))
+
+    triggered = 0
+    for event in events:
+        handlers = [handler for handler in EventQueue._get_handlers_for_event(event) if handler.selector_group == OPPORTUNITY_ATTACK_GROUP]
+        selected = {handler.source_entity_uuid for handler in handlers}
+        expected = expected_reactors(event, entities)
+        if selected - {event.source_entity_uuid} != expected:
+            raise AssertionError(f"Selected reactors differ for the movement {event.start_position} -> {event.end_position}")
+        triggered += len(expected)
+    print(f"{len(events)} movements: selected handlers match the threatened positions, {triggered} opportunity attacks")
+
+    begin = time.perf_counter()
+    for event in events:
+        EventQueue._get_handlers_for_event(event)
+    selected_time = (time.perf_counter() - begin) / len(events)
+
+    begin = time.perf_counter()
+    for event in events:
+        # every handler called, each one rebuilding the threatened positions of its creature
+        for handler in EventQueue._dispatch_table[(EventType.MOVEMENT, EventPhase.EFFECT, None, None)]:
+            entity = Entity.get(handler.source_entity_uuid)
+            senses = entity.senses
+            x, y = senses.position
+            neighbors = {(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy}
+            threathened_positions = list(neighbors & set(senses.visible.keys()) & set(senses.paths.keys()))
+            event.start_position in threathened_positions and any(position not in threathened_positions for position in event.path)
+    calling_time = (time.perf_counter() - begin) / len(events)
+
+    print(f"{len(entities)} creatures on a {args.size}x{args.size} map")
+    print(f"call every handler:      {calling_time * 1e6:9.1f} us/movement")
+    print(f"threat map selection:    {selected_time * 1e6:9.1f} us/movement")
+    print(f"speedup: {calling_time / selected_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Check and benchmark of the exact attack distributions.
+
+Two warriors face each other, the forecast of an attack computed by forecast_entity_attack is compared with the
+frequencies of the outcomes and of the damage taken over many attacks actually rolled by Attack.apply, then the
+time of a forecast is compared with the time of the rolled attacks.
+
+Usage:
+    python examples/benchmark_probability.py --attacks 3000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from uuid import UUID
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.actions import Attack
+from dnd.core.base_tiles import floor_factory
+from dnd.core.dice import AttackOutcome
+from dnd.core.events import WeaponSlot
+from dnd.core.probability import d20_outcome_probabilities, forecast_entity_attack, forecast_from_outcomes
+from dnd.core.rng import RNGService
+from dnd.core.values import AdvantageStatus
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def check_d20_table() -> None:
+    """Exhaustive check of the d20 outcomes against the direct enumeration of two d20 rolls"""
+    for bonus in range(-3, 12):
+        for target in range(5, 26):
+            for status in AdvantageStatus:
+                probabilities = d20_outcome_probabilities(bonus, target, status)
+                counts = Counter()
+                for first in range(1, 21):
+                    for second in range(1, 21):
+                        face = {AdvantageStatus.ADVANTAGE: max(first, second), AdvantageStatus.DISADVANTAGE: min(first, second)}.get(status, first)
+                        if face == 1:
+                            counts[AttackOutcome.CRIT_MISS] += 1
+                        elif face + bonus >= target:
+                            counts[AttackOutcome.CRIT if face == 20 else AttackOutcome.HIT] += 1
+                        else:
+                            counts[AttackOutcome.MISS] += 1
+                if any(abs(probabilities[outcome] - counts[outcome] / 400) > 1e-12 for outcome in AttackOutcome):
+                    raise AssertionError(f"d20 outcomes differ for bonus {bonus}, target {target}, {status}")
+    print("d20 outcome table matches the enumeration of the rolls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the exact attack distributions")
+    parser.add_argument("--attacks", type=int, default=3000, help="Attacks rolled to compare with the forecast")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the dice")
+    args = parser.parse_args()
+
+    check_d20_table()
+
+    RNGService.install(RNGService(args.seed))
+    for x in range(5):
+        for y in range(5):
+            floor_factory((x, y))
+    attacker = create_warrior(source_id=UUID(int=1), proficiency_bonus=2, name="Attacker", position=(1, 1))
+    target = create_warrior(source_id=UUID(int=2), proficiency_bonus=2, name="Target", position=(2, 2))
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+
+    forecast = forecast_entity_attack(attacker, target, WeaponSlot.MAIN_HAND)
+
+    outcomes = Counter()
+    damages = Counter()
+    begin = time.perf_counter()
+    for _ in range(args.attacks):
+        attacker.action_economy.reset_all_costs()
+        hp = target.get_hp()
+        event = Attack(source_entity_uuid=attacker.uuid, target_entity_uuid=target.uuid, weapon_slot=WeaponSlot.MAIN_HAND).apply()
+        outcomes[event.attack_outcome] += 1
+        damages[hp - target.get_hp()] += 1
+    rolled_time = (time.perf_counter() - begin) / args.attacks
+
+    n = args.attacks
+    for outcome in AttackOutcome:
+        p = forecast.outcomes[outcome]
+        sigma = np.sqrt(p * (1 - p) / n)
+        if abs(outcomes[outcome] / n - p) > 5 * sigma + 1e-9:
+            raise AssertionError(f"{outcome}: rolled frequency {outcomes[outcome] / n:.4f} instead of {p:.4f}")
+    for damage, p in enumerate(forecast.damage):
+        sigma = np.sqrt(p * (1 - p) / n)
+        if abs(damages[damage] / n - p) > 5 * sigma + 1e-9:
+            raise AssertionError(f"damage {damage}: rolled frequency {damages[damage] / n:.4f} instead of {p:.4f}")
+    if set(damages) - set(range(len(forecast.damage))):
+        raise AssertionError("rolled damage outside of the forecast support")
+    mean = sum(damage * count for damage, count in damages.items()) / n
+    print(f"{n} rolled attacks match the forecast: hit {forecast.hit_probability:.3f}, "
+          f"expected damage {forecast.expected_damage:.3f} (rolled mean {mean:.3f})")
+
+    begin = time.perf_counter()
+    for _ in range(100):
+        forecast_entity_attack(attacker, target, WeaponSlot.MAIN_HAND)
+    forecast_time = (time.perf_counter() - begin) / 100
+
+    # the distributions alone, once the bonuses and damages are resolved
+    weapon_damages = attacker.get_damages(WeaponSlot.MAIN_HAND, target.uuid)
+    begin = time.perf_counter()
+    for _ in range(100):
+        forecast_from_outcomes(forecast.outcomes, weapon_damages, target.health)
+    distribution_time = (time.perf_counter() - begin) / 100
+    print(f"forecast from the entities: {forecast_time * 1e6:9.1f} us")
+    print(f"distributions only: {distribution_time * 1e6:9.1f} us")
+    print(f"rolled attack: {rolled_time * 1e6:9.1f} us, {n} of them {rolled_time * n * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
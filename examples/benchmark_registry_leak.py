@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Leak benchmark for the object registries.
+
+Runs a long series of attacks between two warriors and reports the size of every class-level
+registry at regular intervals. Temporary calculation objects (combined bonuses, dice) should be
+reclaimed as soon as the attack is resolved, so apart from the event history, which is bounded by
+the retention policy, every registry is expected to stay flat.
+
+Usage:
+    python examples/benchmark_registry_leak.py --attacks 10000 --report-every 1000
+    python examples/benchmark_registry_leak.py --attacks 10000 --max-events 0 --trace-memory
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from uuid import UUID
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.entity import Entity
+from dnd.actions import Attack
+from dnd.core.base_block import BaseBlock
+from dnd.core.base_object import BaseObject
+from dnd.core.base_tiles import floor_factory
+from dnd.core.dice import Dice, DiceRoll
+from dnd.core.events import EventQueue, EventRetentionPolicy, WeaponSlot
+from dnd.core.values import BaseValue
+from dnd.core.world import World
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def registry_sizes():
+    """Collect garbage and return the size of every registry"""
+    gc.collect()
+    return {
+        "objects": len(BaseObject._registry),
+        "values": len(BaseValue._registry),
+        "blocks": len(BaseBlock._registry),
+        "dice": len(Dice._registry),
+        "rolls": len(DiceRoll._registry),
+        "entities": len(Entity._entity_registry),
+        "events": len(EventQueue._events_by_uuid),
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the attacks in the current world and report the registry sizes"""
+    if args.max_events > 0:
+        EventQueue.set_retention_policy(EventRetentionPolicy(max_events=args.max_events, compact_lineages=True))
+
+    for x in range(10):
+        for y in range(10):
+            floor_factory((x, y))
+    attacker = create_warrior(source_id=UUID(int=1), proficiency_bonus=2, name="Attacker", position=(4, 4))
+    defender = create_warrior(source_id=UUID(int=2), proficiency_bonus=3, name="Defender", position=(5, 5))
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    sizes = registry_sizes()
+    columns = list(sizes.keys()) + (["memory_kb"] if args.trace_memory else [])
+    print(f"{'attacks':>8} " + " ".join(f"{name:>9}" for name in columns))
+
+    def report(done: int) -> None:
+        sizes = registry_sizes()
+        row = list(sizes.values())
+        if args.trace_memory:
+            row.append(tracemalloc.get_traced_memory()[0] // 1024)
+        print(f"{done:>8} " + " ".join(f"{value:>9}" for value in row))
+
+    report(0)
+    begin = time.perf_counter()
+    for done in range(1, args.attacks + 1):
+        attacker.action_economy.reset_all_costs()
+        Attack(source_entity_uuid=attacker.uuid, target_entity_uuid=defender.uuid, weapon_slot=WeaponSlot.MAIN_HAND).apply()
+        if done % args.report_every == 0:
+            report(done)
+    elapsed = time.perf_counter() - begin
+    print(f"Average: {elapsed / args.attacks * 1e3:.2f} ms/attack over {args.attacks} attacks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report registry sizes over a long series of attacks")
+    parser.add_argument("--attacks", type=int, default=10_000, help="Total number of attacks to run")
+    parser.add_argument("--report-every", type=int, default=1000, help="Number of attacks between reports")
+    parser.add_argument("--max-events", type=int, default=5000, help="Event retention bound, 0 keeps the whole history")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report the traced python memory (slower)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the world the dice are rolled in")
+    args = parser.parse_args()
+
+    world = World(name="registry leak", seed=args.seed)
+    with world.activate():
+        run(args)
+    world.dispose()
+
+
+if __name__ == "__main__":
+    main()
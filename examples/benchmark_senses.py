@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the senses update after a move.
+
+Builds the same battle in two worlds, then replays the same random steps in both: one world refreshes the senses
+of every creature with Entity.update_all_entities_senses, the other with the incremental
+Entity.update_senses_after_move. The senses of every creature are compared after each step and the average
+update time per step is reported for both.
+
+Usage:
+    python examples/benchmark_senses.py --creatures 50 --steps 50 --size 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.entity import Entity
+from dnd.core.base_tiles import Tile, floor_factory, wall_factory
+from dnd.core.world import World
+from dnd.monsters.circus_fighter import create_warrior
+
+
+def build_battle(size: int, creatures: int, seed: int) -> list:
+    """Fill the current world with a walled map and creatures on free cells, return the creatures"""
+    rng = random.Random(seed)
+    walls = set()
+    for x in range(size):
+        for y in range(size):
+            if rng.random() < 0.1:
+                walls.add((x, y))
+                wall_factory((x, y))
+            else:
+                floor_factory((x, y))
+    free = [(x, y) for x in range(size) for y in range(size) if (x, y) not in walls]
+    positions = rng.sample(free, creatures)
+    entities = [create_warrior(source_id=uuid4(), proficiency_bonus=2, name=f"Creature {i}", position=position) for i, position in enumerate(positions)]
+    # the second pass fills the paths, they only go through positions seen before
+    Entity.update_all_entities_senses()
+    Entity.update_all_entities_senses()
+    return entities
+
+
+def senses_state(entities: list) -> list:
+    """Comparable summary of the senses of every creature, entities are identified by their index"""
+    index = {entity.uuid: i for i, entity in enumerate(entities)}
+    return [
+        (
+            sorted((index[uuid], position) for uuid, position in entity.senses.entities.items()),
+            sorted(entity.senses.visible),
+            sorted(entity.senses.seen),
+            sorted((position, tuple(entity.senses.paths[position])) for position in entity.senses.paths),
+        )
+        for entity in entities
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the senses update after a move")
+    parser.add_argument("--creatures", type=int, default=50, help="Number of creatures on the map")
+    parser.add_argument("--steps", type=int, default=50, help="Number of single steps to replay")
+    parser.add_argument("--size", type=int, default=40, help="Side of the square map")
+    parser.add_argument("--no-check", action="store_true", help="Skip comparing the senses after each step")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the map and the steps")
+    args = parser.parse_args()
+
+    full_world, incremental_world = World(name="full"), World(name="incremental")
+    with full_world.activate():
+        full_entities = build_battle(args.size, args.creatures, args.seed)
+    with incremental_world.activate():
+        incremental_entities = build_battle(args.size, args.creatures, args.seed)
+
+    rng = random.Random(args.seed + 1)
+    full_time = incremental_time = 0.0
+    steps = 0
+    while steps < args.steps:
+        i = rng.randrange(args.creatures)
+        x, y = full_entities[i].position
+        with full_world.activate():
+            neighbors = [(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0) and Tile.is_walkable((x + dx, y + dy))]
+        if not neighbors:
+            continue
+        destination = rng.choice(neighbors)
+
+        with full_world.activate():
+            full_entities[i].move(destination, update_senses=False)
+            begin = time.perf_counter()
+            Entity.update_all_entities_senses()
+            full_time += time.perf_counter() - begin
+        with incremental_world.activate():
+            incremental_entities[i].move(destination, update_senses=False)
+            begin = time.perf_counter()
+            Entity.update_senses_after_move(incremental_entities[i])
+            incremental_time += time.perf_counter() - begin
+        steps += 1
+
+        if not args.no_check:
+            with full_world.activate():
+                expected = senses_state(full_entities)
+            with incremental_world.activate():
+                result = senses_state(incremental_entities)
+            if expected != result:
+                raise AssertionError(f"Senses differ after step {steps}")
+
+    print(f"{args.creatures} creatures, {args.steps} steps on a {args.size}x{args.size} map")
+    print(f"update_all_entities_senses: {full_time / steps * 1e3:8.2f} ms/step")
+    print(f"update_senses_after_move:   {incremental_time / steps * 1e3:8.2f} ms/step")
+    print(f"speedup: {full_time / incremental_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Property check and micro-benchmark for the integer shadowcasting.
+
+The previous shadowcasting, which used fractions.Fraction for every slope, is kept below as the reference. On a
+series of random maps, origins and radii, the integer implementation in dnd/core/shadowcast.py must report exactly
+the same sequence of visible positions. The two are then timed on maps of growing size.
+
+Usage:
+    python examples/benchmark_shadowcast.py --cases 500 --sizes 20 50 100 --repeat 20
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+from typing import Callable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.shadowcast import compute_fov
+
+
+# Reference implementation with fractions.Fraction slopes
+
+def compute_fov_fraction(
+    origin: Tuple[int, int],
+    is_blocking: Callable[[int, int], bool],
+    mark_visible: Callable[[int, int], None],
+    max_distance: Optional[float] = None
+) -> None:
+    ox, oy = origin
+    mark_visible(ox, oy)
+
+    for i in range(4):
+        quadrant = Quadrant(i, origin)
+
+        def reveal(tile: Tuple[int, int]) -> None:
+            x, y = quadrant.transform(tile)
+            if max_distance is None or math.sqrt((x-ox)**2 + (y-oy)**2) <= max_distance:
+                mark_visible(x, y)
+
+        def is_wall(tile: Optional[Tuple[int, int]]) -> bool:
+            if tile is None:
+                return False
+            x, y = quadrant.transform(tile)
+            return is_blocking(x, y)
+
+        def is_floor(tile: Optional[Tuple[int, int]]) -> bool:
+            if tile is None:
+                return False
+            x, y = quadrant.transform(tile)
+            return not is_blocking(x, y)
+
+        first_row = Row(1, Fraction(-1), Fraction(1))
+        scan_iterative(first_row, reveal, is_wall, is_floor)
+
+class Quadrant:
+    north = 0
+    east = 1
+    south = 2
+    west = 3
+
+    def __init__(self, cardinal: int, origin: Tuple[int, int]):
+        if cardinal not in range(4):
+            raise ValueError("Cardinal must be 0, 1, 2, or 3")
+        self.cardinal: int = cardinal
+        self.ox, self.oy = origin
+
+    def transform(self, tile: Tuple[int, int]) -> Tuple[int, int]:
+        row, col = tile
+        if self.cardinal == self.north:
+            return (self.ox + col, self.oy - row)
+        elif self.cardinal == self.south:
+            return (self.ox + col, self.oy + row)
+        elif self.cardinal == self.east:
+            return (self.ox + row, self.oy + col)
+        else:
+            assert self.cardinal == self.west
+            return (self.ox - row, self.oy + col)
+
+class Row:
+    def __init__(self, depth: int, start_slope: Fraction, end_slope: Fraction):
+        self.depth = depth
+        self.start_slope = start_slope
+        self.end_slope = end_slope
+
+    def tiles(self) -> Iterator[Tuple[int, int]]:
+        min_col = round_ties_up(self.depth * self.start_slope)
+        max_col = round_ties_down(self.depth * self.end_slope)
+        for col in range(min_col, max_col + 1):
+            yield (self.depth, col)
+
+    def next(self) -> 'Row':
+        return Row(self.depth + 1, self.start_slope, self.end_slope)
+
+def slope(tile: Tuple[int, int]) -> Fraction:
+    row_depth, col = tile
+    return Fraction(2 * col - 1, 2 * row_depth)
+
+def is_symmetric(row: Row, tile: Tuple[int, int]) -> bool:
+    row_depth, col = tile
+    return (col >= row.depth * row.start_slope
+            and col <= row.depth * row.end_slope)
+
+def round_ties_up(n: Fraction) -> int:
+    return math.floor(float(n) + 0.5)
+
+def round_ties_down(n: Fraction) -> int:
+    return math.ceil(float(n) - 0.5)
+
+def scan_iterative(
+    row: Row,
+    reveal: Callable[[Tuple[int, int]], None],
+    is_wall: Callable[[Optional[Tuple[int, int]]], bool],
+    is_floor: Callable[[Optional[Tuple[int, int]]], bool]
+) -> None:
+    rows = [row]
+    while rows:
+        row = rows.pop()
+        prev_tile: Optional[Tuple[int, int]] = None
+        for tile in row.tiles():
+            if is_wall(tile) or is_symmetric(row, tile):
+                reveal(tile)
+            if is_wall(prev_tile) and is_floor(tile):
+                row.start_slope = slope(tile)
+            if is_floor(prev_tile) and is_wall(tile):
+                next_row = row.next()
+                next_row.end_slope = slope(tile)
+                rows.append(next_row)
+            prev_tile = tile
+        if is_floor(prev_tile):
+            rows.append(row.next())
+
+def random_map(rng: random.Random, size: int, wall_ratio: float) -> List[List[bool]]:
+    """Random blocking rows, indexed [y][x]"""
+    return [[rng.random() < wall_ratio for _ in range(size)] for _ in range(size)]
+
+
+def record(fov: Callable, rows: List[List[bool]], origin: Tuple[int, int], max_distance: Optional[float]) -> List[Tuple[int, int]]:
+    """Every mark_visible call of a field of view computation, in order"""
+    height, width = len(rows), len(rows[0])
+    marked: List[Tuple[int, int]] = []
+
+    def is_blocking(x: int, y: int) -> bool:
+        return not (0 <= x < width and 0 <= y < height) or rows[y][x]
+
+    fov(origin, is_blocking, lambda x, y: marked.append((x, y)), max_distance)
+    return marked
+
+
+def check_equality(cases: int, seed: int) -> None:
+    rng = random.Random(seed)
+    radii = [None, 1, 2.5, 5, 7.5, 10, 12.3, 30]
+    for case in range(cases):
+        size = rng.randint(1, 40)
+        rows = random_map(rng, size, rng.choice([0.0, 0.05, 0.2, 0.4, 0.7]))
+        origin = (rng.randrange(size), rng.randrange(size))
+        max_distance = rng.choice(radii)
+        expected = record(compute_fov_fraction, rows, origin, max_distance)
+        result = record(compute_fov, rows, origin, max_distance)
+        if expected != result:
+            raise AssertionError(f"Case {case} differs: size {size}, origin {origin}, max_distance {max_distance}")
+    print(f"{cases} random cases: identical visible positions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the integer shadowcasting")
+    parser.add_argument("--cases", type=int, default=500, help="Random maps checked against the Fraction implementation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100], help="Map sides to benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Field of view computations per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    check_equality(args.cases, args.seed)
+
+    rng = random.Random(args.seed)
+    print(f"{'size':>6} {'visible':>8} {'fraction ms':>12} {'integer ms':>11} {'speedup':>8}")
+    for size in args.sizes:
+        rows = random_map(rng, size, 0.1)
+        origin = (size // 2, size // 2)
+        rows[origin[1]][origin[0]] = False
+        max_distance = size / 2
+        timings = []
+        for fov in (compute_fov_fraction, compute_fov):
+            begin = time.perf_counter()
+            for _ in range(args.repeat):
+                visible = record(fov, rows, origin, max_distance)
+            timings.append((time.perf_counter() - begin) / args.repeat)
+        print(f"{size:>6} {len(set(visible)):>8} {timings[0] * 1e3:>12.2f} {timings[1] * 1e3:>11.2f} {timings[0] / timings[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Monte-Carlo encounter simulation.
+
+The duel encounter of dnd.simulation is simulated with a growing number of worker processes. The aggregated
+results must be identical for every number of workers, since the seed of every trial only depends on the
+simulation seed, and the throughput in trials per second is reported for each.
+
+Usage:
+    python examples/benchmark_simulation.py --trials 200 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.simulation import duel_encounter, run_simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Monte-Carlo encounter simulation")
+    parser.add_argument("--trials", type=int, default=200, help="Trials per measurement")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Numbers of worker processes to compare")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the simulation")
+    args = parser.parse_args()
+
+    reference = None
+    base_rate = None
+    print(f"{'workers':>7} {'trials/s':>9} {'speedup':>8}")
+    for workers in args.workers:
+        begin = time.perf_counter()
+        result = run_simulation(duel_encounter, args.trials, seed=args.seed, workers=workers)
+        rate = args.trials / (time.perf_counter() - begin)
+        if reference is None:
+            reference, base_rate = result, rate
+        elif result != reference:
+            raise AssertionError(f"Results with {workers} workers differ from the ones with {args.workers[0]}")
+        print(f"{workers:>7} {rate:>9.1f} {rate / base_rate:>7.2f}x")
+
+    print(f"win rates {reference.win_rates}, draws {reference.draws}, mean rounds {reference.mean_rounds:.2f}, "
+          f"mean damage {reference.mean_damage}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark of mass spawning through entity templates.
+
+A horde is created in a fresh world once by calling create_warrior for every creature and once by spawning copies
+of a compiled warrior template, the spawned creatures are checked against the built ones and the time per entity of
+both paths is reported.
+
+Usage:
+    python examples/benchmark_spawn.py --horde 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from uuid import UUID
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dnd.core.events import WeaponSlot
+from dnd.core.world import World
+from dnd.entity import Entity
+from dnd.monsters.circus_fighter import create_warrior
+from dnd.templates import EntityTemplate
+
+
+def profile(entity: Entity):
+    return (entity.ac_bonus().normalized_score, entity.get_hp(), entity.attack_bonus(WeaponSlot.MAIN_HAND).normalized_score,
+            sorted(entity.active_conditions), len(entity.event_handlers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark template spawning against create_warrior")
+    parser.add_argument("--horde", type=int, default=200, help="Creatures per horde")
+    args = parser.parse_args()
+    positions = [(index % 20, index // 20) for index in range(args.horde)]
+
+    begin = time.perf_counter()
+    template = EntityTemplate.register("warrior", create_warrior, proficiency_bonus=2, name="Warrior")
+    compile_time = time.perf_counter() - begin
+
+    built_world = World(name="built horde")
+    with built_world.activate():
+        begin = time.perf_counter()
+        built = [create_warrior(source_id=UUID(int=index + 1), proficiency_bonus=2, name="Warrior", position=position)
+                 for index, position in enumerate(positions)]
+        built_time = time.perf_counter() - begin
+        expected = profile(built[0])
+
+    spawned_world = World(name="spawned horde")
+    with spawned_world.activate():
+        begin = time.perf_counter()
+        spawned = template.spawn_many(positions, name="Warrior")
+        spawned_time = time.perf_counter() - begin
+        if len(Entity.get_all_entities()) != args.horde or len({entity.uuid for entity in spawned}) != args.horde:
+            raise AssertionError("the spawned entities are not all registered with distinct uuids")
+        for entity in (spawned[0], spawned[-1]):
+            if profile(entity) != expected:
+                raise AssertionError(f"spawned {profile(entity)} differs from built {expected}")
+
+    print(f"compiled {template} in {compile_time * 1e3:.1f} ms")
+    print(f"create_warrior: {built_time * 1e3 / args.horde:8.2f} ms per entity, {built_time:.2f} s for {args.horde}")
+    print(f"template spawn: {spawned_time * 1e3 / args.horde:8.2f} ms per entity, {spawned_time:.2f} s for {args.horde}")
+    print(f"speedup {built_time / spawned_time:.1f}x")
+    built_world.dispose()
+    spawned_world.dispose()
+
+
+if __name__ == "__main__":
+    main()